@@ -0,0 +1,252 @@
+"""
+티켓 임베딩 인덱스 (유사 과거 장애 검색)
+학습된 분류기의 문장 임베딩을 티켓 텍스트 내용 해시별로 float16 행렬에 저장하고,
+코사인 유사도 top-k 검색을 제공합니다. 기본은 numpy 전수 비교이며, 행이 많으면
+k-means로 분할한 IVF 인덱스에서 가까운 분할(nprobe개)만 비교합니다.
+"""
+import os
+import json
+import hashlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+EMBEDDINGS_FILE = 'embeddings.npy'
+EMBEDDING_IDS_FILE = 'embedding_ids.json'
+IVF_FILE = 'ivf.npz'
+
+# 전수 비교 시 한 번에 float32로 변환하는 행 수 (메모리 상한)
+SEARCH_CHUNK_ROWS = 65536
+
+# IVF: 자동 생성 기준 행 수, 분할 수 = sqrt(N) * 배수, 기본 탐색 분할 수
+IVF_MIN_ROWS = 50000
+IVF_LISTS_PER_SQRT = 4
+IVF_DEFAULT_NPROBE = 8
+
+
+def content_hash(text: str) -> str:
+    """모델 입력 텍스트의 내용 해시 (같은 텍스트는 한 번만 인코딩, 레이블링 시 저장된 임베딩 조회)"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class EmbeddingIndex:
+    """
+    티켓 임베딩 행렬 + ID 매핑
+
+    Args:
+        embeddings: (N, D) L2 정규화 임베딩 (float16으로 저장)
+        entries: 행별 {'content_hash', 'issue_key', 'change_type', 'is_incident'}
+    """
+
+    def __init__(self, embeddings: np.ndarray, entries: List[Dict]):
+        if len(embeddings) != len(entries):
+            raise ValueError(f"{len(embeddings)} embeddings for {len(entries)} entries")
+        self.embeddings = embeddings
+        self.entries = entries
+        # 같은 텍스트의 행은 임베딩이 같으므로 해시별로 한 행만 (임베딩 조회용)
+        self.row_by_hash = {}
+        for row, entry in enumerate(entries):
+            self.row_by_hash.setdefault(entry['content_hash'], row)
+        # 행은 티켓별 (자기 자신 제외용)
+        self.row_by_issue_key = {entry.get('issue_key'): row for row, entry in enumerate(entries)}
+        self.incident_rows = np.array(
+            [row for row, entry in enumerate(entries) if entry.get('is_incident')], dtype=np.int64
+        )
+        # IVF (build_ivf 또는 load 시 설정)
+        self.centroids = None
+        self.list_offsets = None
+        self.list_rows = None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def vector(self, text_hash: str) -> Optional[np.ndarray]:
+        """저장된 임베딩 조회 (없으면 None)"""
+        row = self.row_by_hash.get(text_hash)
+        return None if row is None else np.asarray(self.embeddings[row], dtype=np.float32)
+
+    def build_ivf(self, n_lists: Optional[int] = None, iterations: int = 10, sample_size: int = 100000,
+                  seed: int = 42):
+        """
+        구면 k-means로 행을 n_lists개 분할 (IVF)
+
+        Args:
+            n_lists: 분할 수 (None이면 sqrt(N) * IVF_LISTS_PER_SQRT)
+            iterations: k-means 반복 수
+            sample_size: 중심 학습에 사용할 최대 행 수
+            seed: 샘플링/초기화 시드
+        """
+        rows = len(self.embeddings)
+        n_lists = min(rows, n_lists or max(1, int(np.sqrt(rows) * IVF_LISTS_PER_SQRT)))
+        rng = np.random.default_rng(seed)
+        sample = np.sort(rng.choice(rows, size=min(rows, sample_size), replace=False))
+        vectors = np.asarray(self.embeddings[sample], dtype=np.float32)
+
+        centroids = vectors[rng.choice(len(vectors), size=n_lists, replace=False)]
+        for _ in range(iterations):
+            assignment = np.argmax(vectors @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, vectors)
+            empty = np.bincount(assignment, minlength=n_lists) == 0
+            # 빈 분할은 기존 중심 유지
+            sums[empty] = centroids[empty]
+            centroids = _normalize(sums)
+
+        assignment = np.concatenate([
+            np.argmax(np.asarray(self.embeddings[start:start + SEARCH_CHUNK_ROWS], dtype=np.float32) @ centroids.T,
+                      axis=1)
+            for start in range(0, rows, SEARCH_CHUNK_ROWS)
+        ])
+        self.centroids = centroids
+        self.list_rows = np.argsort(assignment, kind='stable').astype(np.int64)
+        self.list_offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=n_lists))])
+
+    def _probe_rows(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        """쿼리와 가까운 nprobe개 분할의 행"""
+        nearest = np.argsort(-(self.centroids @ query))[:nprobe]
+        return np.concatenate([self.list_rows[self.list_offsets[c]:self.list_offsets[c + 1]] for c in nearest])
+
+    def _scan(self, queries: np.ndarray, k: int, rows: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """전수 비교 top-k (청크별 부분 결과 병합)"""
+        total = len(self.embeddings) if rows is None else len(rows)
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+
+        for start in range(0, total, SEARCH_CHUNK_ROWS):
+            block_rows = (np.arange(start, min(total, start + SEARCH_CHUNK_ROWS)) if rows is None
+                          else rows[start:start + SEARCH_CHUNK_ROWS])
+            block = np.asarray(self.embeddings[block_rows], dtype=np.float32)
+            scores = np.concatenate([best_scores, queries @ block.T], axis=1)
+            candidates = np.concatenate([best_rows, np.broadcast_to(block_rows, (len(queries), len(block_rows)))], axis=1)
+            if scores.shape[1] > k:
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                scores = np.take_along_axis(scores, top, axis=1)
+                candidates = np.take_along_axis(candidates, top, axis=1)
+            best_scores, best_rows = scores, candidates
+
+        order = np.argsort(-best_scores, axis=1)
+        return np.take_along_axis(best_scores, order, axis=1), np.take_along_axis(best_rows, order, axis=1)
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int = 10,
+        incidents_only: bool = False,
+        nprobe: Optional[int] = None,
+        exclude_issue_keys: Optional[Sequence[str]] = None
+    ) -> List[List[Tuple[Dict, float]]]:
+        """
+        코사인 유사도 top-k 검색
+
+        Args:
+            queries: (Q, D) 또는 (D,) 쿼리 임베딩
+            k: 쿼리별 결과 수
+            incidents_only: True이면 장애 티켓만 검색
+            nprobe: IVF 탐색 분할 수 (IVF가 없거나 None이면 전수 비교)
+            exclude_issue_keys: 결과에서 제외할 issue_key (쿼리 티켓 자신, 같은 텍스트의 다른 티켓은 유지)
+
+        Returns:
+            List[List[Tuple[Dict, float]]]: 쿼리별 (entry, 유사도) 리스트 (유사도 내림차순)
+        """
+        queries = _normalize(np.atleast_2d(queries))
+        excluded = {self.row_by_issue_key[key] for key in (exclude_issue_keys or []) if key in self.row_by_issue_key}
+        subset = self.incident_rows if incidents_only else None
+        fetch = k + len(excluded)
+
+        results = []
+        if nprobe and self.centroids is not None:
+            for query in queries:
+                rows = self._probe_rows(query, nprobe)
+                if subset is not None:
+                    rows = np.intersect1d(rows, subset, assume_unique=True)
+                scores, found = self._scan(query[None, :], fetch, rows)
+                results.append((scores[0], found[0]))
+        else:
+            scores, found = self._scan(queries, fetch, subset)
+            results = list(zip(scores, found))
+
+        return [
+            [(self.entries[int(row)], float(score)) for score, row in zip(scores, found) if int(row) not in excluded][:k]
+            for scores, found in results
+        ]
+
+    def save(self, index_dir: str):
+        """float16 행렬(npy) + ID 매핑(json) + IVF(npz, 있으면) 저장"""
+        os.makedirs(index_dir, exist_ok=True)
+        np.save(os.path.join(index_dir, EMBEDDINGS_FILE), np.asarray(self.embeddings, dtype=np.float16))
+        with open(os.path.join(index_dir, EMBEDDING_IDS_FILE), 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+
+        ivf_path = os.path.join(index_dir, IVF_FILE)
+        if self.centroids is not None:
+            np.savez(ivf_path, centroids=self.centroids, list_offsets=self.list_offsets, list_rows=self.list_rows)
+        elif os.path.exists(ivf_path):
+            os.remove(ivf_path)
+
+    @classmethod
+    def load(cls, index_dir: str, mmap: bool = True) -> 'EmbeddingIndex':
+        """save()로 저장한 인덱스 로드 (기본은 행렬 memory map)"""
+        embeddings = np.load(os.path.join(index_dir, EMBEDDINGS_FILE), mmap_mode='r' if mmap else None)
+        with open(os.path.join(index_dir, EMBEDDING_IDS_FILE), 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+        index = cls(embeddings, entries)
+
+        ivf_path = os.path.join(index_dir, IVF_FILE)
+        if os.path.exists(ivf_path):
+            with np.load(ivf_path) as data:
+                index.centroids = data['centroids']
+                index.list_offsets = data['list_offsets']
+                index.list_rows = data['list_rows']
+        return index
+
+
+def build_embedding_index(
+    encoder,
+    texts: List[str],
+    entries: List[Dict],
+    batch_size: Optional[int] = None,
+    ivf_lists: Optional[int] = None
+) -> Tuple[EmbeddingIndex, Dict]:
+    """
+    티켓별 임베딩 인덱스 생성 (같은 내용 해시의 텍스트는 한 번만 인코딩)
+
+    임베딩은 모델 가중치에 따라 달라지므로 학습할 때마다 새로 생성
+
+    Args:
+        encoder: embed(texts, batch_size)를 제공하는 학습된 분류기
+        texts: 티켓별 모델 입력 텍스트
+        entries: 티켓별 {'issue_key', 'change_type', 'is_incident'} (content_hash는 여기서 추가)
+        batch_size: 임베딩 배치 크기
+        ivf_lists: IVF 분할 수 (0이면 생성 안 함, None이면 IVF_MIN_ROWS 이상일 때 자동)
+
+    Returns:
+        Tuple[EmbeddingIndex, Dict]: 인덱스, {'rows', 'encoded', 'dim', 'ivf_lists'}
+    """
+    hashes = [content_hash(text) for text in texts]
+    entries = [{**entry, 'content_hash': h} for entry, h in zip(entries, hashes)]
+
+    first_row = {}
+    for i, h in enumerate(hashes):
+        first_row.setdefault(h, i)
+    unique_rows = list(first_row.values())
+
+    encoded = encoder.embed([texts[i] for i in unique_rows], batch_size).astype(np.float16)
+    position = {h: j for j, h in enumerate(first_row)}
+    embeddings = encoded[np.array([position[h] for h in hashes], dtype=np.int64)]
+
+    index = EmbeddingIndex(embeddings, entries)
+    if ivf_lists != 0 and (ivf_lists or len(index) >= IVF_MIN_ROWS):
+        index.build_ivf(ivf_lists)
+
+    return index, {
+        'rows': len(index),
+        'encoded': len(unique_rows),
+        'dim': int(encoded.shape[1]),
+        'ivf_lists': 0 if index.centroids is None else len(index.centroids),
+    }
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+레이블링 엔진 벤치마크 스크립트
+합성 JIRA 티켓(한국어/영어)과 합성 메타데이터로 AutoLabeler/RiskCalculator 성능을 측정합니다.
+AWS 접속 없이 실행되며, 저장된 기준값 대비 성능이 떨어지면 실패(exit 1)합니다.
+
+사용법:
+    # 벤치마크 실행 및 기준값 비교
+    python impact-analysis-pytorch-bert-benchmark.py
+
+    # 기준값 갱신
+    python impact-analysis-pytorch-bert-benchmark.py --update-baseline
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import importlib.util
+from typing import Callable, Dict, List
+
+LABEL_SCRIPT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'impact-analysis-pytorch-bert-label-data.py')
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+# p99 비교 시 무시할 최소 증가폭 (ms)
+MIN_P99_DELTA_MS = 0.05
+
+# 합성 텍스트 어휘 (키워드가 아닌 일반 단어)
+KOREAN_WORDS = [
+    '요청', '처리', '기능', '화면', '서버', '확인', '변경', '적용', '수정', '개선',
+    '사용자', '관리자', '데이터', '조회', '등록', '삭제', '필요', '검토', '배포', '운영',
+    '테스트', '결과', '문의', '항목', '정보', '설정', '작업', '일정', '고객', '내용'
+]
+ENGLISH_WORDS = [
+    'request', 'update', 'service', 'module', 'check', 'value', 'page', 'list', 'flow',
+    'user', 'admin', 'report', 'field', 'status', 'option', 'detail', 'task', 'item',
+    'the', 'and', 'for', 'with', 'from', 'to', 'in', 'of', 'on', 'after', 'before', 'when'
+]
+COMPONENTS = ['web', 'mobile', 'admin', 'payment', 'order', 'member', 'batch', 'search', 'api-gateway', 'billing']
+
+
+def load_label_module():
+    """레이블링 스크립트를 모듈로 로드 (파일명에 '-'가 있어 import 불가)"""
+    spec = importlib.util.spec_from_file_location('label_data', LABEL_SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def generate_metadata(label_keys: List[str], rng: random.Random, keywords_per_label: int = 8) -> Dict[str, str]:
+    """
+    합성 메타데이터 생성 (DynamoDB 저장 형식 {dataId: metadata})
+
+    Args:
+        label_keys: LABEL_KEYWORDS 레이블 목록
+        rng: 시드 고정 난수 생성기
+        keywords_per_label: 레이블별 키워드 수
+
+    Returns:
+        Dict[str, str]: 합성 메타데이터
+    """
+    items = {}
+    for label in label_keys:
+        prefix = label.split('_')[0]
+        keywords = [f"{prefix}{i}" for i in range(keywords_per_label // 2)]
+        keywords += [f"{label.replace('_', '')}키워드{i}" for i in range(keywords_per_label - len(keywords))]
+        items[f"LABEL_KEYWORDS#{label}"] = '|'.join(keywords)
+
+    items['CHANGE_TYPE_RISK_SCORES'] = '|'.join(f"{label}:{rng.randint(3, 85)}" for label in label_keys)
+    items['HIGH_RISK_KEYWORDS'] = '|'.join(f"위험{i}:{rng.choice([5, 10, 15, 20])}" for i in range(20))
+    items['HIGH_RISK_COMPONENTS'] = 'payment|billing|order'
+    items['NORMAL_COMPONENT_RISK_SCORE'] = '2'
+    items['COMMENT_RISK_KEYWORDS'] = '|'.join(['rollback', '롤백', '장애', 'hotfix', '긴급', 'revert'])
+    items['HIGH_RISK_SERVICE_KEYWORDS'] = '|'.join(['PAY', 'AUTH', 'EKS'])
+    return items
+
+
+def generate_tickets(
+    count: int,
+    metadata: Dict[str, str],
+    rng: random.Random,
+    keyword_density: float = 0.03
+) -> List[Dict]:
+    """
+    합성 JIRA 티켓 생성 (길이, 댓글 수, 키워드 밀도 다양화)
+
+    Args:
+        count: 티켓 수
+        metadata: generate_metadata 결과
+        rng: 시드 고정 난수 생성기
+        keyword_density: 단어 중 메타데이터 키워드 비율 (티켓별로 0~2배 변동)
+
+    Returns:
+        List[Dict]: JIRA 티켓 리스트
+    """
+    label_keywords = [
+        kw for data_id, value in metadata.items() if data_id.startswith('LABEL_KEYWORDS#')
+        for kw in value.split('|')
+    ]
+    risk_keywords = [item.split(':', 1)[0] for item in metadata['HIGH_RISK_KEYWORDS'].split('|')]
+    risk_keywords += metadata['HIGH_RISK_SERVICE_KEYWORDS'].split('|')
+    comment_keywords = metadata['COMMENT_RISK_KEYWORDS'].split('|')
+    label_keys = [data_id.split('#', 1)[1] for data_id in metadata if data_id.startswith('LABEL_KEYWORDS#')]
+
+    def sentence(length: int, density: float) -> str:
+        words = []
+        for _ in range(length):
+            roll = rng.random()
+            if roll < density:
+                words.append(rng.choice(label_keywords))
+            elif roll < density * 1.3:
+                words.append(rng.choice(risk_keywords))
+            else:
+                words.append(rng.choice(KOREAN_WORDS if rng.random() < 0.6 else ENGLISH_WORDS))
+        return ' '.join(words)
+
+    tickets = []
+    for i in range(count):
+        density = keyword_density * rng.uniform(0.0, 2.0)
+        # 한 줄 요약부터 여러 페이지 설명까지 (로그정규 분포)
+        description_length = min(2000, int(rng.lognormvariate(4.0, 1.0)))
+        comment_count = min(25, int(rng.expovariate(0.3)))
+
+        comments = []
+        for _ in range(comment_count):
+            body = sentence(rng.randint(3, 40), density)
+            if rng.random() < 0.1:
+                body += ' ' + rng.choice(comment_keywords)
+            comments.append({'author': f"user{rng.randint(1, 50)}", 'body': body, 'created': ''})
+
+        tickets.append({
+            'issue_key': f"BENCH-{i + 1}",
+            'summary': sentence(rng.randint(3, 15), density * 2),
+            'description': sentence(description_length, density),
+            'components': rng.sample(COMPONENTS, rng.randint(0, 3)),
+            'comments': comments,
+            'changeType': rng.choice(label_keys)
+        })
+
+    return tickets
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """정렬된 값 리스트의 백분위수 (nearest-rank)"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(pct / 100.0 * len(values))) - 1))
+    return values[index]
+
+
+def measure(name: str, func: Callable[[Dict], object], tickets: List[Dict], repeat: int = 1) -> Dict:
+    """
+    티켓별 호출 지연 시간 측정
+
+    Args:
+        name: 벤치마크 이름
+        func: 티켓 하나를 처리하는 함수
+        tickets: 합성 티켓 리스트
+        repeat: 반복 횟수 (가장 빠른 회차 사용)
+
+    Returns:
+        Dict: tickets_per_sec, p50_ms, p99_ms
+    """
+    best = None
+    for _ in range(repeat):
+        latencies = []
+        started = time.perf_counter()
+        for ticket in tickets:
+            call_started = time.perf_counter()
+            func(ticket)
+            latencies.append(time.perf_counter() - call_started)
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        result = {
+            'tickets_per_sec': len(tickets) / elapsed if elapsed > 0 else 0.0,
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000,
+        }
+        if best is None or result['tickets_per_sec'] > best['tickets_per_sec']:
+            best = result
+
+    print(f"  {name:<44} {best['tickets_per_sec']:>12,.0f} tickets/s   "
+          f"p50 {best['p50_ms']:.3f} ms   p99 {best['p99_ms']:.3f} ms")
+    return best
+
+
+def run_benchmarks(tickets: List[Dict], label_data, repeat: int) -> Dict[str, Dict]:
+    """AutoLabeler/RiskCalculator 주요 함수 벤치마크"""
+    labeler = label_data.AutoLabeler()
+    calculator = label_data.RiskCalculator
+
+    return {
+        'predict_label': measure(
+            'AutoLabeler.predict_label',
+            lambda t: labeler.predict_label(t['summary'], t['description']),
+            tickets, repeat
+        ),
+        'predict_top_labels': measure(
+            'AutoLabeler.predict_top_labels',
+            lambda t: labeler.predict_top_labels(t['summary'], t['description'], top_k=3),
+            tickets, repeat
+        ),
+        'calculate_risk_score': measure(
+            'RiskCalculator.calculate_risk_score',
+            lambda t: calculator.calculate_risk_score(
+                t['changeType'], t['summary'], t['description'], t['components'], t['comments']
+            ),
+            tickets, repeat
+        ),
+        'calculate_comment_risk_score': measure(
+            'RiskCalculator.calculate_comment_risk_score',
+            lambda t: calculator.calculate_comment_risk_score(t['comments']),
+            tickets, repeat
+        ),
+    }
+
+
+def compare_with_baseline(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """
+    기준값 대비 성능 저하 항목 반환
+
+    Args:
+        results: 현재 측정값
+        baseline: 저장된 기준값
+        tolerance: 허용 저하 비율 (0.2 = 20%)
+
+    Returns:
+        List[str]: 성능 저하 설명 리스트 (비어 있으면 통과)
+    """
+    regressions = []
+    for name, current in results.items():
+        if name not in baseline:
+            regressions.append(f"{name}: no baseline entry (run with --update-baseline)")
+            continue
+        base = baseline[name]
+
+        if current['tickets_per_sec'] < base['tickets_per_sec'] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {current['tickets_per_sec']:,.0f} < "
+                f"baseline {base['tickets_per_sec']:,.0f} tickets/s"
+            )
+        # 마이크로초 단위 지터는 무시 (MIN_P99_DELTA_MS 이상 증가한 경우만)
+        if current['p99_ms'] > max(base['p99_ms'] * (1 + tolerance), base['p99_ms'] + MIN_P99_DELTA_MS):
+            regressions.append(
+                f"{name}: p99 {current['p99_ms']:.3f} ms > baseline {base['p99_ms']:.3f} ms"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Labeling engine benchmark (no AWS access)")
+    parser.add_argument('--tickets', type=int, default=5000, help='합성 티켓 수')
+    parser.add_argument('--seed', type=int, default=42, help='난수 시드')
+    parser.add_argument('--keyword-density', type=float, default=0.03, help='평균 키워드 밀도')
+    parser.add_argument('--repeat', type=int, default=3, help='반복 횟수 (가장 빠른 회차 사용)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH, help='기준값 JSON 경로')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='허용 성능 저하 비율')
+    parser.add_argument('--update-baseline', action='store_true', help='현재 측정값으로 기준값 갱신')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("Labeling Engine Benchmark")
+    print("=" * 80)
+
+    label_data = load_label_module()
+    rng = random.Random(args.seed)
+
+    metadata = generate_metadata(label_data.LABEL_KEYWORD_KEYS, rng)
+    label_data.apply_metadata_items(metadata)
+    label_data.RiskCalculator.set_incident_risk_stats({
+        label: {'incident_rate': rng.random() * 0.5}
+        for label in label_data.LABEL_KEYWORD_KEYS
+    })
+
+    tickets = generate_tickets(args.tickets, metadata, rng, args.keyword_density)
+    print(f"\nGenerated {len(tickets)} synthetic tickets (seed: {args.seed})")
+    print(f"  Avg description words: {sum(len(t['description'].split()) for t in tickets) / len(tickets):.0f}")
+    print(f"  Avg comments: {sum(len(t['comments']) for t in tickets) / len(tickets):.1f}\n")
+
+    results = run_benchmarks(tickets, label_data, args.repeat)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✓ Baseline updated: {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        # 기준값 없이 통과하면 CI에서 회귀를 놓치므로 실패 처리
+        print(f"\n❌ No baseline found at {args.baseline}. Run with --update-baseline to create one.")
+        sys.exit(1)
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    regressions = compare_with_baseline(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n❌ Performance regression detected (tolerance: {args.tolerance * 100:.0f}%):")
+        for regression in regressions:
+            print(f"  - {regression}")
+        sys.exit(1)
+
+    print(f"\n✓ No regression against baseline (tolerance: {args.tolerance * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
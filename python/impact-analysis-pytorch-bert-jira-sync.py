@@ -11,16 +11,21 @@
 
     # 기본값 사용 (DEFAULT_SPRINTS)
     python read_jira_issue_sprint_db.py
+
+    # 단계별 소요 시간 리포트 + cProfile 저장
+    python read_jira_issue_sprint_db.py xxxx --profile
 """
 import sys
 import os
 import json
+import argparse
 import boto3
 from jira import JIRA
 from datetime import datetime
 import pytz
 import requests
 from requests.auth import HTTPBasicAuth
+from instrumentation import instrumentation, estimate_bytes, add_instrumentation_arguments
 
 # config-jira.py에서 설정 읽기
 sys.path.append('/git/xxxx')
@@ -93,7 +98,9 @@ def get_jira_issue(issue_key):
         )
 
         # 이슈 가져오기
-        issue = jira.issue(issue_key)
+        with instrumentation.phase('jira_fetch'):
+            issue = jira.issue(issue_key)
+        instrumentation.count('jira', bytes_in=estimate_bytes(getattr(issue, 'raw', None)))
 
         # summary, description, components, created, status 추출
         summary = str(issue.fields.summary) if issue.fields.summary else ""
@@ -263,7 +270,9 @@ def save_to_dynamodb(data, issue_key):
         item['updatedAt'] = now_kst.strftime('%Y-%m-%d %H:%M')
 
         # DynamoDB에 저장
-        table.put_item(Item=item)
+        with instrumentation.phase('dynamodb_write'):
+            table.put_item(Item=item)
+        instrumentation.count('dynamodb', bytes_out=estimate_bytes(item))
 
         print(f"Successfully saved to DynamoDB: {DYNAMODB_TABLE_NAME} (dataId: {issue_key})")
         return True
@@ -318,7 +327,9 @@ def search_issues_by_sprint(sprint_name):
                     'fields': '*all'
                 }
 
-                response = requests.get(url, auth=auth, headers=headers, params=params)
+                with instrumentation.phase('jira_search'):
+                    response = requests.get(url, auth=auth, headers=headers, params=params)
+                instrumentation.count('jira', bytes_in=len(response.content))
 
                 if response.status_code == 200:
                     data = response.json()
@@ -376,13 +387,27 @@ def process_issue(issue_key):
         print(f"Failed to fetch issue: {issue_key}")
         return False
 
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="Sync Jira sprint issues to DynamoDB")
+    # 여러 Sprint를 공백으로 구분하여 입력 가능
+    parser.add_argument('sprints', nargs='*', help='Sprint 이름 (기본값: DEFAULT_SPRINTS)')
+    add_instrumentation_arguments(parser, '.')
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+    instrumentation.configure('jira-sync', args.report_dir, profile=args.profile)
+
+    try:
+        run(args)
+    finally:
+        instrumentation.print_summary()
+        instrumentation.write_report()
+
+def run(args):
     # 명령행 인자에서 Sprint 이름 가져오기
-    # 여러 Sprint를 공백으로 구분하여 입력 가능
-    if len(sys.argv) > 1:
-        sprint_names = sys.argv[1:]  # 모든 인자를 Sprint 이름으로 사용
-    else:
-        sprint_names = DEFAULT_SPRINTS
+    sprint_names = args.sprints if args.sprints else DEFAULT_SPRINTS
 
     print(f"Processing {len(sprint_names)} Sprint(s): {', '.join(sprint_names)}")
     print("=" * 80)
@@ -431,6 +456,9 @@ def main():
         total_success += success_count
         total_fail += fail_count
 
+    instrumentation.set('issues', total_issues)
+    instrumentation.set('failed', total_fail)
+
     # 전체 결과 요약
     print("\n" + "=" * 80)
     print("Overall Processing Summary:")
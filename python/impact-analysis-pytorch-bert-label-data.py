@@ -3,20 +3,202 @@
 학습 데이터 레이블링을 위한 스크립트
 DynamoDB의 incident에 changeType을 자동 또는 수동으로 추가합니다.
 """
+import os
 import sys
 import re
+import copy
+import queue
+import json
+import time
+import argparse
+import threading
+import multiprocessing
 import boto3
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime
+from decimal import Decimal
+from boto3.dynamodb.types import TypeSerializer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import pytz
 from typing import Optional, Dict, List, Tuple, Set
-from data_loader import JiraDataLoader
+from projected_loader import ProjectedJiraDataLoader, TEXT_FIELDS, RISK_FIELDS, PREPROCESSOR_FIELDS
+from preprocessor import JiraTextPreprocessor
+from instrumentation import instrumentation, estimate_bytes, add_instrumentation_arguments
+from micro_batcher import MicroBatcher
+from metadata_version import METADATA_VERSION_ID, bump_metadata_version
+from ticket import Ticket, compact_tickets
+from ticket_snapshot import ensure_snapshot, DEFAULT_MAX_AGE_HOURS as SNAPSHOT_MAX_AGE_HOURS
 from config import (
     AWS_REGION,
     DYNAMODB_TABLE_NAME,
-    CHANGE_TYPES
+    CHANGE_TYPES,
+    MODEL_DIR
 )
 
 
+# LABEL_KEYWORDS#<key> 형태로 저장된 레이블 키 목록
+LABEL_KEYWORD_KEYS = [
+    'feature_new', 'feature_api', 'feature_ui', 'feature_batch', 'feature_data',
+    'bugfix_critical', 'bugfix_data', 'bugfix_ui', 'bugfix_logic', 'bugfix_minor',
+    'enhancement_ux', 'enhancement_logic', 'enhancement_data',
+    'performance_query', 'performance_api', 'performance_batch',
+    'config_infra', 'config_env', 'config_remove', 'config_decommission',
+    'upgrade_db', 'upgrade_platform', 'upgrade_jdk', 'upgrade_eks',
+    'security_auth', 'security_data', 'security_patch',
+    'refactoring', 'text_change', 'other'
+]
+
+# 위험평가점수 관련 메타데이터 dataId 목록
+RISK_METADATA_IDS = [
+    'CHANGE_TYPE_RISK_SCORES',
+    'HIGH_RISK_KEYWORDS',
+    'HIGH_RISK_COMPONENTS',
+    'NORMAL_COMPONENT_RISK_SCORE',
+    'COMMENT_RISK_KEYWORDS',
+    'HIGH_RISK_SERVICE_KEYWORDS'
+]
+
+
+def fetch_metadata_items(metadata_table) -> Dict[str, str]:
+    """
+    impactanalysis-metadata 테이블에서 메타데이터 원본 문자열 조회 (읽기 전용)
+
+    Args:
+        metadata_table: DynamoDB Table 리소스
+
+    Returns:
+        Dict[str, str]: {dataId: metadata} (존재하지 않는 항목은 제외)
+    """
+    items = {}
+    data_ids = [f"LABEL_KEYWORDS#{key}" for key in LABEL_KEYWORD_KEYS] + RISK_METADATA_IDS
+
+    for data_id in data_ids:
+        try:
+            response = metadata_table.get_item(Key={'dataId': data_id})
+            instrumentation.count('dynamodb', bytes_in=estimate_bytes(response.get('Item')))
+            if 'Item' in response:
+                items[data_id] = response['Item'].get('metadata', '')
+            else:
+                print(f"  Warning: {data_id} not found, using default values")
+        except Exception as e:
+            print(f"  Warning: Failed to load {data_id}: {e}")
+
+    return items
+
+
+def parse_score_map(metadata: str) -> Dict[str, int]:
+    """'key:score|key:score' 형식의 메타데이터 파싱"""
+    scores = {}
+    for item in metadata.split('|'):
+        if ':' in item:
+            k, v = item.split(':', 1)
+            scores[k] = int(v)
+    return scores
+
+
+def parse_metadata_items(items: Dict[str, str]) -> Dict:
+    """
+    메타데이터 원본 문자열을 파싱하여 전역 변수 값으로 변환 (전역 변수는 변경하지 않음)
+    items에 없는 항목은 결과에서 제외 (LABEL_KEYWORDS는 없는 레이블만 기존 값 유지)
+
+    Args:
+        items: {dataId: metadata} (DynamoDB 저장 형식과 동일)
+
+    Returns:
+        Dict: {전역 변수 이름: 값}
+    """
+    values = {}
+
+    # 1. LABEL_KEYWORDS
+    previous_keywords = LABEL_KEYWORDS if isinstance(LABEL_KEYWORDS, dict) else {}
+    label_keywords_loaded = {}
+    for key in LABEL_KEYWORD_KEYS:
+        data_id = f"LABEL_KEYWORDS#{key}"
+        if data_id in items:
+            metadata = items[data_id]
+            label_keywords_loaded[key] = metadata.split('|') if metadata else []
+        else:
+            label_keywords_loaded[key] = previous_keywords.get(key, [])
+
+    values['LABEL_KEYWORDS'] = label_keywords_loaded
+    print(f"  ✓ Loaded LABEL_KEYWORDS ({len(label_keywords_loaded)} categories)")
+
+    # 2. CHANGE_TYPE_RISK_SCORES
+    if 'CHANGE_TYPE_RISK_SCORES' in items:
+        values['CHANGE_TYPE_RISK_SCORES'] = parse_score_map(items['CHANGE_TYPE_RISK_SCORES'])
+        print(f"  ✓ Loaded CHANGE_TYPE_RISK_SCORES ({len(values['CHANGE_TYPE_RISK_SCORES'])} entries)")
+
+    # 3. HIGH_RISK_KEYWORDS
+    if 'HIGH_RISK_KEYWORDS' in items:
+        values['HIGH_RISK_KEYWORDS'] = parse_score_map(items['HIGH_RISK_KEYWORDS'])
+        print(f"  ✓ Loaded HIGH_RISK_KEYWORDS ({len(values['HIGH_RISK_KEYWORDS'])} keywords)")
+
+    # 4. HIGH_RISK_COMPONENTS
+    if 'HIGH_RISK_COMPONENTS' in items:
+        metadata = items['HIGH_RISK_COMPONENTS']
+        values['HIGH_RISK_COMPONENTS'] = set(metadata.split('|')) if metadata else set()
+        print(f"  ✓ Loaded HIGH_RISK_COMPONENTS ({len(values['HIGH_RISK_COMPONENTS'])} components)")
+
+    # 5. NORMAL_COMPONENT_RISK_SCORE
+    if 'NORMAL_COMPONENT_RISK_SCORE' in items:
+        metadata = items['NORMAL_COMPONENT_RISK_SCORE']
+        values['NORMAL_COMPONENT_RISK_SCORE'] = int(metadata) if metadata else 2
+        print(f"  ✓ Loaded NORMAL_COMPONENT_RISK_SCORE (value: {values['NORMAL_COMPONENT_RISK_SCORE']})")
+
+    # 6. COMMENT_RISK_KEYWORDS
+    if 'COMMENT_RISK_KEYWORDS' in items:
+        metadata = items['COMMENT_RISK_KEYWORDS']
+        values['COMMENT_RISK_KEYWORDS'] = metadata.split('|') if metadata else []
+        print(f"  ✓ Loaded COMMENT_RISK_KEYWORDS ({len(values['COMMENT_RISK_KEYWORDS'])} keywords)")
+
+    # 7. HIGH_RISK_SERVICE_KEYWORDS
+    if 'HIGH_RISK_SERVICE_KEYWORDS' in items:
+        metadata = items['HIGH_RISK_SERVICE_KEYWORDS']
+        values['HIGH_RISK_SERVICE_KEYWORDS'] = metadata.split('|') if metadata else []
+        print(f"  ✓ Loaded HIGH_RISK_SERVICE_KEYWORDS ({len(values['HIGH_RISK_SERVICE_KEYWORDS'])} keywords)")
+
+    return values
+
+
+def apply_metadata_items(items: Dict[str, str]):
+    """
+    메타데이터 원본 문자열을 파싱하여 전역 변수에 할당
+    items에 없는 항목은 기존 값을 유지
+
+    Args:
+        items: {dataId: metadata} (DynamoDB 저장 형식과 동일)
+    """
+    install_metadata_values(parse_metadata_items(items))
+
+
+def install_metadata_values(values: Dict):
+    """
+    parse_metadata_items 결과를 전역 변수에 할당 (values에 없는 항목은 기존 값 유지)
+
+    Args:
+        values: {전역 변수 이름: 값}
+    """
+    global LABEL_KEYWORDS, CHANGE_TYPE_RISK_SCORES, HIGH_RISK_KEYWORDS
+    global HIGH_RISK_COMPONENTS, NORMAL_COMPONENT_RISK_SCORE
+    global COMMENT_RISK_KEYWORDS, HIGH_RISK_SERVICE_KEYWORDS
+
+    if 'LABEL_KEYWORDS' in values:
+        LABEL_KEYWORDS = values['LABEL_KEYWORDS']
+    if 'CHANGE_TYPE_RISK_SCORES' in values:
+        CHANGE_TYPE_RISK_SCORES = values['CHANGE_TYPE_RISK_SCORES']
+    if 'HIGH_RISK_KEYWORDS' in values:
+        HIGH_RISK_KEYWORDS = values['HIGH_RISK_KEYWORDS']
+    if 'HIGH_RISK_COMPONENTS' in values:
+        HIGH_RISK_COMPONENTS = values['HIGH_RISK_COMPONENTS']
+    if 'NORMAL_COMPONENT_RISK_SCORE' in values:
+        NORMAL_COMPONENT_RISK_SCORE = values['NORMAL_COMPONENT_RISK_SCORE']
+    if 'COMMENT_RISK_KEYWORDS' in values:
+        COMMENT_RISK_KEYWORDS = values['COMMENT_RISK_KEYWORDS']
+    if 'HIGH_RISK_SERVICE_KEYWORDS' in values:
+        HIGH_RISK_SERVICE_KEYWORDS = values['HIGH_RISK_SERVICE_KEYWORDS']
+
+
 def load_metadata_from_dynamodb(profile_name='AUTO', region_name='ap-northeast-2'):
     """
     DynamoDB에서 메타데이터를 로드하여 전역 변수에 할당
@@ -31,134 +213,185 @@ def load_metadata_from_dynamodb(profile_name='AUTO', region_name='ap-northeast-2
 
         print("Loading metadata from DynamoDB...")
 
-        # 전역 변수 선언
-        global LABEL_KEYWORDS, CHANGE_TYPE_RISK_SCORES, HIGH_RISK_KEYWORDS
-        global HIGH_RISK_COMPONENTS, NORMAL_COMPONENT_RISK_SCORE
-        global COMMENT_RISK_KEYWORDS, HIGH_RISK_SERVICE_KEYWORDS
-
-        # 1. LABEL_KEYWORDS 로드
-        label_keywords_loaded = {}
-        label_keys = [
-            'feature_new', 'feature_api', 'feature_ui', 'feature_batch', 'feature_data',
-            'bugfix_critical', 'bugfix_data', 'bugfix_ui', 'bugfix_logic', 'bugfix_minor',
-            'enhancement_ux', 'enhancement_logic', 'enhancement_data',
-            'performance_query', 'performance_api', 'performance_batch',
-            'config_infra', 'config_env', 'config_remove', 'config_decommission',
-            'upgrade_db', 'upgrade_platform', 'upgrade_jdk', 'upgrade_eks',
-            'security_auth', 'security_data', 'security_patch',
-            'refactoring', 'text_change', 'other'
-        ]
+        with instrumentation.phase('metadata_load'):
+            items = fetch_metadata_items(metadata_table)
+            apply_metadata_items(items)
 
-        for key in label_keys:
-            data_id = f"LABEL_KEYWORDS#{key}"
-            try:
-                response = metadata_table.get_item(Key={'dataId': data_id})
-                if 'Item' in response:
-                    metadata = response['Item'].get('metadata', '')
-                    label_keywords_loaded[key] = metadata.split('|') if metadata else []
-                else:
-                    print(f"  Warning: {data_id} not found, using default values")
-                    label_keywords_loaded[key] = LABEL_KEYWORDS.get(key, [])
-            except Exception as e:
-                print(f"  Warning: Failed to load {data_id}: {e}")
-                label_keywords_loaded[key] = LABEL_KEYWORDS.get(key, [])
+        print("Metadata loaded successfully from DynamoDB.\n")
+        return True
 
-        LABEL_KEYWORDS = label_keywords_loaded
-        print(f"  ✓ Loaded LABEL_KEYWORDS ({len(LABEL_KEYWORDS)} categories)")
+    except Exception as e:
+        print(f"Error loading metadata from DynamoDB: {e}")
+        print("Using default hardcoded values.\n")
+        return False
 
-        # 2. CHANGE_TYPE_RISK_SCORES 로드
-        try:
-            response = metadata_table.get_item(Key={'dataId': 'CHANGE_TYPE_RISK_SCORES'})
-            if 'Item' in response:
-                metadata = response['Item'].get('metadata', '')
-                risk_scores_dict = {}
-                for item in metadata.split('|'):
-                    if ':' in item:
-                        k, v = item.split(':', 1)
-                        risk_scores_dict[k] = int(v)
-                CHANGE_TYPE_RISK_SCORES = risk_scores_dict
-                print(f"  ✓ Loaded CHANGE_TYPE_RISK_SCORES ({len(CHANGE_TYPE_RISK_SCORES)} entries)")
-            else:
-                print("  Warning: CHANGE_TYPE_RISK_SCORES not found, using default values")
-        except Exception as e:
-            print(f"  Warning: Failed to load CHANGE_TYPE_RISK_SCORES: {e}")
 
-        # 3. HIGH_RISK_KEYWORDS 로드
-        try:
-            response = metadata_table.get_item(Key={'dataId': 'HIGH_RISK_KEYWORDS'})
-            if 'Item' in response:
-                metadata = response['Item'].get('metadata', '')
-                high_risk_dict = {}
-                for item in metadata.split('|'):
-                    if ':' in item:
-                        k, v = item.split(':', 1)
-                        high_risk_dict[k] = int(v)
-                HIGH_RISK_KEYWORDS = high_risk_dict
-                print(f"  ✓ Loaded HIGH_RISK_KEYWORDS ({len(HIGH_RISK_KEYWORDS)} keywords)")
-            else:
-                print("  Warning: HIGH_RISK_KEYWORDS not found, using default values")
-        except Exception as e:
-            print(f"  Warning: Failed to load HIGH_RISK_KEYWORDS: {e}")
+# 변경 유형별 키워드 매핑 (세분화) - DynamoDB 저장
+LABEL_KEYWORDS = ""
 
-        # 4. HIGH_RISK_COMPONENTS 로드
-        try:
-            response = metadata_table.get_item(Key={'dataId': 'HIGH_RISK_COMPONENTS'})
-            if 'Item' in response:
-                metadata = response['Item'].get('metadata', '')
-                HIGH_RISK_COMPONENTS = set(metadata.split('|')) if metadata else set()
-                print(f"  ✓ Loaded HIGH_RISK_COMPONENTS ({len(HIGH_RISK_COMPONENTS)} components)")
-            else:
-                print("  Warning: HIGH_RISK_COMPONENTS not found, using default values")
-        except Exception as e:
-            print(f"  Warning: Failed to load HIGH_RISK_COMPONENTS: {e}")
+# 기존 레이블 재분류 / 신규 자동 레이블링 신뢰도 임계값 (main 실행 흐름과 동일)
+RECLASSIFY_THRESHOLD = 0.2
+AUTO_LABEL_THRESHOLD = 0.3
 
-        # 5. NORMAL_COMPONENT_RISK_SCORE 로드
-        try:
-            response = metadata_table.get_item(Key={'dataId': 'NORMAL_COMPONENT_RISK_SCORE'})
-            if 'Item' in response:
-                metadata = response['Item'].get('metadata', '')
-                NORMAL_COMPONENT_RISK_SCORE = int(metadata) if metadata else 2
-                print(f"  ✓ Loaded NORMAL_COMPONENT_RISK_SCORE (value: {NORMAL_COMPONENT_RISK_SCORE})")
-            else:
-                print("  Warning: NORMAL_COMPONENT_RISK_SCORE not found, using default values")
-        except Exception as e:
-            print(f"  Warning: Failed to load NORMAL_COMPONENT_RISK_SCORE: {e}")
+# riskpoint를 구성하는 요소 (DynamoDB riskFactors 속성에 요소별로 저장)
+RISK_FACTORS = ('base', 'keyword', 'incident', 'component', 'comment', 'service', 'similar_incident')
 
-        # 6. COMMENT_RISK_KEYWORDS 로드
-        try:
-            response = metadata_table.get_item(Key={'dataId': 'COMMENT_RISK_KEYWORDS'})
-            if 'Item' in response:
-                metadata = response['Item'].get('metadata', '')
-                COMMENT_RISK_KEYWORDS = metadata.split('|') if metadata else []
-                print(f"  ✓ Loaded COMMENT_RISK_KEYWORDS ({len(COMMENT_RISK_KEYWORDS)} keywords)")
-            else:
-                print("  Warning: COMMENT_RISK_KEYWORDS not found, using default values")
-        except Exception as e:
-            print(f"  Warning: Failed to load COMMENT_RISK_KEYWORDS: {e}")
+# 유사 과거 장애 (학습 스크립트 --embedding-index 산출물): 점수 부여 최소 코사인 유사도, 최대 점수
+EMBEDDING_INDEX_DIR = f"{MODEL_DIR}/embedding_index"
+SIMILAR_INCIDENT_MIN_SIMILARITY = 0.85
+SIMILAR_INCIDENT_MAX_SCORE = 10
+# 인덱스에 없는 티켓의 임베딩 캐시 크기 (같은 티켓을 여러 레이블로 점수 계산할 때 재인코딩 방지)
+SIMILAR_VECTOR_CACHE_SIZE = 4096
 
-        # 7. HIGH_RISK_SERVICE_KEYWORDS 로드
-        try:
-            response = metadata_table.get_item(Key={'dataId': 'HIGH_RISK_SERVICE_KEYWORDS'})
-            if 'Item' in response:
-                metadata = response['Item'].get('metadata', '')
-                HIGH_RISK_SERVICE_KEYWORDS = metadata.split('|') if metadata else []
-                print(f"  ✓ Loaded HIGH_RISK_SERVICE_KEYWORDS ({len(HIGH_RISK_SERVICE_KEYWORDS)} keywords)")
+# 마지막 riskpoint 계산에 사용된 메타데이터 스냅샷 (impactanalysis-metadata)
+RISK_METADATA_SNAPSHOT_ID = 'RISKPOINT#METADATA_SNAPSHOT'
+
+
+def build_risk_metadata_snapshot() -> Dict:
+    """
+    현재 riskpoint 계산에 사용되는 메타데이터를 비교 가능한 형태로 반환
+
+    Returns:
+        Dict: 메타데이터 항목별 값 (incident 비율 포함)
+    """
+    incident_stats = RiskCalculator.load_incident_risk_stats()
+    return {
+        'CHANGE_TYPE_RISK_SCORES': dict(CHANGE_TYPE_RISK_SCORES),
+        'HIGH_RISK_KEYWORDS': dict(HIGH_RISK_KEYWORDS),
+        'HIGH_RISK_COMPONENTS': sorted(HIGH_RISK_COMPONENTS),
+        'NORMAL_COMPONENT_RISK_SCORE': NORMAL_COMPONENT_RISK_SCORE,
+        'COMMENT_RISK_KEYWORDS': sorted(COMMENT_RISK_KEYWORDS),
+        'HIGH_RISK_SERVICE_KEYWORDS': sorted(HIGH_RISK_SERVICE_KEYWORDS),
+        'INCIDENT_RATES': {
+            change_type: float(data.get('incident_rate', 0.0))
+            for change_type, data in incident_stats.items()
+        },
+    }
+
+
+def diff_risk_metadata(old: Dict, new: Dict) -> Dict[str, Set[str]]:
+    """
+    두 메타데이터 스냅샷을 비교하여 재계산이 필요한 요소와 변경된 항목을 반환
+
+    Args:
+        old: 이전 스냅샷
+        new: 현재 스냅샷
+
+    Returns:
+        Dict[str, Set[str]]: {factor: 변경된 항목 집합}
+            - base/incident: 변경된 changeType
+            - keyword/comment/service: 추가/삭제/점수 변경된 키워드
+            - component: 추가/삭제된 고위험 컴포넌트 ('*'이면 전체 컴포넌트)
+    """
+    def changed_keys(old_map: Dict, new_map: Dict) -> Set[str]:
+        keys = set(old_map) | set(new_map)
+        return {k for k in keys if old_map.get(k) != new_map.get(k)}
+
+    changes = {
+        'base': changed_keys(old.get('CHANGE_TYPE_RISK_SCORES', {}), new['CHANGE_TYPE_RISK_SCORES']),
+        'keyword': changed_keys(old.get('HIGH_RISK_KEYWORDS', {}), new['HIGH_RISK_KEYWORDS']),
+        'incident': changed_keys(old.get('INCIDENT_RATES', {}), new['INCIDENT_RATES']),
+        'component': set(old.get('HIGH_RISK_COMPONENTS', [])) ^ set(new['HIGH_RISK_COMPONENTS']),
+        'comment': set(old.get('COMMENT_RISK_KEYWORDS', [])) ^ set(new['COMMENT_RISK_KEYWORDS']),
+        'service': set(old.get('HIGH_RISK_SERVICE_KEYWORDS', [])) ^ set(new['HIGH_RISK_SERVICE_KEYWORDS']),
+    }
+
+    # 일반 컴포넌트 점수가 바뀌면 컴포넌트가 있는 모든 티켓이 대상
+    if old.get('NORMAL_COMPONENT_RISK_SCORE') != new['NORMAL_COMPONENT_RISK_SCORE']:
+        changes['component'] = {'*'}
+
+    return {factor: items for factor, items in changes.items() if items}
+
+
+class RiskFactorIndex:
+    """위험 요소별 재계산 대상 티켓을 찾기 위한 역색인 (keyword/component/changeType -> issue_key)"""
+
+    def __init__(self, tickets: List[Dict], change_types: Dict[str, str]):
+        """
+        Args:
+            tickets: JIRA 티켓 리스트
+            change_types: {issue_key: changeType} 매핑
+        """
+        self.tickets = tickets
+        self.by_change_type = {}
+        self.by_component = {}
+        self.with_components = set()
+
+        for ticket in tickets:
+            issue_key = ticket.get('issue_key')
+            change_type = change_types.get(issue_key)
+            self.by_change_type.setdefault(change_type, set()).add(issue_key)
+
+            for component in ticket.get('components', []) or []:
+                self.by_component.setdefault(component.lower(), set()).add(issue_key)
+                self.with_components.add(issue_key)
+
+    def keyword_index(self, keywords: Set[str], source: str) -> Dict[str, Set[str]]:
+        """
+        주어진 키워드에 대해서만 keyword -> issue_key 역색인 생성 (티켓 1회 순회)
+
+        Args:
+            keywords: 색인할 키워드 집합
+            source: 'text' (summary+description, 소문자), 'service' (원본 대소문자),
+                    'comment' (댓글 본문, 소문자)
+
+        Returns:
+            Dict[str, Set[str]]: {keyword: issue_key 집합}
+        """
+        index = {keyword: set() for keyword in keywords}
+        # 계산 로직과 동일한 대소문자 규칙 적용
+        needles = [
+            (keyword, keyword if source == 'service' else keyword.lower())
+            for keyword in keywords
+        ]
+
+        for ticket in self.tickets:
+            if source == 'comment':
+                haystack = ' '.join(
+                    comment.get('body', '') for comment in ticket.get('comments', []) or []
+                ).lower()
             else:
-                print("  Warning: HIGH_RISK_SERVICE_KEYWORDS not found, using default values")
-        except Exception as e:
-            print(f"  Warning: Failed to load HIGH_RISK_SERVICE_KEYWORDS: {e}")
+                haystack = f"{ticket.get('summary', '') or ''} {ticket.get('description', '') or ''}"
+                if source == 'text':
+                    haystack = haystack.lower()
 
-        print("Metadata loaded successfully from DynamoDB.\n")
-        return True
+            if not haystack.strip():
+                continue
 
-    except Exception as e:
-        print(f"Error loading metadata from DynamoDB: {e}")
-        print("Using default hardcoded values.\n")
-        return False
+            for keyword, needle in needles:
+                if needle in haystack:
+                    index[keyword].add(ticket.get('issue_key'))
 
+        return index
+
+    def affected_tickets(self, factor: str, changed: Set[str]) -> Set[str]:
+        """
+        변경된 항목에 의해 점수가 바뀔 수 있는 티켓 반환
+
+        Args:
+            factor: RISK_FACTORS 중 하나
+            changed: diff_risk_metadata가 반환한 변경 항목
+
+        Returns:
+            Set[str]: issue_key 집합
+        """
+        affected = set()
+
+        if factor in ('base', 'incident'):
+            for change_type in changed:
+                affected |= self.by_change_type.get(change_type, set())
+        elif factor == 'component':
+            if '*' in changed:
+                return set(self.with_components)
+            for component in changed:
+                affected |= self.by_component.get(component.lower(), set())
+        else:
+            source = {'keyword': 'text', 'service': 'service', 'comment': 'comment'}[factor]
+            for issue_keys in self.keyword_index(changed, source).values():
+                affected |= issue_keys
+
+        return affected
 
-# 변경 유형별 키워드 매핑 (세분화) - DynamoDB 저장
-LABEL_KEYWORDS = ""
 
 class RiskCalculator:
     """위험평가점수 계산기"""
@@ -166,63 +399,188 @@ class RiskCalculator:
     _incident_risk_stats = None
     _incident_issue_keys = []
 
+    # 유사 과거 장애 검색 (enable_similar_incidents 호출 전에는 similar_incident 요소 0점)
+    _similar_index = None
+    _similar_preprocessor = None
+    _similar_encoder = None
+    _similar_encoder_dir = None
+    _similar_quantized = False
+    _similar_vectors = {}
+
     @classmethod
-    def load_incident_risk_stats(cls):
-        """과거 장애 발생 통계 로드 (DynamoDB에서)"""
-        if cls._incident_risk_stats is None:
-            import json
-            import boto3
+    def enable_similar_incidents(cls, index_dir: str, model_dir: Optional[str] = None, quantized: bool = False):
+        """
+        임베딩 인덱스 로드 (similar_incident 요소 활성화)
 
-            # 1. DynamoDB에서 incident 이력 로드 시도
-            try:
-                session = boto3.Session(profile_name='AUTO')
-                dynamodb = session.resource('dynamodb', region_name='ap-northeast-2')
-                metadata_table = dynamodb.Table('impactanalysis-metadata')
+        인덱스에 같은 텍스트가 있으면 저장된 임베딩을 쓰고, 새 티켓만 model_dir의 BERT로
+        인코딩 (첫 사용 시 로드, model_dir이 없으면 새 티켓은 0점)
 
-                response = metadata_table.get_item(Key={'dataId': 'INCIDENT#HISTORY'})
+        Args:
+            index_dir: 임베딩 인덱스 디렉토리
+            model_dir: 인덱스를 만든 토큰 모델 경로
+            quantized: True이면 int8 양자화 모델로 인코딩
+        """
+        from embedding_index import EmbeddingIndex
+        cls._similar_index = EmbeddingIndex.load(index_dir)
+        cls._similar_preprocessor = JiraTextPreprocessor()
+        cls._similar_encoder_dir = model_dir if model_dir and os.path.isdir(model_dir) else None
+        cls._similar_quantized = quantized
+        print(f"Embedding index loaded: {len(cls._similar_index)} tickets, "
+              f"{len(cls._similar_index.incident_rows)} incidents"
+              f"{'' if cls._similar_index.centroids is None else f', IVF {len(cls._similar_index.centroids)} lists'}")
 
-                if 'Item' in response:
-                    incident_history = response['Item'].get('metadata', '')
-                    incident_issue_keys = incident_history.split('|') if incident_history else []
+    @classmethod
+    def _similar_query(cls, ticket: Dict) -> Tuple[str, Optional[str]]:
+        """
+        인덱스와 같은 입력으로 만든 모델 텍스트와 내용 해시
 
-                    print(f"Loaded incident history from DynamoDB: {len(incident_issue_keys)} incidents")
+        학습 시 인덱스 텍스트는 PREPROCESSOR_FIELDS만 담긴 티켓에서 추출하므로 같은 필드만 전달
+        (issue_key 포함, 없는 필드는 제외)
+        """
+        from embedding_index import content_hash
+        source = ticket.to_dict() if isinstance(ticket, Ticket) else ticket
+        text = cls._similar_preprocessor.extract_features(
+            {field: source[field] for field in PREPROCESSOR_FIELDS if field in source}
+        )
+        return text, (content_hash(text) if text else None)
 
-                    # issue_key 리스트를 저장 (나중에 사용 가능)
-                    cls._incident_issue_keys = incident_issue_keys
+    @classmethod
+    def _encoder(cls):
+        """새 티켓 인코딩용 토큰 모델 (첫 사용 시 로드, 없으면 None)"""
+        if cls._similar_encoder is None and cls._similar_encoder_dir is not None:
+            cls._similar_encoder = load_prediction_model(cls._similar_encoder_dir, cls._similar_quantized)
+        return cls._similar_encoder
 
-                    # 백업 파일도 로드 (changeType별 통계용)
-                    stats_path = '/app/impactanalysis/kor-impactanalysis/ml/models/incident_risk_stats.json'
-                    try:
-                        with open(stats_path, 'r', encoding='utf-8') as f:
-                            cls._incident_risk_stats = json.load(f)
-                    except:
-                        cls._incident_risk_stats = {}
-                else:
-                    print("Warning: INCIDENT#HISTORY not found in DynamoDB")
-                    print("Run train.py first to generate incident statistics.")
-                    cls._incident_risk_stats = {}
-                    cls._incident_issue_keys = []
+    @classmethod
+    def _cache_vectors(cls, hashes: List[str], vectors):
+        for text_hash, vector in zip(hashes, vectors):
+            if len(cls._similar_vectors) >= SIMILAR_VECTOR_CACHE_SIZE:
+                # 가장 오래된 항목 제거 (dict 삽입 순서)
+                cls._similar_vectors.pop(next(iter(cls._similar_vectors)))
+            cls._similar_vectors[text_hash] = vector
 
-            except Exception as e:
-                print(f"Warning: Failed to load from DynamoDB: {e}")
-
-                # 2. Fallback: 로컬 파일에서 로드
-                stats_path = '/app/impactanalysis/kor-impactanalysis/ml/models/incident_risk_stats.json'
-                try:
-                    with open(stats_path, 'r', encoding='utf-8') as f:
-                        cls._incident_risk_stats = json.load(f)
-                    print(f"Fallback: Loaded incident risk statistics from {stats_path}")
-                    cls._incident_issue_keys = []
-                except FileNotFoundError:
-                    print(f"Warning: Incident risk stats not found at {stats_path}")
-                    print("Run train.py first to generate incident statistics.")
-                    cls._incident_risk_stats = {}
-                    cls._incident_issue_keys = []
-                except Exception as e2:
-                    print(f"Warning: Failed to load incident risk stats: {e2}")
-                    cls._incident_risk_stats = {}
-                    cls._incident_issue_keys = []
+    @classmethod
+    def prefetch_similar_vectors(cls, tickets: List[Dict], batch_size: Optional[int] = None):
+        """
+        인덱스/캐시에 없는 티켓 임베딩을 한 번에 배치 인코딩 (이후 점수 계산은 캐시 사용)
 
+        Args:
+            tickets: 점수를 계산할 티켓 리스트
+            batch_size: 인코딩 배치 크기 (None이면 모델 기본값)
+        """
+        if cls._similar_index is None:
+            return
+        pending = {}
+        for ticket in tickets:
+            text, text_hash = cls._similar_query(ticket)
+            if text and text_hash not in cls._similar_vectors and cls._similar_index.vector(text_hash) is None:
+                pending[text_hash] = text
+        if pending and cls._encoder() is not None:
+            cls._cache_vectors(list(pending), cls._similar_encoder.embed(list(pending.values()), batch_size))
+
+    @classmethod
+    def nearest_incidents(cls, ticket: Dict, k: int = 5) -> List[Tuple[Dict, float]]:
+        """
+        내용이 가장 비슷한 과거 장애 티켓 (자기 자신 제외)
+
+        Args:
+            ticket: 티켓 (dict 또는 Ticket, PREPROCESSOR_FIELDS 사용)
+            k: 결과 수
+
+        Returns:
+            List[Tuple[Dict, float]]: (인덱스 entry, 코사인 유사도) 리스트, 비활성 시 빈 리스트
+        """
+        if cls._similar_index is None:
+            return []
+        from embedding_index import IVF_DEFAULT_NPROBE
+
+        text, text_hash = cls._similar_query(ticket)
+        if not text:
+            return []
+
+        query = cls._similar_index.vector(text_hash)
+        if query is None:
+            query = cls._similar_vectors.get(text_hash)
+        if query is None:
+            if cls._encoder() is None:
+                return []
+            query = cls._similar_encoder.embed([text])[0]
+            cls._cache_vectors([text_hash], [query])
+
+        issue_key = ticket.get('issue_key')
+        return cls._similar_index.search(
+            query, k, incidents_only=True, nprobe=IVF_DEFAULT_NPROBE,
+            exclude_issue_keys=[issue_key] if issue_key else None
+        )[0]
+
+    @classmethod
+    def calculate_similar_incident_score(cls, ticket: Dict) -> int:
+        """가장 비슷한 과거 장애의 유사도 기반 점수 (0~SIMILAR_INCIDENT_MAX_SCORE점)"""
+        neighbors = cls.nearest_incidents(ticket, k=1)
+        if not neighbors:
+            return 0
+        similarity = neighbors[0][1]
+        if similarity < SIMILAR_INCIDENT_MIN_SIMILARITY:
+            return 0
+        scale = (similarity - SIMILAR_INCIDENT_MIN_SIMILARITY) / (1.0 - SIMILAR_INCIDENT_MIN_SIMILARITY)
+        return int(round(SIMILAR_INCIDENT_MAX_SCORE * min(1.0, scale)))
+
+    @classmethod
+    def fetch_incident_risk_stats(cls) -> Tuple[Dict, List[str]]:
+        """
+        과거 장애 발생 통계 조회 (DynamoDB 우선, 실패 시 로컬 파일) - 클래스 상태는 변경하지 않음
+
+        Returns:
+            Tuple[Dict, List[str]]: (변경 유형별 통계, incident issue_key 리스트)
+        """
+        stats_path = '/app/impactanalysis/kor-impactanalysis/ml/models/incident_risk_stats.json'
+
+        # 1. DynamoDB에서 incident 이력 로드 시도
+        try:
+            session = boto3.Session(profile_name='AUTO')
+            dynamodb = session.resource('dynamodb', region_name='ap-northeast-2')
+            metadata_table = dynamodb.Table('impactanalysis-metadata')
+
+            response = metadata_table.get_item(Key={'dataId': 'INCIDENT#HISTORY'})
+            instrumentation.count('dynamodb', bytes_in=estimate_bytes(response.get('Item')))
+
+            if 'Item' not in response:
+                print("Warning: INCIDENT#HISTORY not found in DynamoDB")
+                print("Run train.py first to generate incident statistics.")
+                return {}, []
+
+            incident_history = response['Item'].get('metadata', '')
+            incident_issue_keys = incident_history.split('|') if incident_history else []
+            print(f"Loaded incident history from DynamoDB: {len(incident_issue_keys)} incidents")
+
+            # 백업 파일도 로드 (changeType별 통계용)
+            try:
+                with open(stats_path, 'r', encoding='utf-8') as f:
+                    return json.load(f), incident_issue_keys
+            except:
+                return {}, incident_issue_keys
+
+        except Exception as e:
+            print(f"Warning: Failed to load from DynamoDB: {e}")
+
+            # 2. Fallback: 로컬 파일에서 로드
+            try:
+                with open(stats_path, 'r', encoding='utf-8') as f:
+                    stats = json.load(f)
+                print(f"Fallback: Loaded incident risk statistics from {stats_path}")
+                return stats, []
+            except FileNotFoundError:
+                print(f"Warning: Incident risk stats not found at {stats_path}")
+                print("Run train.py first to generate incident statistics.")
+            except Exception as e2:
+                print(f"Warning: Failed to load incident risk stats: {e2}")
+            return {}, []
+
+    @classmethod
+    def load_incident_risk_stats(cls):
+        """과거 장애 발생 통계 로드 (DynamoDB에서, 최초 1회)"""
+        if cls._incident_risk_stats is None:
+            cls._incident_risk_stats, cls._incident_issue_keys = cls.fetch_incident_risk_stats()
         return cls._incident_risk_stats
 
     @classmethod
@@ -237,6 +595,18 @@ class RiskCalculator:
             cls.load_incident_risk_stats()
         return cls._incident_issue_keys
 
+    @classmethod
+    def set_incident_risk_stats(cls, stats: Dict, incident_issue_keys: List[str] = None):
+        """
+        장애 발생 통계를 직접 지정 (DynamoDB 조회 없이 오프라인 계산용)
+
+        Args:
+            stats: 변경 유형별 장애 발생 통계 (incident_risk_stats.json 형식)
+            incident_issue_keys: incident 발생 issue_key 리스트
+        """
+        cls._incident_risk_stats = stats or {}
+        cls._incident_issue_keys = incident_issue_keys or []
+
     @classmethod
     def calculate_comment_risk_score(cls, comments: List[Dict]) -> int:
         """
@@ -280,16 +650,17 @@ class RiskCalculator:
         return min(10, score)  # 최대 10점
 
     @classmethod
-    def calculate_risk_score(
+    def calculate_risk_factors(
         cls,
         change_type: str,
         summary: str,
         description: str,
         components: List[str] = None,
-        comments: List[Dict] = None
-    ) -> int:
+        comments: List[Dict] = None,
+        ticket: Optional[Dict] = None
+    ) -> Dict[str, int]:
         """
-        위험평가점수 계산
+        위험평가점수를 요소별로 분해하여 계산
 
         Args:
             change_type: 변경 유형
@@ -297,24 +668,73 @@ class RiskCalculator:
             description: JIRA 상세 설명
             components: JIRA 컴포넌트 리스트
             comments: JIRA 댓글 리스트
+            ticket: 원본 티켓 (유사 장애 검색 입력, 없으면 위 필드로 구성)
 
         Returns:
-            int: 위험평가점수 (0-100)
+            Dict[str, int]: {factor: score} (RISK_FACTORS 순서)
 
         계산 요소:
-            1. base_score: changeType별 기본 점수 (3-85점)
-            2. keyword_score: 고위험 키워드 (+5~20점)
-            3. incident_score: 과거 장애 발생률 (0-30점)
-            4. component_score: 컴포넌트별 가중치 (+2~5점)
-            5. comment_score: 댓글 기반 위험도 (0-10점)
-            6. service_score: 특정 서비스 키워드 (+2점)
+            1. base: changeType별 기본 점수 (3-85점)
+            2. keyword: 고위험 키워드 (+5~20점)
+            3. incident: 과거 장애 발생률 (0-30점)
+            4. component: 컴포넌트별 가중치 (+2~5점)
+            5. comment: 댓글 기반 위험도 (0-10점)
+            6. service: 특정 서비스 키워드 (+2점)
+            7. similar_incident: 유사 과거 장애 (0-10점, 임베딩 인덱스 활성화 시)
+        """
+        return {
+            'base': cls.calculate_base_score(change_type),
+            'keyword': cls.calculate_keyword_score(summary, description),
+            'incident': cls.calculate_incident_score(change_type),
+            'component': cls.calculate_component_score(components),
+            'comment': cls.calculate_comment_risk_score(comments) if comments else 0,
+            'service': cls.calculate_service_score(summary, description),
+            'similar_incident': cls.calculate_similar_incident_score(ticket if ticket is not None else {
+                'summary': summary, 'description': description, 'components': components, 'comments': comments
+            }),
+        }
 
-        총점 = base_score + keyword_score + incident_score + component_score + comment_score + service_score
+    @classmethod
+    def calculate_factor(cls, factor: str, change_type: str, ticket: Dict) -> int:
         """
-        # 1. 변경 유형별 기본 점수
-        base_score = CHANGE_TYPE_RISK_SCORES.get(change_type, 50)
+        단일 위험 요소만 재계산 (증분 재계산용)
+
+        Args:
+            factor: RISK_FACTORS 중 하나
+            change_type: 변경 유형
+            ticket: JIRA 티켓 정보
+
+        Returns:
+            int: 해당 요소 점수
+        """
+        summary = ticket.get('summary', '')
+        description = ticket.get('description', '')
 
-        # 2. 고위험 키워드 검사
+        if factor == 'base':
+            return cls.calculate_base_score(change_type)
+        if factor == 'keyword':
+            return cls.calculate_keyword_score(summary, description)
+        if factor == 'incident':
+            return cls.calculate_incident_score(change_type)
+        if factor == 'component':
+            return cls.calculate_component_score(ticket.get('components', []))
+        if factor == 'comment':
+            comments = ticket.get('comments', [])
+            return cls.calculate_comment_risk_score(comments) if comments else 0
+        if factor == 'service':
+            return cls.calculate_service_score(summary, description)
+        if factor == 'similar_incident':
+            return cls.calculate_similar_incident_score(ticket)
+        raise ValueError(f"Unknown risk factor: {factor}")
+
+    @staticmethod
+    def calculate_base_score(change_type: str) -> int:
+        """변경 유형별 기본 점수"""
+        return CHANGE_TYPE_RISK_SCORES.get(change_type, 50)
+
+    @staticmethod
+    def calculate_keyword_score(summary: str, description: str) -> int:
+        """고위험 키워드 점수"""
         text = f"{summary or ''} {description or ''}".lower()
         keyword_score = 0
 
@@ -322,17 +742,24 @@ class RiskCalculator:
             if keyword.lower() in text:
                 keyword_score += score_add
 
-        # 3. 과거 장애 발생 이력 기반 점수 추가
+        return keyword_score
+
+    @classmethod
+    def calculate_incident_score(cls, change_type: str) -> int:
+        """과거 장애 발생 이력 기반 점수"""
         incident_stats = cls.load_incident_risk_stats()
-        incident_score = 0
 
         if change_type in incident_stats:
             incident_rate = incident_stats[change_type].get('incident_rate', 0.0)
             # 장애 발생 비율에 따라 0~30점 추가
             # 예: 50% 장애율 -> +15점, 100% 장애율 -> +30점
-            incident_score = int(incident_rate * 30)
+            return int(incident_rate * 30)
 
-        # 4. 컴포넌트 기반 위험도 점수
+        return 0
+
+    @staticmethod
+    def calculate_component_score(components: List[str]) -> int:
+        """컴포넌트 기반 위험도 점수"""
         component_score = 0
         if components:
             for component in components:
@@ -341,63 +768,96 @@ class RiskCalculator:
                     component_score += 5
                 else:
                     component_score += NORMAL_COMPONENT_RISK_SCORE
+        return component_score
 
-        # 5. 댓글 기반 위험도 점수 (최대 10점)
-        comment_score = cls.calculate_comment_risk_score(comments) if comments else 0
-
-        # 6. 특정 서비스 키워드 기반 위험도 점수 (+2점)
-        service_score = 0
+    @staticmethod
+    def calculate_service_score(summary: str, description: str) -> int:
+        """특정 서비스 키워드 기반 위험도 점수 (+2점)"""
         text_original = f"{summary or ''} {description or ''}"  # 대소문자 구분을 위해 원본 텍스트 사용
         for service_keyword in HIGH_RISK_SERVICE_KEYWORDS:
             if service_keyword in text_original:
-                service_score = 2
-                break  # 하나라도 매칭되면 2점 추가
+                return 2  # 하나라도 매칭되면 2점 추가
+        return 0
 
-        # 7. 총 점수 계산
-        total_score = base_score + keyword_score + incident_score + component_score + comment_score + service_score
+    @staticmethod
+    def total_risk_score(factors: Dict[str, int]) -> int:
+        """
+        요소별 점수를 합산하여 0-100 범위의 위험평가점수로 변환
 
-        # 8. 0-100 범위로 제한
-        final_score = min(100, max(0, total_score))
+        Args:
+            factors: {factor: score}
 
-        return final_score
+        Returns:
+            int: 위험평가점수 (0-100)
+        """
+        total_score = sum(int(factors.get(factor, 0)) for factor in RISK_FACTORS)
+        return min(100, max(0, total_score))
+
+    @classmethod
+    def calculate_risk_score(
+        cls,
+        change_type: str,
+        summary: str,
+        description: str,
+        components: List[str] = None,
+        comments: List[Dict] = None,
+        ticket: Optional[Dict] = None
+    ) -> int:
+        """
+        위험평가점수 계산
+
+        Args:
+            change_type: 변경 유형
+            summary: JIRA 요약
+            description: JIRA 상세 설명
+            components: JIRA 컴포넌트 리스트
+            comments: JIRA 댓글 리스트
+            ticket: 원본 티켓 (유사 장애 검색 입력)
+
+        Returns:
+            int: 위험평가점수 (0-100)
+
+        총점 = base + keyword + incident + component + comment + service (calculate_risk_factors 참고)
+        """
+        factors = cls.calculate_risk_factors(change_type, summary, description, components, comments, ticket)
+        return cls.total_risk_score(factors)
 
 
 class AutoLabeler:
     """자동 레이블링 엔진"""
 
-    def __init__(self):
-        self.keyword_patterns = self._compile_patterns()
+    def __init__(self, label_keywords: Optional[Dict[str, List[str]]] = None):
+        """
+        Args:
+            label_keywords: 레이블별 키워드 (None이면 전역 LABEL_KEYWORDS)
+        """
+        self.keyword_patterns = self._compile_patterns(LABEL_KEYWORDS if label_keywords is None else label_keywords)
 
-    def _compile_patterns(self) -> Dict[str, List[re.Pattern]]:
-        """키워드를 정규식 패턴으로 컴파일"""
+    def _compile_patterns(self, label_keywords: Dict[str, List[str]]) -> Dict[str, List[Tuple[str, re.Pattern]]]:
+        """키워드를 정규식 패턴으로 컴파일 (부분 문자열 사전 검사용 소문자 키워드 포함)"""
         patterns = {}
-        for label, keywords in LABEL_KEYWORDS.items():
+        for label, keywords in label_keywords.items():
             patterns[label] = [
-                re.compile(r'\b' + re.escape(kw) + r'\b', re.IGNORECASE)
+                (kw.lower(), re.compile(r'\b' + re.escape(kw) + r'\b', re.IGNORECASE))
                 for kw in keywords
             ]
         return patterns
 
-    def predict_label(
+    def _score_labels(
         self,
         summary: str,
-        description: str,
-        threshold: float = 0.3
-    ) -> Optional[Tuple[str, float, List[str]]]:
+        description: str
+    ) -> Tuple[Dict[str, int], Dict[str, List[str]]]:
         """
-        summary와 description을 기반으로 자동 레이블 예측
+        레이블별 키워드 매칭 점수 계산
 
         Args:
             summary: JIRA 티켓 요약
             description: JIRA 티켓 상세 설명
-            threshold: 최소 신뢰도 임계값
 
         Returns:
-            (label, confidence, matched_keywords) 또는 None
+            (scores, matched_keywords_by_label)
         """
-        if not summary and not description:
-            return None
-
         # Summary와 Description 분리 (가중치를 다르게 적용하기 위해)
         summary_lower = (summary or '').lower()
         description_lower = (description or '').lower()
@@ -410,23 +870,50 @@ class AutoLabeler:
             matched = []
             score = 0
 
-            for pattern in patterns:
-                # Summary에서 매칭 (가중치 2배)
-                summary_matches = pattern.findall(summary_lower)
-                if summary_matches:
-                    matched.extend(summary_matches)
-                    score += len(summary_matches) * 2  # Summary는 2배 가중치
-
-                # Description에서 매칭 (가중치 1배)
-                description_matches = pattern.findall(description_lower)
-                if description_matches:
-                    matched.extend(description_matches)
-                    score += len(description_matches)  # Description는 1배 가중치
+            for keyword_lower, pattern in patterns:
+                # 키워드가 부분 문자열로도 없으면 정규식 매칭 생략
+                if keyword_lower in summary_lower:
+                    # Summary에서 매칭 (가중치 2배)
+                    summary_matches = pattern.findall(summary_lower)
+                    if summary_matches:
+                        matched.extend(summary_matches)
+                        score += len(summary_matches) * 2  # Summary는 2배 가중치
+
+                if keyword_lower in description_lower:
+                    # Description에서 매칭 (가중치 1배)
+                    description_matches = pattern.findall(description_lower)
+                    if description_matches:
+                        matched.extend(description_matches)
+                        score += len(description_matches)  # Description는 1배 가중치
 
             if matched:
                 scores[label] = score
                 matched_keywords_by_label[label] = list(set(matched))
 
+        return scores, matched_keywords_by_label
+
+    def predict_label(
+        self,
+        summary: str,
+        description: str,
+        threshold: float = 0.3
+    ) -> Optional[Tuple[str, float, List[str]]]:
+        """
+        summary와 description을 기반으로 자동 레이블 예측
+
+        Args:
+            summary: JIRA 티켓 요약
+            description: JIRA 티켓 상세 설명
+            threshold: 최소 신뢰도 임계값
+
+        Returns:
+            (label, confidence, matched_keywords) 또는 None
+        """
+        if not summary and not description:
+            return None
+
+        scores, matched_keywords_by_label = self._score_labels(summary, description)
+
         if not scores:
             return None
 
@@ -455,43 +942,17 @@ class AutoLabeler:
         상위 K개의 레이블 후보 반환
 
         Args:
-            summary: JIRA 티켓 요약
-            description: JIRA 티켓 상세 설명
-            top_k: 반환할 후보 개수
-
-        Returns:
-            [(label, confidence, matched_keywords), ...] 리스트
-        """
-        if not summary and not description:
-            return []
-
-        # Summary와 Description 분리 (가중치를 다르게 적용하기 위해)
-        summary_lower = (summary or '').lower()
-        description_lower = (description or '').lower()
-
-        scores = {}
-        matched_keywords_by_label = {}
-
-        for label, patterns in self.keyword_patterns.items():
-            matched = []
-            score = 0
-
-            for pattern in patterns:
-                # Summary에서 매칭 (가중치 2배)
-                summary_matches = pattern.findall(summary_lower)
-                if summary_matches:
-                    matched.extend(summary_matches)
-                    score += len(summary_matches) * 2
+            summary: JIRA 티켓 요약
+            description: JIRA 티켓 상세 설명
+            top_k: 반환할 후보 개수
 
-                # Description에서 매칭 (가중치 1배)
-                description_matches = pattern.findall(description_lower)
-                if description_matches:
-                    matched.extend(description_matches)
-                    score += len(description_matches)
+        Returns:
+            [(label, confidence, matched_keywords), ...] 리스트
+        """
+        if not summary and not description:
+            return []
 
-            if matched:
-                scores[label] = score
-                matched_keywords_by_label[label] = list(set(matched))
+        scores, matched_keywords_by_label = self._score_labels(summary, description)
 
         if not scores:
             return []
@@ -514,25 +975,116 @@ class AutoLabeler:
 class DataLabeler:
     """데이터 레이블링 도구"""
 
-    def __init__(self, auto_mode: bool = False):
+    def __init__(self, auto_mode: bool = False, compact: bool = False):
         """
         Args:
             auto_mode: True이면 자동 레이블링, False이면 수동 레이블링
+            compact: True이면 전체 티켓을 __slots__ Ticket(압축 댓글)으로 보관
         """
-        self.loader = JiraDataLoader()
+        self.loader = ProjectedJiraDataLoader()
         session = boto3.Session(profile_name='AUTO')
         self.dynamodb = session.resource('dynamodb', region_name=AWS_REGION)
         self.table = self.dynamodb.Table(DYNAMODB_TABLE_NAME)
+        self.metadata_table = self.dynamodb.Table('impactanalysis-metadata')
         self.auto_labeler = AutoLabeler()
         self.auto_mode = auto_mode
+        self.student = None
+        self.teacher = None
+        self.model_sources = Counter()
+        self.snapshot_tickets = {}
+        self.compact = compact
+
+    def use_snapshot(self, max_age_hours: float = SNAPSHOT_MAX_AGE_HOURS, refresh: bool = False):
+        """
+        티켓 본문(요약/설명/컴포넌트/댓글/상태)과 기존 riskpoint를 컬럼형 스냅샷에서 읽음
+
+        레이블 목록(changeType)은 이번 실행 중에도 바뀌므로 계속 DynamoDB 기준
+        (스냅샷에 없는 티켓은 DynamoDB 조회)
+        """
+        snapshot = ensure_snapshot(self.loader, max_age_hours=max_age_hours, refresh=refresh)
+        tickets = snapshot.tickets(
+            ['summary', 'description', 'components', 'comments', 'status', 'riskpoint'], compact=self.compact
+        )
+        self.snapshot_tickets = {ticket['issue_key']: ticket for ticket in tickets}
+        instrumentation.set('snapshot', snapshot.manifest['version'])
+
+    def enable_student(self, student_dir: str, threshold: Optional[float] = None,
+                       teacher_dir: Optional[str] = None, quantized: bool = False):
+        """
+        증류 학생 모델을 자동 레이블링 1차 분류기로 사용
+
+        학생 신뢰도가 threshold 미만이면 BERT(teacher_dir, 첫 위임 시 로드)로 위임하고,
+        BERT가 없거나 신뢰도가 낮으면 기존 키워드 예측(AutoLabeler) 사용
+
+        Args:
+            student_dir: 학습 스크립트 --distill 산출물
+            threshold: BERT 위임 임계값 (None이면 증류 시 추천값)
+            teacher_dir: 토큰 모델 경로 (None이면 BERT 위임 없이 키워드로 대체)
+            quantized: True이면 int8 양자화 BERT 사용
+        """
+        from student_model import HashedNgramStudent
+        self.student = HashedNgramStudent.load(student_dir)
+        self.student_threshold = self.student.defer_threshold if threshold is None else threshold
+        self.teacher_dir = teacher_dir if teacher_dir and os.path.isdir(teacher_dir) else None
+        self.teacher_quantized = quantized
+        self.preprocessor = JiraTextPreprocessor()
+        print(f"Student model loaded from {student_dir} (defer to BERT below {self.student_threshold:.2f}"
+              f"{'' if self.teacher_dir else ', BERT not found: keyword fallback'})")
+
+    def predict_with_models(self, ticket: Dict, confidence_threshold: float) -> Optional[Tuple[str, float, List[str]]]:
+        """
+        학생 모델 → BERT 순으로 예측 (AutoLabeler.predict_label과 같은 형태로 반환)
+
+        Returns:
+            Optional[Tuple[str, float, List[str]]]: (레이블, 신뢰도, [예측 모델]), 확신 없으면 None
+        """
+        text = self.preprocessor.extract_features(ticket)
+        label, confidence = self.student.predict([text])[0]
+        source = 'student'
+
+        if confidence < self.student_threshold:
+            if self.teacher_dir is None:
+                self.model_sources['keywords'] += 1
+                return None
+            if self.teacher is None:
+                self.teacher = load_prediction_model(self.teacher_dir, self.teacher_quantized)
+            label, confidence = self.teacher.predict([text])[0]
+            source = 'bert'
+
+        if confidence < confidence_threshold:
+            self.model_sources['keywords'] += 1
+            return None
+        self.model_sources[source] += 1
+        return label, confidence, [f'({source})']
+
+    def fetch_ticket(self, issue_key: str, attributes: Optional[Tuple[str, ...]] = None) -> Optional[Dict]:
+        """
+        티켓 단건 조회 (계측 포함, 스냅샷 사용 시 스냅샷 우선)
+
+        Args:
+            issue_key: 조회할 issue_key
+            attributes: DynamoDB에서 읽을 티켓 필드 (None이면 전체 항목)
+        """
+        if issue_key in self.snapshot_tickets:
+            ticket = self.snapshot_tickets[issue_key]
+            return ticket if self.compact else dict(ticket)
+        with instrumentation.phase('ticket_fetch'):
+            return self.loader.get_jira_ticket_from_dynamodb(issue_key, attributes=attributes)
+
+    def update_ticket(self, **update_kwargs):
+        """티켓 업데이트 (계측 포함)"""
+        with instrumentation.phase('dynamodb_write'):
+            self.table.update_item(**update_kwargs)
+        instrumentation.count('dynamodb', bytes_out=estimate_bytes(update_kwargs))
 
     def get_unlabeled_tickets(self):
         """레이블이 없는 티켓 가져오기"""
-        # 모든 incident issue keys
-        all_issue_keys = self.loader.get_incident_issue_keys()
+        with instrumentation.phase('ticket_fetch'):
+            # 모든 incident issue keys
+            all_issue_keys = self.loader.get_incident_issue_keys()
 
-        # 이미 레이블된 issue keys
-        labeled_keys = set(self.loader.get_existing_change_types().keys())
+            # 이미 레이블된 issue keys
+            labeled_keys = set(self.loader.get_existing_change_types().keys())
 
         # 레이블이 없는 issue keys
         unlabeled_keys = [key for key in all_issue_keys if key not in labeled_keys]
@@ -547,7 +1099,8 @@ class DataLabeler:
             reclassify: True이면 세분화된 changeType으로 재분류
         """
         # changeType이 있는 티켓들 가져오기
-        change_types = self.loader.get_existing_change_types()
+        with instrumentation.phase('ticket_fetch'):
+            change_types = self.loader.get_existing_change_types()
 
         if not change_types:
             print("No labeled tickets found.")
@@ -564,8 +1117,8 @@ class DataLabeler:
         changed_risks = []  # 변경된 riskpoint 추적
 
         for idx, (issue_key, old_change_type) in enumerate(change_types.items(), 1):
-            # 티켓 정보 가져오기
-            ticket = self.loader.get_jira_ticket_from_dynamodb(issue_key)
+            # 티켓 정보 가져오기 (위험 점수 계산 필드만)
+            ticket = self.fetch_ticket(issue_key, attributes=RISK_FIELDS)
 
             if not ticket:
                 print(f"  [{idx}/{len(change_types)}] {issue_key}: Ticket not found in DynamoDB")
@@ -578,22 +1131,24 @@ class DataLabeler:
             comments = ticket.get('comments', [])
             old_risk_score = ticket.get('riskpoint', 0)  # 기존 riskpoint
 
-            # 세분화된 changeType으로 재분류
-            new_change_type = old_change_type
-            if reclassify:
-                prediction = self.auto_labeler.predict_label(
-                    summary, description, threshold=0.2
+            with instrumentation.phase('scoring'):
+                # 세분화된 changeType으로 재분류
+                new_change_type = old_change_type
+                if reclassify:
+                    prediction = self.auto_labeler.predict_label(
+                        summary, description, threshold=RECLASSIFY_THRESHOLD
+                    )
+                    if prediction:
+                        predicted_label, confidence, matched_kw = prediction
+                        new_change_type = predicted_label
+                        if new_change_type != old_change_type:
+                            reclassified_count += 1
+
+                # 위험평가점수 재계산 (comments 포함, 요소별 분해 저장)
+                risk_factors = RiskCalculator.calculate_risk_factors(
+                    new_change_type, summary, description, components, comments, ticket
                 )
-                if prediction:
-                    predicted_label, confidence, matched_kw = prediction
-                    new_change_type = predicted_label
-                    if new_change_type != old_change_type:
-                        reclassified_count += 1
-
-            # 위험평가점수 재계산 (comments 포함)
-            new_risk_score = RiskCalculator.calculate_risk_score(
-                new_change_type, summary, description, components, comments
-            )
+                new_risk_score = RiskCalculator.total_risk_score(risk_factors)
 
             # riskpoint 변경 여부 확인
             risk_changed = (old_risk_score != new_risk_score)
@@ -607,23 +1162,25 @@ class DataLabeler:
 
                 if reclassify and new_change_type != old_change_type:
                     # changeType도 함께 업데이트
-                    self.table.update_item(
+                    self.update_ticket(
                         Key={'dataId': issue_key},
-                        UpdateExpression='SET changeType = :ct, riskpoint = :riskpoint, updatedAt = :updated',
+                        UpdateExpression='SET changeType = :ct, riskpoint = :riskpoint, riskFactors = :factors, updatedAt = :updated',
                         ExpressionAttributeValues={
                             ':ct': new_change_type,
                             ':riskpoint': new_risk_score,
+                            ':factors': risk_factors,
                             ':updated': updated_at
                         }
                     )
                     print(f"  [{idx}/{len(change_types)}] {issue_key}: {old_change_type} -> {new_change_type} (risk: {old_risk_score} -> {new_risk_score})")
                 else:
                     # riskpoint만 업데이트
-                    self.table.update_item(
+                    self.update_ticket(
                         Key={'dataId': issue_key},
-                        UpdateExpression='SET riskpoint = :riskpoint, updatedAt = :updated',
+                        UpdateExpression='SET riskpoint = :riskpoint, riskFactors = :factors, updatedAt = :updated',
                         ExpressionAttributeValues={
                             ':riskpoint': new_risk_score,
+                            ':factors': risk_factors,
                             ':updated': updated_at
                         }
                     )
@@ -655,7 +1212,165 @@ class DataLabeler:
             print(f"  Reclassified: {reclassified_count} tickets")
         print(f"  Failed: {failed_count} tickets")
 
-        # 변경된 riskpoint 요약 출력
+        # 전체 재계산에 사용한 메타데이터 기록 (증분 재계산 기준점)
+        # 실패한 티켓이 있으면 기록하지 않음 (다음 재계산에서 해당 티켓이 누락되지 않도록)
+        if failed_count == 0:
+            self.save_risk_metadata_snapshot(build_risk_metadata_snapshot())
+        else:
+            print(f"  {RISK_METADATA_SNAPSHOT_ID} not saved ({failed_count} failed tickets)")
+
+        self.print_changed_risks(changed_risks)
+
+    def load_risk_metadata_snapshot(self) -> Optional[Dict]:
+        """마지막 riskpoint 계산에 사용된 메타데이터 스냅샷 로드"""
+        try:
+            response = self.metadata_table.get_item(Key={'dataId': RISK_METADATA_SNAPSHOT_ID})
+            if 'Item' in response:
+                return json.loads(response['Item'].get('metadata', '') or '{}')
+        except Exception as e:
+            print(f"Warning: Failed to load {RISK_METADATA_SNAPSHOT_ID}: {e}")
+        return None
+
+    def save_risk_metadata_snapshot(self, snapshot: Dict) -> bool:
+        """riskpoint 계산에 사용된 메타데이터 스냅샷 저장"""
+        try:
+            self.metadata_table.put_item(
+                Item={
+                    'dataId': RISK_METADATA_SNAPSHOT_ID,
+                    'metadata': json.dumps(snapshot, ensure_ascii=False, sort_keys=True)
+                }
+            )
+            return True
+        except Exception as e:
+            print(f"Warning: Failed to save {RISK_METADATA_SNAPSHOT_ID}: {e}")
+            return False
+
+    def recompute_changed_risk_factors(self):
+        """
+        마지막 계산 이후 변경된 메타데이터 항목에 해당하는 위험 요소만 재계산
+
+        저장된 riskFactors를 기준으로 변경된 요소만 다시 계산하며,
+        keyword/component/changeType 역색인으로 영향을 받는 티켓만 업데이트한다.
+        riskFactors가 없는 티켓은 전체 요소를 계산한다.
+        """
+        previous = self.load_risk_metadata_snapshot()
+        if previous is None:
+            print("No metadata snapshot found. Run a full riskpoint update first.")
+            self.update_riskpoints_for_labeled_tickets(reclassify=False)
+            return
+
+        current = build_risk_metadata_snapshot()
+        changes = diff_risk_metadata(previous, current)
+
+        if not changes:
+            print("\nNo risk metadata changes detected. Nothing to recompute.")
+            return
+
+        print("\nChanged risk factors:")
+        for factor, items in changes.items():
+            preview = ', '.join(sorted(items)[:5])
+            more = f" ... and {len(items) - 5} more" if len(items) > 5 else ''
+            print(f"  {factor}: {len(items)} item(s) ({preview}{more})")
+
+        with instrumentation.phase('ticket_fetch'):
+            change_types = self.loader.get_existing_change_types()
+            if not change_types:
+                print("No labeled tickets found.")
+                return
+
+            tickets = self.loader.get_tickets_from_dynamodb(list(change_types.keys()), attributes=RISK_FIELDS)
+        if self.compact:
+            # 댓글은 comment 요소 재계산 대상 티켓에서만 디코딩
+            tickets = compact_tickets(tickets)
+        index = RiskFactorIndex(tickets, change_types)
+
+        # 요소별 영향 티켓 계산 (issue_key -> 재계산할 요소 집합)
+        factors_by_ticket = {}
+        for factor, items in changes.items():
+            affected = index.affected_tickets(factor, items)
+            print(f"  {factor}: {len(affected)} affected tickets")
+            for issue_key in affected:
+                factors_by_ticket.setdefault(issue_key, set()).add(factor)
+
+        print(f"\nRecomputing {len(factors_by_ticket)} of {len(tickets)} labeled tickets...")
+
+        updated_count = 0
+        failed_count = 0
+        changed_risks = []
+        tickets_by_key = {ticket.get('issue_key'): ticket for ticket in tickets}
+
+        for idx, (issue_key, factors) in enumerate(sorted(factors_by_ticket.items()), 1):
+            ticket = tickets_by_key[issue_key]
+            change_type = change_types[issue_key]
+            old_risk_score = int(ticket.get('riskpoint', 0) or 0)
+            stored = ticket.get('riskFactors') or {}
+
+            with instrumentation.phase('scoring'):
+                if all(factor in stored for factor in RISK_FACTORS):
+                    risk_factors = {factor: int(stored[factor]) for factor in RISK_FACTORS}
+                    for factor in factors:
+                        risk_factors[factor] = RiskCalculator.calculate_factor(factor, change_type, ticket)
+                else:
+                    # 요소별 분해가 아직 없는 티켓은 전체 계산
+                    risk_factors = RiskCalculator.calculate_risk_factors(
+                        change_type,
+                        ticket.get('summary', ''),
+                        ticket.get('description', ''),
+                        ticket.get('components', []),
+                        ticket.get('comments', []),
+                        ticket
+                    )
+
+                new_risk_score = RiskCalculator.total_risk_score(risk_factors)
+
+            try:
+                kst = pytz.timezone('Asia/Seoul')
+                updated_at = datetime.now(kst).strftime('%Y-%m-%d %H:%M')
+
+                self.update_ticket(
+                    Key={'dataId': issue_key},
+                    UpdateExpression='SET riskpoint = :riskpoint, riskFactors = :factors, updatedAt = :updated',
+                    ExpressionAttributeValues={
+                        ':riskpoint': new_risk_score,
+                        ':factors': risk_factors,
+                        ':updated': updated_at
+                    }
+                )
+                updated_count += 1
+                print(f"  [{idx}/{len(factors_by_ticket)}] {issue_key}: {', '.join(sorted(factors))} -> risk: {old_risk_score} -> {new_risk_score}")
+
+                if old_risk_score != new_risk_score:
+                    summary = ticket.get('summary', '')
+                    changed_risks.append({
+                        'issue_key': issue_key,
+                        'summary': summary[:80] if len(summary) <= 80 else summary[:77] + '...',
+                        'change_type': change_type,
+                        'old_risk': old_risk_score,
+                        'new_risk': new_risk_score,
+                        'diff': new_risk_score - old_risk_score
+                    })
+            except Exception as e:
+                print(f"  [{idx}/{len(factors_by_ticket)}] {issue_key}: Failed to update - {e}")
+                failed_count += 1
+
+        print(f"\nRecompute completed:")
+        print(f"  Updated: {updated_count} tickets")
+        print(f"  Skipped (unaffected): {len(tickets) - len(factors_by_ticket)} tickets")
+        print(f"  Failed: {failed_count} tickets")
+
+        if failed_count == 0:
+            self.save_risk_metadata_snapshot(current)
+
+        # 상주 레이블링 서비스가 변경된 메타데이터를 다시 로드하도록 버전 스탬프 갱신
+        try:
+            bump_metadata_version(self.metadata_table)
+        except Exception as e:
+            print(f"Warning: Failed to update {METADATA_VERSION_ID}: {e}")
+
+        self.print_changed_risks(changed_risks)
+
+    def print_changed_risks(self, changed_risks: List[Dict]):
+        """변경된 riskpoint 요약 출력"""
         if changed_risks:
             print(f"\n{'=' * 80}")
             print(f"Changed Risk Scores Summary ({len(changed_risks)} tickets)")
@@ -704,9 +1419,14 @@ class DataLabeler:
                 description = ticket.get('description', '')
                 components = ticket.get('components', [])
                 comments = ticket.get('comments', [])
-                risk_score = RiskCalculator.calculate_risk_score(
-                    change_type, summary, description, components, comments
+                risk_factors = RiskCalculator.calculate_risk_factors(
+                    change_type, summary, description, components, comments, ticket
                 )
+                risk_score = RiskCalculator.total_risk_score(risk_factors)
+
+                # 요소별 점수 저장 (증분 재계산용)
+                update_expression += ', riskFactors = :factors'
+                expression_values[':factors'] = risk_factors
 
             # riskpoint 추가
             update_expression += ', riskpoint = :riskpoint'
@@ -741,7 +1461,7 @@ class DataLabeler:
             if ticket and 'status' in ticket and ticket['status']:
                 update_kwargs['ExpressionAttributeNames'] = {'#status': 'status'}
 
-            self.table.update_item(**update_kwargs)
+            self.update_ticket(**update_kwargs)
             return True
         except Exception as e:
             print(f"Error saving label: {e}")
@@ -791,7 +1511,8 @@ class DataLabeler:
         labeled_tickets = []  # 레이블링된 티켓 정보 추적
 
         for idx, issue_key in enumerate(unlabeled_keys, 1):
-            ticket = self.loader.get_jira_ticket_from_dynamodb(issue_key)
+            # 확인 모드는 티켓 정보 전체 출력, 그 외에는 예측/위험 점수 입력 필드만 조회
+            ticket = self.fetch_ticket(issue_key, attributes=None if confirm else TEXT_FIELDS)
             if not ticket:
                 print(f"Warning: Ticket not found in DynamoDB: {issue_key}")
                 skipped_count += 1
@@ -800,10 +1521,13 @@ class DataLabeler:
             summary = ticket.get('summary', '')
             description = ticket.get('description', '')
 
-            # 자동 레이블 예측
-            prediction = self.auto_labeler.predict_label(
-                summary, description, threshold=confidence_threshold
-            )
+            # 자동 레이블 예측 (학생 모델 사용 시 학생 → BERT → 키워드 순)
+            with instrumentation.phase('scoring'):
+                prediction = self.predict_with_models(ticket, confidence_threshold) if self.student else None
+                if prediction is None:
+                    prediction = self.auto_labeler.predict_label(
+                        summary, description, threshold=confidence_threshold
+                    )
 
             if not prediction:
                 # 예측 실패 - 수동 레이블링으로 전환
@@ -826,9 +1550,10 @@ class DataLabeler:
             # 위험평가점수 계산
             components = ticket.get('components', [])
             comments = ticket.get('comments', [])
-            risk_score = RiskCalculator.calculate_risk_score(
-                predicted_label, summary, description, components, comments
-            )
+            with instrumentation.phase('scoring'):
+                risk_score = RiskCalculator.calculate_risk_score(
+                    predicted_label, summary, description, components, comments, ticket
+                )
 
             print(f"\n[{idx}/{len(unlabeled_keys)}] {issue_key}")
             print(f"  Summary: {summary[:80] if len(summary) <= 80 else summary[:77] + '...'}")
@@ -880,6 +1605,11 @@ class DataLabeler:
         print(f"Auto-labeling completed!")
         print(f"  Labeled: {labeled_count} tickets")
         print(f"  Skipped: {skipped_count} tickets")
+        if self.student:
+            print(f"  Predicted by: " + ', '.join(
+                f"{source} {self.model_sources[source]}" for source in ('student', 'bert', 'keywords')
+            ))
+            instrumentation.set('prediction_sources', dict(self.model_sources))
         print(f"{'=' * 80}")
 
         # 레이블링된 티켓 요약 출력
@@ -914,7 +1644,7 @@ class DataLabeler:
         if top_predictions:
             print("\n  Auto-prediction suggestions:")
             for i, (label, conf, keywords) in enumerate(top_predictions, 1):
-                risk = RiskCalculator.calculate_risk_score(label, summary, description, components, comments)
+                risk = RiskCalculator.calculate_risk_score(label, summary, description, components, comments, ticket)
                 print(f"    {i}. {label} (confidence: {conf:.2f}, risk: {risk}/100) - {', '.join(keywords[:3])}")
 
         while True:
@@ -932,7 +1662,7 @@ class DataLabeler:
 
                     # 위험평가점수 계산
                     risk_score = RiskCalculator.calculate_risk_score(
-                        change_type, summary, description, components, comments
+                        change_type, summary, description, components, comments, ticket
                     )
 
                     if self.save_label(issue_key, change_type, ticket):
@@ -959,7 +1689,7 @@ class DataLabeler:
         labeled_count = 0
 
         for idx, issue_key in enumerate(unlabeled_keys, 1):
-            ticket = self.loader.get_jira_ticket_from_dynamodb(issue_key)
+            ticket = self.fetch_ticket(issue_key)
             if not ticket:
                 print(f"Warning: Ticket not found in DynamoDB: {issue_key}")
                 continue
@@ -974,18 +1704,967 @@ class DataLabeler:
         print(f"{'=' * 80}")
 
 
+# What-if 시뮬레이션 작업 데이터 (fork된 worker 프로세스에서 복사 없이 공유)
+_SIMULATION_TICKETS = []
+_SIMULATION_LABELER = None
+
+
+def _json_default(value):
+    """DynamoDB Decimal/set 값을 JSON으로 직렬화"""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, set):
+        return sorted(value)
+    return str(value)
+
+
+def export_ticket_snapshot(snapshot_dir: str):
+    """
+    시뮬레이션용 로컬 스냅샷 생성 (DynamoDB 읽기 전용)
+
+    생성 파일:
+        tickets.jsonl: 티켓 (changeType, riskpoint 포함)
+        metadata.json: impactanalysis-metadata 원본 문자열 {dataId: metadata}
+        incident_risk_stats.json: 변경 유형별 장애 발생 통계
+
+    Args:
+        snapshot_dir: 스냅샷 저장 디렉토리
+    """
+    os.makedirs(snapshot_dir, exist_ok=True)
+
+    loader = ProjectedJiraDataLoader()
+    change_types = loader.get_existing_change_types()
+    issue_keys = set(loader.get_incident_issue_keys())
+    issue_keys.update(change_types.keys())
+
+    print(f"Exporting {len(issue_keys)} tickets to {snapshot_dir}...")
+    tickets = loader.get_tickets_from_dynamodb(sorted(issue_keys))
+
+    with open(os.path.join(snapshot_dir, 'tickets.jsonl'), 'w', encoding='utf-8') as f:
+        for ticket in tickets:
+            issue_key = ticket.get('issue_key')
+            if issue_key in change_types:
+                ticket['changeType'] = change_types[issue_key]
+            f.write(json.dumps(ticket, ensure_ascii=False, default=_json_default) + '\n')
+
+    session = boto3.Session(profile_name='AUTO')
+    dynamodb = session.resource('dynamodb', region_name=AWS_REGION)
+    metadata_items = fetch_metadata_items(dynamodb.Table('impactanalysis-metadata'))
+    with open(os.path.join(snapshot_dir, 'metadata.json'), 'w', encoding='utf-8') as f:
+        json.dump(metadata_items, f, indent=2, ensure_ascii=False)
+
+    incident_stats = RiskCalculator.load_incident_risk_stats()
+    with open(os.path.join(snapshot_dir, 'incident_risk_stats.json'), 'w', encoding='utf-8') as f:
+        json.dump(incident_stats, f, indent=2, ensure_ascii=False, default=_json_default)
+
+    print(f"✓ Snapshot exported: {len(tickets)} tickets, {len(metadata_items)} metadata items")
+
+
+def load_ticket_snapshot(snapshot_dir: str) -> Tuple[List[Dict], Dict[str, str], Dict]:
+    """
+    export_ticket_snapshot으로 생성한 로컬 스냅샷 로드
+
+    Args:
+        snapshot_dir: 스냅샷 디렉토리
+
+    Returns:
+        (tickets, metadata_items, incident_stats)
+    """
+    tickets = []
+    with open(os.path.join(snapshot_dir, 'tickets.jsonl'), 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                tickets.append(json.loads(line))
+
+    with open(os.path.join(snapshot_dir, 'metadata.json'), 'r', encoding='utf-8') as f:
+        metadata_items = json.load(f)
+
+    incident_stats = {}
+    stats_path = os.path.join(snapshot_dir, 'incident_risk_stats.json')
+    if os.path.exists(stats_path):
+        with open(stats_path, 'r', encoding='utf-8') as f:
+            incident_stats = json.load(f)
+
+    return tickets, metadata_items, incident_stats
+
+
+def simulate_ticket(labeler: AutoLabeler, ticket: Dict) -> Tuple[Optional[str], Optional[int]]:
+    """
+    main()의 레이블링 흐름을 메모리에서 재현 (DynamoDB 쓰기 없음)
+
+    Args:
+        labeler: 자동 레이블링 엔진
+        ticket: JIRA 티켓 정보
+
+    Returns:
+        (changeType, riskpoint): 레이블이 없으면 (None, None)
+    """
+    summary = ticket.get('summary', '')
+    description = ticket.get('description', '')
+    label = ticket.get('changeType')
+
+    # 기존 레이블은 재분류, 미레이블 티켓은 자동 레이블링
+    threshold = RECLASSIFY_THRESHOLD if label else AUTO_LABEL_THRESHOLD
+    prediction = labeler.predict_label(summary, description, threshold=threshold)
+    if prediction:
+        label = prediction[0]
+
+    if not label:
+        return None, None
+
+    risk_score = RiskCalculator.calculate_risk_score(
+        label, summary, description, ticket.get('components', []), ticket.get('comments', []), ticket
+    )
+    return label, risk_score
+
+
+def _simulate_range(bounds: Tuple[int, int]) -> List[Tuple[Optional[str], Optional[int]]]:
+    """worker 프로세스에서 _SIMULATION_TICKETS[start:end] 시뮬레이션"""
+    start, end = bounds
+    return [simulate_ticket(_SIMULATION_LABELER, ticket) for ticket in _SIMULATION_TICKETS[start:end]]
+
+
+def simulate_labeling_pass(
+    tickets: List[Dict],
+    metadata_items: Dict[str, str],
+    workers: int = 1
+) -> List[Tuple[Optional[str], Optional[int]]]:
+    """
+    주어진 메타데이터로 전체 티켓의 레이블과 riskpoint를 계산
+
+    Args:
+        tickets: JIRA 티켓 리스트
+        metadata_items: {dataId: metadata}
+        workers: 병렬 처리 프로세스 수 (fork 사용)
+
+    Returns:
+        티켓 순서대로 (changeType, riskpoint) 리스트
+    """
+    global _SIMULATION_TICKETS, _SIMULATION_LABELER
+
+    apply_metadata_items(metadata_items)
+    _SIMULATION_TICKETS = tickets
+    _SIMULATION_LABELER = AutoLabeler()
+
+    if workers <= 1 or len(tickets) < workers * 100:
+        return _simulate_range((0, len(tickets)))
+
+    chunk_size = (len(tickets) + workers * 4 - 1) // (workers * 4)
+    bounds = [(start, min(start + chunk_size, len(tickets))) for start in range(0, len(tickets), chunk_size)]
+
+    results = []
+    with multiprocessing.get_context('fork').Pool(workers) as pool:
+        for chunk in pool.map(_simulate_range, bounds):
+            results.extend(chunk)
+    return results
+
+
+def risk_histogram(scores: List[Optional[int]]) -> Dict[str, int]:
+    """riskpoint를 10점 단위 구간으로 집계 (90-100 구간 포함)"""
+    histogram = {f"{lo}-{lo + 9 if lo < 90 else 100}": 0 for lo in range(0, 100, 10)}
+    for score in scores:
+        if score is None:
+            continue
+        lo = min(90, (score // 10) * 10)
+        histogram[f"{lo}-{lo + 9 if lo < 90 else 100}"] += 1
+    return histogram
+
+
+def build_simulation_report(
+    tickets: List[Dict],
+    before: List[Tuple[Optional[str], Optional[int]]],
+    after: List[Tuple[Optional[str], Optional[int]]],
+    top_n: int = 20
+) -> Dict:
+    """
+    기준 메타데이터와 후보 메타데이터의 결과 비교 리포트 생성
+
+    Args:
+        tickets: JIRA 티켓 리스트
+        before: 기준 메타데이터 결과
+        after: 후보 메타데이터 결과
+        top_n: 상세 출력할 변경 건수
+
+    Returns:
+        Dict: diff 및 분포 리포트
+    """
+    transitions = Counter()
+    risk_deltas = []
+    changes = []
+
+    for ticket, (old_label, old_risk), (new_label, new_risk) in zip(tickets, before, after):
+        label_changed = old_label != new_label
+        risk_changed = old_risk != new_risk
+
+        if label_changed:
+            transitions[f"{old_label or '(unlabeled)'} -> {new_label or '(unlabeled)'}"] += 1
+        if old_risk is not None and new_risk is not None and risk_changed:
+            risk_deltas.append(new_risk - old_risk)
+
+        if label_changed or risk_changed:
+            changes.append({
+                'issue_key': ticket.get('issue_key'),
+                'old_label': old_label,
+                'new_label': new_label,
+                'old_risk': old_risk,
+                'new_risk': new_risk,
+                'diff': (new_risk or 0) - (old_risk or 0)
+            })
+
+    changes.sort(key=lambda x: (x['old_label'] == x['new_label'], -abs(x['diff'])))
+
+    return {
+        'tickets': len(tickets),
+        'label_changes': sum(transitions.values()),
+        'risk_changes': len(risk_deltas),
+        'transitions': dict(transitions.most_common()),
+        'label_distribution': {
+            'before': dict(Counter(label or '(unlabeled)' for label, _ in before).most_common()),
+            'after': dict(Counter(label or '(unlabeled)' for label, _ in after).most_common()),
+        },
+        'risk_distribution': {
+            'before': risk_histogram([risk for _, risk in before]),
+            'after': risk_histogram([risk for _, risk in after]),
+        },
+        'risk_delta': {
+            'mean': sum(risk_deltas) / len(risk_deltas) if risk_deltas else 0.0,
+            'min': min(risk_deltas) if risk_deltas else 0,
+            'max': max(risk_deltas) if risk_deltas else 0,
+        },
+        'top_changes': changes[:top_n],
+    }
+
+
+def run_what_if_simulation(
+    snapshot_dir: str,
+    candidate_path: str,
+    output_path: Optional[str] = None,
+    workers: int = 1
+) -> Dict:
+    """
+    후보 메타데이터 적용 시 레이블/riskpoint 변화를 오프라인으로 시뮬레이션 (쓰기 없음)
+
+    Args:
+        snapshot_dir: export_ticket_snapshot으로 생성한 스냅샷 디렉토리
+        candidate_path: 후보 메타데이터 JSON 파일 ({dataId: metadata}, 변경 항목만 포함 가능)
+        output_path: 리포트 저장 경로 (None이면 출력만)
+        workers: 병렬 처리 프로세스 수
+
+    Returns:
+        Dict: 시뮬레이션 리포트
+    """
+    started = time.perf_counter()
+
+    with instrumentation.phase('ticket_fetch'):
+        tickets, base_items, incident_stats = load_ticket_snapshot(snapshot_dir)
+    with open(candidate_path, 'r', encoding='utf-8') as f:
+        candidate_items = json.load(f)
+
+    unknown = [k for k in candidate_items
+               if k not in RISK_METADATA_IDS and not k.startswith('LABEL_KEYWORDS#')]
+    if unknown:
+        print(f"Warning: Unknown metadata items ignored by the labeler: {', '.join(unknown)}")
+
+    print(f"Loaded snapshot: {len(tickets)} tickets, {len(base_items)} metadata items")
+    print(f"Candidate metadata: {', '.join(sorted(candidate_items))}")
+
+    # 장애 통계는 스냅샷 값 사용 (DynamoDB 조회 없음)
+    RiskCalculator.set_incident_risk_stats(incident_stats)
+
+    with instrumentation.phase('scoring'):
+        print("\n[Baseline metadata]")
+        before = simulate_labeling_pass(tickets, base_items, workers)
+
+        print("\n[Candidate metadata]")
+        after = simulate_labeling_pass(tickets, {**base_items, **candidate_items}, workers)
+
+    report = build_simulation_report(tickets, before, after)
+    report['candidate_items'] = sorted(candidate_items)
+    report['elapsed_sec'] = round(time.perf_counter() - started, 3)
+
+    print(f"\n{'=' * 80}")
+    print(f"What-if Simulation Summary ({report['tickets']} tickets, {report['elapsed_sec']}s)")
+    print(f"{'=' * 80}")
+    print(f"  Label changes: {report['label_changes']}")
+    print(f"  Risk changes: {report['risk_changes']} "
+          f"(mean {report['risk_delta']['mean']:+.2f}, min {report['risk_delta']['min']:+d}, "
+          f"max {report['risk_delta']['max']:+d})")
+
+    if report['transitions']:
+        print("\n  Label transitions:")
+        for transition, count in list(report['transitions'].items())[:10]:
+            print(f"    {transition}: {count}")
+
+    print("\n  Risk distribution (before -> after):")
+    for bucket, count in report['risk_distribution']['before'].items():
+        print(f"    {bucket:>6}: {count} -> {report['risk_distribution']['after'][bucket]}")
+
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n  Report saved: {output_path}")
+
+    return report
+
+
+# 모델 배치 예측 (--predict): 기본 모델 경로, PartiQL batch_execute_statement 최대 문장 수
+PREDICT_MODEL_DIR = f"{MODEL_DIR}/token_model"
+STUDENT_MODEL_DIR = f"{MODEL_DIR}/student_model"
+PARTIQL_BATCH_SIZE = 25
+PREDICT_FETCH_MULTIPLIER = 8
+
+
+def iter_ticket_batches(labeler: 'DataLabeler', issue_keys: List[str], fetch_size: int):
+    """
+    issue_key 목록을 fetch_size 단위로 조회해 티켓 배치를 순차 반환 (한 번에 한 배치만 메모리 유지)
+
+    Args:
+        labeler: DataLabeler (loader, 계측 사용)
+        issue_keys: 조회할 issue_key 목록
+        fetch_size: 배치당 티켓 수
+    """
+    for start in range(0, len(issue_keys), fetch_size):
+        with instrumentation.phase('ticket_fetch'):
+            # 전처리/위험 점수 입력 필드만 조회
+            tickets = labeler.loader.get_tickets_from_dynamodb(issue_keys[start:start + fetch_size],
+                                                               attributes=TEXT_FIELDS)
+        yield tickets
+
+
+def build_prediction_statement(table_name: str, issue_key: str, change_type: str, factors: Dict[str, int],
+                               updated_at: str, serializer: TypeSerializer) -> Dict:
+    """예측 결과 저장용 PartiQL UPDATE 문 (save_label과 같은 필드)"""
+    return {
+        'Statement': f'UPDATE "{table_name}" SET changeType=? SET riskpoint=? SET riskFactors=? SET updatedAt=? '
+                     f'WHERE dataId=?',
+        'Parameters': [
+            serializer.serialize(change_type),
+            serializer.serialize(RiskCalculator.total_risk_score(factors)),
+            serializer.serialize(factors),
+            serializer.serialize(updated_at),
+            serializer.serialize(issue_key),
+        ],
+    }
+
+
+def write_prediction_statements(client, statements: List[Dict]) -> int:
+    """
+    PartiQL batch_execute_statement로 최대 25건씩 업데이트
+
+    Returns:
+        int: 실패 건수
+    """
+    failed = 0
+    for start in range(0, len(statements), PARTIQL_BATCH_SIZE):
+        batch = statements[start:start + PARTIQL_BATCH_SIZE]
+        with instrumentation.phase('dynamodb_write'):
+            response = client.batch_execute_statement(Statements=batch)
+        instrumentation.count('dynamodb', bytes_out=estimate_bytes(batch))
+        errors = [r['Error'] for r in response.get('Responses', []) if 'Error' in r]
+        for error in errors[:3]:
+            print(f"  Warning: batch update failed: {error.get('Code')} {error.get('Message', '')}")
+        failed += len(errors)
+    return failed
+
+
+def load_prediction_model(model_dir: str, quantized: bool = False):
+    """학습된 토큰 모델 로드 (torch/transformers는 예측 경로에서만 import)"""
+    if quantized:
+        from model_export import load_quantized
+        with instrumentation.phase('model_load'):
+            model = load_quantized(model_dir)
+    else:
+        from token_model import TokenizedChangeTypeClassifier
+        with instrumentation.phase('model_load'):
+            model = TokenizedChangeTypeClassifier.load(model_dir)
+    print(f"Loaded {'int8 ' if quantized else ''}model from {model_dir} ({len(model.label_names)} labels)")
+    return model
+
+
+def run_batch_prediction(
+    model_dir: str,
+    batch_size: int,
+    min_confidence: float,
+    quantized: bool = False,
+    dry_run: bool = False
+) -> Dict:
+    """
+    학습된 분류기로 레이블 없는 티켓 전체를 스트리밍 예측하고 changeType/riskpoint 저장
+
+    티켓은 batch_size * PREDICT_FETCH_MULTIPLIER 단위로 조회/예측/저장 후 버리므로
+    메모리 사용량은 대기 티켓 수와 무관 (issue_key 목록만 유지)
+
+    Args:
+        model_dir: 토큰 모델 경로 (학습 스크립트 --pretokenized 산출물)
+        batch_size: 추론 배치 크기 (조회 단위 안에서 길이순 정렬 후 배치 구성)
+        min_confidence: 저장할 최소 예측 신뢰도 (미만은 레이블 없이 유지)
+        quantized: True이면 int8 양자화 모델(model_int8.pt) 사용
+        dry_run: True이면 DynamoDB에 쓰지 않음
+
+    Returns:
+        Dict: 처리/저장/건너뜀/실패 건수, tickets/sec, 레이블별 건수
+    """
+    model = load_prediction_model(model_dir, quantized)
+
+    labeler = DataLabeler(auto_mode=True)
+    preprocessor = JiraTextPreprocessor()
+    serializer = TypeSerializer()
+    client = labeler.dynamodb.meta.client
+
+    unlabeled_keys = labeler.get_unlabeled_tickets()
+    print(f"Found {len(unlabeled_keys)} unlabeled tickets")
+
+    kst = pytz.timezone('Asia/Seoul')
+    stats = {'processed': 0, 'written': 0, 'skipped_low_confidence': 0, 'skipped_empty': 0, 'failed': 0}
+    label_counts = Counter()
+    started = time.perf_counter()
+
+    for tickets in iter_ticket_batches(labeler, unlabeled_keys, batch_size * PREDICT_FETCH_MULTIPLIER):
+        with instrumentation.phase('preprocessing'):
+            texts = [preprocessor.extract_features(ticket) for ticket in tickets]
+        candidates = [(ticket, text) for ticket, text in zip(tickets, texts) if text]
+        stats['skipped_empty'] += len(tickets) - len(candidates)
+
+        with instrumentation.phase('inference'):
+            predictions = model.predict([text for _, text in candidates]) if candidates else []
+            # 유사 장애 점수용 임베딩도 배치 단위로 한 번에 인코딩
+            RiskCalculator.prefetch_similar_vectors([ticket for ticket, _ in candidates], batch_size)
+
+        updated_at = datetime.now(kst).strftime('%Y-%m-%d %H:%M')
+        statements = []
+        with instrumentation.phase('scoring'):
+            for (ticket, _), (change_type, confidence) in zip(candidates, predictions):
+                if confidence < min_confidence:
+                    stats['skipped_low_confidence'] += 1
+                    continue
+                factors = RiskCalculator.calculate_risk_factors(
+                    change_type,
+                    ticket.get('summary', ''),
+                    ticket.get('description', ''),
+                    ticket.get('components', []),
+                    ticket.get('comments', []),
+                    ticket
+                )
+                statements.append(build_prediction_statement(
+                    DYNAMODB_TABLE_NAME, ticket['issue_key'], change_type, factors, updated_at, serializer
+                ))
+                label_counts[change_type] += 1
+
+        if statements and not dry_run:
+            stats['failed'] += write_prediction_statements(client, statements)
+        stats['written'] += len(statements)
+        stats['processed'] += len(tickets)
+
+        elapsed = time.perf_counter() - started
+        print(f"  {stats['processed']}/{len(unlabeled_keys)} tickets "
+              f"({stats['processed'] / elapsed if elapsed > 0 else 0.0:.1f} tickets/s)")
+
+    elapsed = time.perf_counter() - started
+    stats['written'] -= stats['failed']
+    stats['seconds'] = round(elapsed, 2)
+    stats['tickets_per_sec'] = round(stats['processed'] / elapsed, 2) if elapsed > 0 else 0.0
+    stats['labels'] = dict(label_counts.most_common())
+
+    print(f"\n{'=' * 80}")
+    print(f"Batch prediction {'(dry run) ' if dry_run else ''}completed in {elapsed:.1f}s "
+          f"({stats['tickets_per_sec']:.1f} tickets/s)")
+    print(f"  Written: {stats['written']}, low confidence (< {min_confidence:.2f}): "
+          f"{stats['skipped_low_confidence']}, empty text: {stats['skipped_empty']}, failed: {stats['failed']}")
+    for change_type, count in label_counts.most_common(10):
+        print(f"  {change_type}: {count}")
+    print(f"{'=' * 80}")
+
+    instrumentation.set('batch_prediction', stats)
+    return stats
+
+
+class ReadWriteLock:
+    """요청(읽기)은 동시에, 메타데이터 교체(쓰기)는 단독으로 (대기 중인 쓰기 우선)"""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.readers = 0
+        self.writing = False
+        self.writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        with self.condition:
+            while self.writing or self.writers_waiting:
+                self.condition.wait()
+            self.readers += 1
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.readers -= 1
+                if not self.readers:
+                    self.condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self.condition:
+            self.writers_waiting += 1
+            while self.writing or self.readers:
+                self.condition.wait()
+            self.writers_waiting -= 1
+            self.writing = True
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.writing = False
+                self.condition.notify_all()
+
+
+class LabelingService:
+    """AutoLabeler/RiskCalculator를 메모리에 유지하는 상주 서비스"""
+
+    def __init__(self, profile_name='AUTO', region_name=AWS_REGION):
+        session = boto3.Session(profile_name=profile_name)
+        dynamodb = session.resource('dynamodb', region_name=region_name)
+        self.metadata_table = dynamodb.Table('impactanalysis-metadata')
+        # 요청은 읽기 lock으로 동시 처리, 메타데이터 교체만 쓰기 lock (I/O/파싱은 lock 밖)
+        self.lock = ReadWriteLock()
+        self.version = None
+        self.loaded_at = None
+        self.auto_labeler = None
+        self.classifier = None
+        self.batcher = None
+        self.reload(self.fetch_version())
+
+    def enable_classifier(self, model_dir: str, quantized: bool, max_batch_size: int,
+                          max_wait_ms: float, workers: int):
+        """
+        학습된 분류기 /classify 엔드포인트 활성화
+
+        요청마다 forward pass를 수행하지 않고 MicroBatcher로 동시 요청을 묶어 처리
+        (worker별 intra-op 스레드는 CPU 코어를 worker 수로 나눈 값)
+
+        HF fast 토크나이저는 스레드 간 동시 사용이 안전하지 않으므로 ("Already borrowed")
+        worker마다 토크나이저 복사본을 둔 분류기를 사용 (모델 가중치는 공유)
+        """
+        self.classifier = load_prediction_model(model_dir, quantized)
+        self.worker_classifiers = queue.Queue()
+        for _ in range(max(1, workers)):
+            worker_classifier = copy.copy(self.classifier)
+            worker_classifier.tokenizer = copy.deepcopy(self.classifier.tokenizer)
+            self.worker_classifiers.put(worker_classifier)
+        self.worker_state = threading.local()
+        self.preprocessor = JiraTextPreprocessor()
+        if getattr(self.classifier.device, 'type', 'cpu') == 'cpu':
+            from token_model import configure_cpu_threads
+            threads = configure_cpu_threads(max(1, (os.cpu_count() or 1) // max(1, workers)))
+            print(f"Classifier threads per worker: {threads['intra_op']}")
+        self.batcher = MicroBatcher(self._classify_batch, max_batch_size, max_wait_ms, workers)
+        print(f"Micro-batching: max batch {max_batch_size}, max wait {max_wait_ms:.1f}ms, {workers} worker(s)")
+
+    def _classify_batch(self, texts: List[str]) -> List[Dict]:
+        """MicroBatcher batch_fn: 텍스트 배치 한 번의 forward pass (worker 스레드 전용 토크나이저)"""
+        classifier = getattr(self.worker_state, 'classifier', None)
+        if classifier is None:
+            classifier = self.worker_state.classifier = self.worker_classifiers.get_nowait()
+        probabilities = classifier.predict_proba(texts, batch_size=len(texts))
+        return [
+            {'label': self.classifier.label_names[int(row.argmax())], 'confidence': float(row.max())}
+            for row in probabilities
+        ]
+
+    def classify(self, payload: Dict) -> Dict:
+        """
+        학습된 분류기로 레이블 예측 ({'tickets': [...]} 형태면 일괄 처리)
+
+        메타데이터 lock 없이 MicroBatcher에 요청을 넣고 결과를 기다림
+        """
+        if self.batcher is None:
+            raise RuntimeError('Classifier is not enabled (start the service with --classifier)')
+        items = payload['tickets'] if 'tickets' in payload else [payload]
+        results = self.batcher.infer([self.preprocessor.extract_features(item) for item in items])
+        return {'results': results} if 'tickets' in payload else results[0]
+
+    def fetch_version(self) -> str:
+        """메타데이터 버전 스탬프 조회 (없으면 빈 문자열)"""
+        try:
+            response = self.metadata_table.get_item(Key={'dataId': METADATA_VERSION_ID})
+            if 'Item' in response:
+                return str(response['Item'].get('metadata', ''))
+        except Exception as e:
+            print(f"Warning: Failed to load {METADATA_VERSION_ID}: {e}")
+        return self.version or ''
+
+    def reload(self, version: str):
+        """
+        메타데이터와 장애 통계를 다시 로드하고 정규식 패턴 재컴파일
+
+        조회/파싱/패턴 컴파일은 lock 밖에서 새 객체로 준비하고, 쓰기 lock 안에서는 참조만 교체
+        (처리 중인 요청은 끝까지 이전 메타데이터로 계산)
+        """
+        items = fetch_metadata_items(self.metadata_table)
+        values = parse_metadata_items(items)
+        incident_stats, incident_keys = RiskCalculator.fetch_incident_risk_stats()
+        auto_labeler = AutoLabeler(values['LABEL_KEYWORDS'])
+        loaded_at = datetime.now(pytz.timezone('Asia/Seoul')).strftime('%Y-%m-%d %H:%M:%S')
+
+        with self.lock.write():
+            install_metadata_values(values)
+            RiskCalculator._incident_risk_stats = incident_stats
+            RiskCalculator._incident_issue_keys = incident_keys
+            self.auto_labeler = auto_labeler
+            self.version = version
+            self.loaded_at = loaded_at
+
+        print(f"Metadata loaded (version: {version or 'N/A'}, at: {self.loaded_at})")
+
+    def reload_if_changed(self) -> bool:
+        """버전 스탬프가 바뀐 경우에만 다시 로드"""
+        version = self.fetch_version()
+        if version == self.version:
+            return False
+        self.reload(version)
+        return True
+
+    def watch(self, interval: float):
+        """interval초마다 버전 스탬프 확인 (백그라운드 스레드)"""
+        while True:
+            time.sleep(interval)
+            try:
+                self.reload_if_changed()
+            except Exception as e:
+                print(f"Warning: Metadata reload failed: {e}")
+
+    def predict(self, item: Dict) -> Dict:
+        """단일 티켓 레이블 예측"""
+        prediction = self.auto_labeler.predict_label(
+            item.get('summary', ''),
+            item.get('description', ''),
+            threshold=float(item.get('threshold', AUTO_LABEL_THRESHOLD))
+        )
+        if not prediction:
+            return {'label': None, 'confidence': 0.0, 'matched_keywords': []}
+
+        label, confidence, matched_keywords = prediction
+        return {'label': label, 'confidence': confidence, 'matched_keywords': matched_keywords}
+
+    def top_k(self, item: Dict) -> Dict:
+        """단일 티켓 상위 K개 레이블 후보"""
+        predictions = self.auto_labeler.predict_top_labels(
+            item.get('summary', ''),
+            item.get('description', ''),
+            top_k=int(item.get('top_k', 3))
+        )
+        return {
+            'labels': [
+                {'label': label, 'confidence': confidence, 'matched_keywords': matched_keywords}
+                for label, confidence, matched_keywords in predictions
+            ]
+        }
+
+    def risk_score(self, item: Dict) -> Dict:
+        """단일 티켓 위험평가점수 (요소별 점수 포함)"""
+        factors = RiskCalculator.calculate_risk_factors(
+            item.get('change_type', ''),
+            item.get('summary', ''),
+            item.get('description', ''),
+            item.get('components', []),
+            item.get('comments', []),
+            item
+        )
+        result = {'riskpoint': RiskCalculator.total_risk_score(factors), 'risk_factors': factors}
+        if RiskCalculator._similar_index is not None:
+            result['similar_incidents'] = [
+                {'issue_key': entry['issue_key'], 'change_type': entry['change_type'], 'similarity': round(score, 4)}
+                for entry, score in RiskCalculator.nearest_incidents(item)
+            ]
+        return result
+
+    def handle(self, endpoint: str, payload: Dict) -> Dict:
+        """
+        요청 처리 ({'tickets': [...]} 형태면 일괄 처리)
+
+        Args:
+            endpoint: 'predict', 'top_k', 'risk_score', 'classify'
+            payload: 요청 본문
+
+        Returns:
+            Dict: 단일 결과 또는 {'results': [...]}
+        """
+        if endpoint == 'classify':
+            # 분류기는 메타데이터와 무관하므로 lock 밖에서 마이크로 배치로 처리
+            return self.classify(payload)
+
+        handler = {
+            'predict': self.predict,
+            'top_k': self.top_k,
+            'risk_score': self.risk_score,
+        }[endpoint]
+
+        with self.lock.read():
+            if 'tickets' in payload:
+                # 배치 공통 옵션 (threshold, top_k 등)은 개별 티켓 값이 우선
+                defaults = {k: v for k, v in payload.items() if k != 'tickets'}
+                return {'results': [handler({**defaults, **item}) for item in payload['tickets']]}
+            return handler(payload)
+
+
+class LabelingRequestHandler(BaseHTTPRequestHandler):
+    """LabelingService HTTP 엔드포인트 (POST /predict, /top_k, /risk_score, /classify, GET /health, /stats)"""
+
+    service = None
+
+    def _send_json(self, status: int, body: Dict):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {
+                'status': 'ok',
+                'version': self.service.version,
+                'loaded_at': self.service.loaded_at
+            })
+        elif self.path == '/stats':
+            if self.service.batcher is None:
+                self._send_json(404, {'error': 'Classifier is not enabled'})
+            else:
+                self._send_json(200, self.service.batcher.stats())
+        else:
+            self._send_json(404, {'error': f'Unknown endpoint: {self.path}'})
+
+    def do_POST(self):
+        endpoint = self.path.strip('/')
+        if endpoint not in ('predict', 'top_k', 'risk_score', 'classify'):
+            self._send_json(404, {'error': f'Unknown endpoint: {self.path}'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send_json(400, {'error': f'Invalid JSON body: {e}'})
+            return
+
+        try:
+            self._send_json(200, self.service.handle(endpoint, payload))
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+
+    def log_message(self, format, *args):
+        # 요청별 로그 생략 (지연 시간 최소화)
+        pass
+
+
+def run_labeling_service(host: str, port: int, reload_interval: float, classifier_options: Optional[Dict] = None):
+    """
+    레이블링/위험평가 HTTP 서비스 실행
+
+    Args:
+        host: 바인딩 주소
+        port: 포트
+        reload_interval: 메타데이터 버전 확인 주기 (초)
+        classifier_options: LabelingService.enable_classifier 인자 (None이면 /classify 비활성)
+    """
+    service = LabelingService()
+    if classifier_options:
+        service.enable_classifier(**classifier_options)
+    LabelingRequestHandler.service = service
+
+    watcher = threading.Thread(target=service.watch, args=(reload_interval,), daemon=True)
+    watcher.start()
+
+    server = ThreadingHTTPServer((host, port), LabelingRequestHandler)
+    print(f"Labeling service listening on http://{host}:{port} "
+          f"(metadata check every {reload_interval:.0f}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down labeling service...")
+    finally:
+        server.server_close()
+        if service.batcher is not None:
+            stats = service.batcher.stats()
+            service.batcher.close(timeout=5)
+            print(f"Classifier: {stats['requests']} requests in {stats['batches']} batches "
+                  f"(mean {stats['mean_batch_size']:.1f}), p50 {stats['latency_ms_p50']:.1f}ms, "
+                  f"p99 {stats['latency_ms_p99']:.1f}ms")
+            instrumentation.set('micro_batching', stats)
+
+
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="JIRA Change Type Labeling Tool")
+    parser.add_argument(
+        '--recompute',
+        action='store_true',
+        help='변경된 메타데이터에 해당하는 위험 요소만 증분 재계산 (레이블링 생략)'
+    )
+    parser.add_argument(
+        '--bump-metadata-version',
+        action='store_true',
+        help='메타데이터를 직접 수정한 후 METADATA#VERSION 갱신 (레이블링 서비스 자동 재로드)'
+    )
+    parser.add_argument(
+        '--export-snapshot',
+        metavar='DIR',
+        help='What-if 시뮬레이션용 로컬 스냅샷 생성 (DynamoDB 읽기 전용)'
+    )
+    parser.add_argument(
+        '--simulate',
+        metavar='DIR',
+        help='로컬 스냅샷으로 후보 메타데이터를 시뮬레이션 (DynamoDB 쓰기 없음)'
+    )
+    parser.add_argument(
+        '--candidate',
+        metavar='FILE',
+        help='후보 메타데이터 JSON 파일 ({dataId: metadata})'
+    )
+    parser.add_argument(
+        '--output',
+        metavar='FILE',
+        help='시뮬레이션 리포트 저장 경로'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='시뮬레이션 병렬 처리 프로세스 수'
+    )
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        help='predict/top_k/risk_score HTTP 서비스 실행'
+    )
+    parser.add_argument(
+        '--predict',
+        action='store_true',
+        help='학습된 분류기로 레이블 없는 티켓 전체를 배치 예측하여 changeType/riskpoint 저장'
+    )
+    parser.add_argument('--model-dir', default=PREDICT_MODEL_DIR, help='--predict/--classifier 모델 경로')
+    parser.add_argument('--quantized', action='store_true', help='--predict/--classifier 시 int8 양자화 모델 사용 (CPU)')
+    parser.add_argument('--batch-size', type=int, default=64, help='--predict 추론 배치 크기')
+    parser.add_argument(
+        '--min-confidence',
+        type=float,
+        default=AUTO_LABEL_THRESHOLD,
+        help=f'--predict 저장 최소 신뢰도 (기본값: {AUTO_LABEL_THRESHOLD})'
+    )
+    parser.add_argument('--dry-run', action='store_true', help='--predict 결과를 DynamoDB에 쓰지 않음')
+    parser.add_argument(
+        '--student',
+        action='store_true',
+        help='자동 레이블링에 증류 학생 모델 사용 (신뢰도 낮으면 --model-dir BERT로 위임)'
+    )
+    parser.add_argument('--student-dir', default=STUDENT_MODEL_DIR, help='--student 모델 경로')
+    parser.add_argument(
+        '--similar-incidents',
+        action='store_true',
+        help='임베딩 인덱스로 유사 과거 장애 위험 요소(similar_incident) 계산 (새 티켓은 --model-dir BERT로 인코딩)'
+    )
+    parser.add_argument('--index-dir', default=EMBEDDING_INDEX_DIR, help='--similar-incidents 임베딩 인덱스 경로')
+    parser.add_argument(
+        '--snapshot',
+        action='store_true',
+        help='티켓 본문을 컬럼형 스냅샷에서 읽음 (없거나 오래되었으면 새로 생성, 레이블 여부는 DynamoDB 기준)'
+    )
+    parser.add_argument(
+        '--snapshot-max-age',
+        type=float,
+        default=SNAPSHOT_MAX_AGE_HOURS,
+        help=f'--snapshot 재사용 허용 경과 시간 (시간, 기본값: {SNAPSHOT_MAX_AGE_HOURS:g})'
+    )
+    parser.add_argument('--refresh-snapshot', action='store_true', help='--snapshot 시 항상 새로 생성')
+    parser.add_argument(
+        '--compact-tickets',
+        action='store_true',
+        help='전체 티켓을 다루는 단계(--recompute, --snapshot)에서 __slots__ 티켓 + 압축 댓글 사용'
+    )
+    parser.add_argument(
+        '--student-threshold',
+        type=float,
+        default=None,
+        help='--student BERT 위임 신뢰도 임계값 (기본값: 증류 시 추천값)'
+    )
+    add_instrumentation_arguments(parser, MODEL_DIR)
+    parser.add_argument('--host', default='127.0.0.1', help='서비스 바인딩 주소')
+    parser.add_argument('--port', type=int, default=8080, help='서비스 포트')
+    parser.add_argument(
+        '--reload-interval',
+        type=float,
+        default=30.0,
+        help=f'{METADATA_VERSION_ID} 확인 주기 (초)'
+    )
+    parser.add_argument(
+        '--classifier',
+        action='store_true',
+        help='--serve 시 학습된 분류기 /classify 엔드포인트 추가 (마이크로 배치 추론)'
+    )
+    parser.add_argument('--max-batch-size', type=int, default=32, help='/classify 마이크로 배치 최대 크기')
+    parser.add_argument('--max-wait-ms', type=float, default=5.0, help='/classify 배치 수집 최대 대기 시간 (ms)')
+    parser.add_argument('--inference-workers', type=int, default=1, help='/classify 추론 worker 스레드 수')
+    args = parser.parse_args()
+
+    if args.simulate and not args.candidate:
+        parser.error('--simulate requires --candidate')
+
+    return args
+
+
 def main():
     """메인 함수"""
+    args = parse_args()
+    instrumentation.configure('label-data', args.report_dir, profile=args.profile)
+
+    try:
+        run(args)
+    finally:
+        instrumentation.print_summary()
+        instrumentation.write_report()
+
+
+def run(args):
+    """실행 모드별 처리"""
     print("=" * 80)
     print("JIRA Change Type Labeling Tool")
     print("=" * 80)
 
+    if args.simulate:
+        run_what_if_simulation(args.simulate, args.candidate, args.output, args.workers)
+        return
+
+    if args.bump_metadata_version:
+        session = boto3.Session(profile_name='AUTO')
+        bump_metadata_version(session.resource('dynamodb', region_name=AWS_REGION).Table('impactanalysis-metadata'))
+        return
+
+    if args.similar_incidents:
+        RiskCalculator.enable_similar_incidents(args.index_dir, args.model_dir, args.quantized)
+
+    if args.serve:
+        classifier_options = {
+            'model_dir': args.model_dir,
+            'quantized': args.quantized,
+            'max_batch_size': args.max_batch_size,
+            'max_wait_ms': args.max_wait_ms,
+            'workers': args.inference_workers,
+        } if args.classifier else None
+        run_labeling_service(args.host, args.port, args.reload_interval, classifier_options)
+        return
+
+    if args.export_snapshot:
+        load_metadata_from_dynamodb()
+        export_ticket_snapshot(args.export_snapshot)
+        return
+
     # DynamoDB에서 메타데이터 로드
     load_metadata_from_dynamodb()
 
     # 과거 장애 발생 통계 로드
     print("Loading incident risk statistics...")
-    incident_stats = RiskCalculator.load_incident_risk_stats()
+    with instrumentation.phase('incident_stats_load'):
+        incident_stats = RiskCalculator.load_incident_risk_stats()
     if incident_stats:
         print("\nIncident Risk by Change Type:")
         for change_type, data in sorted(incident_stats.items()):
@@ -994,7 +2673,26 @@ def main():
             incidents = data.get('incidents', 0)
             print(f"  {change_type}: {incidents}/{total} ({rate*100:.1f}% incident rate)")
 
-    labeler = DataLabeler(auto_mode=True)
+    if args.predict:
+        print("\n" + "=" * 80)
+        print("Batch prediction with the trained classifier")
+        print("=" * 80)
+        run_batch_prediction(args.model_dir, args.batch_size, args.min_confidence, args.quantized, args.dry_run)
+        return
+
+    labeler = DataLabeler(auto_mode=True, compact=args.compact_tickets)
+    if args.student:
+        labeler.enable_student(args.student_dir, args.student_threshold, args.model_dir, args.quantized)
+    if args.snapshot:
+        with instrumentation.phase('snapshot'):
+            labeler.use_snapshot(args.snapshot_max_age, args.refresh_snapshot)
+
+    if args.recompute:
+        print("\n" + "=" * 80)
+        print("Incremental riskpoint recompute (changed metadata only)")
+        print("=" * 80)
+        labeler.recompute_changed_risk_factors()
+        return
 
     # 1. 기존 레이블된 티켓들을 세분화된 changeType으로 재분류 및 riskpoint 업데이트
     print("\n" + "=" * 80)
@@ -1007,7 +2705,7 @@ def main():
     print("Step 2: Auto-labeling unlabeled tickets")
     print("=" * 80)
     print("\nStarting fully automatic labeling (no confirmation required)...")
-    labeler.auto_labeling(confidence_threshold=0.3, confirm=False)
+    labeler.auto_labeling(confidence_threshold=AUTO_LABEL_THRESHOLD, confirm=False)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+모델 로드 벤치마크 스크립트
+safetensors 산출물(memory map 로드)과 pickle 산출물의 콜드 스타트 시간과 RSS를 비교합니다.
+각 방식은 별도 프로세스에서 측정하며 (import 시간 제외), 첫 예측 지연도 함께 기록합니다.
+
+사용법:
+    # 학습 스크립트(--pretokenized)가 저장한 토큰 모델 기준
+    python impact-analysis-pytorch-bert-model-load-benchmark.py
+
+    # 모델 경로 지정, 반복 횟수 변경
+    python impact-analysis-pytorch-bert-model-load-benchmark.py --model-dir ./models/token_model --repeat 5
+"""
+import os
+import sys
+import json
+import time
+import pickle
+import resource
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, List, Optional
+
+from config import MODEL_DIR, MODEL_PATH, VECTORIZER_PATH
+
+SAMPLE_TEXTS = [
+    '결제 모듈 타임아웃 설정 변경 요청',
+    'Update nginx config for the api-gateway and restart the service',
+    '회원 가입 화면 문구 수정',
+]
+
+
+def current_rss_mb() -> float:
+    """현재 프로세스 RSS (MB, /proc 기준)"""
+    with open('/proc/self/statm', 'r') as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+
+
+def legacy_pickle_paths() -> List[str]:
+    """기존 학습 경로(model.save)가 만드는 vectorizer/classifier pickle 경로"""
+    base_path = MODEL_PATH.rsplit('.', 1)[0]
+    vectorizer_path = VECTORIZER_PATH if VECTORIZER_PATH else f"{base_path}_vectorizer.pkl"
+    return [vectorizer_path, f"{base_path}_classifier.pkl"]
+
+
+def measure_child(kind: str, path: str) -> Dict:
+    """
+    (자식 프로세스) 한 가지 방식으로 모델을 로드하고 시간/메모리 측정
+
+    Args:
+        kind: 'safetensors', 'pickle', 'legacy-pickle'
+        path: 모델 디렉토리 또는 pickle 파일 경로
+
+    Returns:
+        Dict: load_seconds, first_predict_seconds, rss_before_mb, rss_after_mb, peak_rss_mb
+    """
+    # 무거운 import는 측정에서 제외
+    import torch  # noqa: F401
+    from token_model import TokenizedChangeTypeClassifier
+
+    rss_before = current_rss_mb()
+    started = time.perf_counter()
+
+    if kind == 'safetensors':
+        model = TokenizedChangeTypeClassifier.load(path, device='cpu')
+    elif kind == 'pickle':
+        with open(path, 'rb') as f:
+            model = pickle.load(f)
+    else:
+        loaded = []
+        for pickle_path in path.split(os.pathsep):
+            with open(pickle_path, 'rb') as f:
+                loaded.append(pickle.load(f))
+        model = None
+
+    load_seconds = time.perf_counter() - started
+    rss_after = current_rss_mb()
+
+    first_predict_seconds = None
+    if model is not None:
+        started = time.perf_counter()
+        model.predict(SAMPLE_TEXTS)
+        first_predict_seconds = time.perf_counter() - started
+
+    return {
+        'kind': kind,
+        'load_seconds': load_seconds,
+        'first_predict_seconds': first_predict_seconds,
+        'rss_before_mb': rss_before,
+        'rss_after_mb': rss_after,
+        # Linux ru_maxrss 단위는 KB
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def run_child(kind: str, path: str) -> Optional[Dict]:
+    """별도 프로세스에서 measure_child 실행 (콜드 스타트 측정)"""
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', kind, '--path', path],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(f"  ✗ {kind} failed: {result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'unknown error'}")
+        return None
+    # 마지막 줄이 결과 JSON (로드 중 출력 무시)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def create_pickle_artifact(model_dir: str, output_path: str):
+    """비교용: safetensors 모델을 로드해 분류기 객체 전체를 pickle로 저장"""
+    from token_model import TokenizedChangeTypeClassifier
+    model = TokenizedChangeTypeClassifier.load(model_dir, device='cpu')
+    with open(output_path, 'wb') as f:
+        pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def summarize(results: List[Dict]) -> Dict:
+    """반복 측정 결과 요약 (load 시간은 최소/중앙값, 메모리는 중앙값)"""
+    def median(values):
+        values = sorted(values)
+        return values[len(values) // 2]
+
+    predict_times = [r['first_predict_seconds'] for r in results if r['first_predict_seconds'] is not None]
+    return {
+        'runs': len(results),
+        'load_seconds_min': min(r['load_seconds'] for r in results),
+        'load_seconds_median': median([r['load_seconds'] for r in results]),
+        'first_predict_seconds_median': median(predict_times) if predict_times else None,
+        'rss_delta_mb_median': median([r['rss_after_mb'] - r['rss_before_mb'] for r in results]),
+        'peak_rss_mb_median': median([r['peak_rss_mb'] for r in results]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Model artifact load benchmark (safetensors vs pickle)")
+    parser.add_argument('--model-dir', default=f"{MODEL_DIR}/token_model", help='safetensors 모델 디렉토리')
+    parser.add_argument('--repeat', type=int, default=3, help='방식별 반복 횟수')
+    parser.add_argument('--output', default=None, help='결과 JSON 경로 (선택)')
+    parser.add_argument('--child', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--path', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure_child(args.child, args.path)))
+        return
+
+    print("=" * 80)
+    print("Model Load Benchmark")
+    print("=" * 80)
+
+    if not os.path.exists(os.path.join(args.model_dir, 'label_map.json')):
+        print(f"Error: No model found in {args.model_dir}. Train with --pretokenized first.")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pickle_path = os.path.join(tmp_dir, 'token_classifier.pkl')
+        print(f"\nCreating pickle artifact for comparison: {pickle_path}")
+        create_pickle_artifact(args.model_dir, pickle_path)
+
+        candidates = [('safetensors', args.model_dir), ('pickle', pickle_path)]
+        legacy_paths = legacy_pickle_paths()
+        if all(os.path.exists(p) for p in legacy_paths):
+            candidates.append(('legacy-pickle', os.pathsep.join(legacy_paths)))
+        else:
+            print(f"  Legacy pickle artifacts not found ({', '.join(legacy_paths)}), skipping")
+
+        summaries = {}
+        for kind, path in candidates:
+            print(f"\nMeasuring {kind} ({args.repeat} runs)...")
+            results = [r for r in (run_child(kind, path) for _ in range(args.repeat)) if r]
+            if results:
+                summaries[kind] = summarize(results)
+
+    print(f"\n{'artifact':<15} {'load min':>10} {'load p50':>10} {'1st predict':>12} {'RSS +MB':>9} {'peak RSS':>10}")
+    for kind, s in summaries.items():
+        first_predict = f"{s['first_predict_seconds_median']:.3f}s" if s['first_predict_seconds_median'] is not None else '-'
+        print(f"{kind:<15} {s['load_seconds_min']:>9.3f}s {s['load_seconds_median']:>9.3f}s {first_predict:>12} "
+              f"{s['rss_delta_mb_median']:>9.0f} {s['peak_rss_mb_median']:>8.0f}MB")
+
+    if 'safetensors' in summaries and 'pickle' in summaries:
+        speedup = summaries['pickle']['load_seconds_median'] / max(summaries['safetensors']['load_seconds_median'], 1e-9)
+        print(f"\nsafetensors load is {speedup:.1f}x faster than pickle "
+              f"(RSS {summaries['safetensors']['rss_delta_mb_median']:.0f} MB vs "
+              f"{summaries['pickle']['rss_delta_mb_median']:.0f} MB)")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summaries, f, indent=2)
+        print(f"Results saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
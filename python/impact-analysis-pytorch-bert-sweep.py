@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+하이퍼파라미터 sweep / k-fold 실행 스크립트
+DynamoDB 로딩과 토큰화는 한 번만 수행하고, (설정 x fold) 학습을 worker 프로세스로 나눠 실행합니다.
+각 trial의 검증 macro-F1과 소요 시간을 기록하고 최적 설정을 선택합니다.
+
+사용법:
+    # 배치 크기 x 학습률 x boost 배수 조합을 3-fold로 평가
+    python impact-analysis-pytorch-bert-sweep.py --batch-sizes 16,32 --learning-rates 2e-5,3e-5 --boost-factors 2,3
+
+    # CPU worker 4개, 에폭 예산 5 (조기 종료 patience 2)
+    python impact-analysis-pytorch-bert-sweep.py --cpu --workers 4 --epochs 5 --patience 2
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+import importlib.util
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+
+from token_model import TokenizedChangeTypeClassifier, TokenizedCorpus, configure_cpu_threads, stratified_kfold
+from instrumentation import instrumentation, add_instrumentation_arguments
+
+TRAIN_SCRIPT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'impact-analysis-pytorch-bert-train.py')
+
+
+def load_train_module():
+    """학습 스크립트를 모듈로 로드 (파일명에 '-'가 있어 import 불가)"""
+    spec = importlib.util.spec_from_file_location('train', TRAIN_SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# spawn worker도 모듈 로드 시 같은 학습 모듈을 사용
+train = load_train_module()
+
+
+def parse_list(value: str, cast) -> List:
+    """'16,32' 형식 문자열을 리스트로 변환"""
+    return [cast(item) for item in value.split(',') if item.strip()]
+
+
+def build_trials(args) -> List[Dict]:
+    """하이퍼파라미터 조합 목록"""
+    grid = itertools.product(
+        parse_list(args.batch_sizes, int),
+        parse_list(args.learning_rates, float),
+        parse_list(args.epochs, int),
+        parse_list(args.boost_factors, int),
+    )
+    return [
+        {'trial': i, 'batch_size': batch_size, 'learning_rate': learning_rate,
+         'num_epochs': num_epochs, 'boost_factor': boost_factor}
+        for i, (batch_size, learning_rate, num_epochs, boost_factor) in enumerate(grid)
+    ]
+
+
+# worker 프로세스에 고정된 학습 장치 (_init_sweep_worker에서 설정)
+_worker_device = 'cpu'
+
+
+def _init_sweep_worker(threads_per_worker: int, devices):
+    """
+    worker 프로세스 초기화
+
+    CPU 스레드 수 제한 (worker 수 x 스레드 수 <= 코어 수) 후 장치 큐에서 장치 1개를 꺼내 고정
+    (작업 완료 순서와 무관하게 GPU별 worker 수가 균등)
+    """
+    global _worker_device
+    configure_cpu_threads(threads_per_worker)
+    _worker_device = devices.get()
+
+
+def run_fold(task: Dict) -> Dict:
+    """
+    (설정, fold) 1건 학습 및 검증 (worker 프로세스에서 실행)
+
+    Args:
+        task: trial 설정, fold 번호, 코퍼스 경로, 학습/검증 인덱스, 샘플 가중치
+
+    Returns:
+        Dict: trial/fold별 검증 macro-F1, 실행 에폭, 소요 시간
+    """
+    trial = task['trial']
+    corpus = TokenizedCorpus(task['cache_dir'])
+    model = TokenizedChangeTypeClassifier(
+        model_name=task['model_name'],
+        batch_size=trial['batch_size'],
+        learning_rate=trial['learning_rate'],
+        num_epochs=trial['num_epochs'],
+        use_class_weight=True,
+        device=_worker_device,
+        bucket_by_length=True,
+        bf16=task['bf16']
+    )
+
+    started = time.perf_counter()
+    summary = model.train(
+        corpus,
+        indices=task['train_indices'],
+        sample_weights=task['sample_weights'],
+        validation_indices=task['validation_indices'],
+        patience=task['patience']
+    )
+
+    return {
+        'trial': trial['trial'],
+        'fold': task['fold'],
+        'macro_f1': summary.get('best_val_macro_f1', 0.0),
+        'best_epoch': summary.get('best_epoch', summary['epochs_run']),
+        'epochs_run': summary['epochs_run'],
+        'device': _worker_device,
+        'seconds': time.perf_counter() - started,
+        'samples_per_sec': summary['samples_per_sec'],
+    }
+
+
+def summarize_trials(trials: List[Dict], fold_results: List[Dict]) -> List[Dict]:
+    """
+    trial별 fold 결과 집계 (평균 macro-F1 내림차순, 동점이면 소요 시간 오름차순)
+
+    Returns:
+        List[Dict]: 정렬된 trial 결과
+    """
+    summaries = []
+    for trial in trials:
+        results = [r for r in fold_results if r['trial'] == trial['trial']]
+        if not results:
+            continue
+        scores = [r['macro_f1'] for r in results]
+        summaries.append({
+            **trial,
+            'folds': len(results),
+            'mean_macro_f1': float(np.mean(scores)),
+            'std_macro_f1': float(np.std(scores)),
+            'mean_epochs_run': float(np.mean([r['epochs_run'] for r in results])),
+            'mean_best_epoch': float(np.mean([r['best_epoch'] for r in results])),
+            'seconds': float(sum(r['seconds'] for r in results)),
+            'fold_results': sorted(results, key=lambda r: r['fold']),
+        })
+    return sorted(summaries, key=lambda s: (-s['mean_macro_f1'], s['seconds']))
+
+
+def prepare_corpus(args, model_name: str):
+    """
+    데이터 로딩, 전처리, 토큰화 (sweep 전체에서 1회)
+
+    Returns:
+        (corpus, labels, is_incident, cluster_weights)
+    """
+    loader = train.ProjectedJiraDataLoader()
+
+    with instrumentation.phase('metadata_load'):
+        existing_incident_keys = loader.get_incident_history()
+    with instrumentation.phase('ticket_fetch'):
+        change_types = loader.get_existing_change_types()
+    if not change_types:
+        print("Error: No labeled data found in DynamoDB.")
+        sys.exit(1)
+
+    all_issue_keys = set(change_types.keys())
+    all_issue_keys.update(existing_incident_keys)
+    with instrumentation.phase('ticket_fetch'):
+        tickets = loader.get_tickets_from_dynamodb(list(all_issue_keys), attributes=train.PREPROCESSOR_FIELDS)
+    # 코퍼스 순서 고정 (토큰화 캐시 fingerprint가 행 순서에 의존)
+    tickets.sort(key=lambda ticket: ticket.get('issue_key') or '')
+    print(f"Loaded {len(tickets)} tickets")
+
+    preprocessor = train.JiraTextPreprocessor()
+    with instrumentation.phase('preprocessing'):
+        texts, labels, is_incident = train.prepare_training_data(
+            tickets, change_types, preprocessor, existing_incident_keys,
+            workers=args.feature_workers,
+            cache_path=train.FEATURE_CACHE_PATH
+        )
+    if not train.check_data_quality(texts, labels):
+        sys.exit(1)
+
+    cluster_weights = None
+    if args.dedup:
+        with instrumentation.phase('deduplication'):
+            texts, labels, is_incident, cluster_weights = train.deduplicate_training_data(
+                texts, labels, is_incident, threshold=args.dedup_threshold
+            )
+
+    with instrumentation.phase('tokenization'):
+        corpus = train.pretokenize_corpus(texts, labels, model_name, train.TOKENIZED_CACHE_DIR)
+
+    return corpus, labels, is_incident, cluster_weights
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JIRA Change Type Classifier - Hyperparameter sweep / k-fold")
+    add_instrumentation_arguments(parser, train.MODEL_DIR)
+    parser.add_argument('--batch-sizes', default=str(train.BATCH_SIZE), help='배치 크기 후보 (쉼표 구분)')
+    parser.add_argument('--learning-rates', default=str(train.LEARNING_RATE), help='학습률 후보 (쉼표 구분)')
+    parser.add_argument('--epochs', default=str(train.NUM_EPOCHS), help='최대 에폭 후보 (쉼표 구분)')
+    parser.add_argument('--boost-factors', default='3', help='incident boost 배수 후보 (쉼표 구분)')
+    parser.add_argument('--folds', type=int, default=3, help='k-fold 수')
+    parser.add_argument('--patience', type=int, default=train.EARLY_STOPPING_PATIENCE, help='조기 종료 patience')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='동시 학습 프로세스 수 (기본값: GPU 수, CPU면 코어 4개당 1개)')
+    parser.add_argument('--cpu', action='store_true', help='GPU가 있어도 CPU로 학습')
+    parser.add_argument('--bf16', action='store_true', help='bfloat16 autocast')
+    parser.add_argument('--small-model', action='store_true', help=f'경량 모델({train.SMALL_MODEL_NAME}) 사용')
+    parser.add_argument('--feature-workers', type=int, default=os.cpu_count() or 1, help='텍스트 전처리 프로세스 수')
+    parser.add_argument('--dedup', action='store_true', help='MinHash/LSH 근사 중복 제거')
+    parser.add_argument('--dedup-threshold', type=float, default=train.NEAR_DUPLICATE_THRESHOLD,
+                        help='근사 중복 판정 Jaccard 유사도')
+    parser.add_argument('--output', default=os.path.join(train.MODEL_DIR, 'sweep_results.json'),
+                        help='결과 JSON 경로')
+    args = parser.parse_args()
+
+    instrumentation.configure('sweep', args.report_dir, profile=args.profile)
+    try:
+        run(args)
+    finally:
+        instrumentation.print_summary()
+        instrumentation.write_report()
+
+
+def run(args):
+    """데이터 준비 후 trial x fold 학습을 worker 프로세스로 분배"""
+    import torch
+
+    print("=" * 80)
+    print("JIRA Change Type Classifier - Hyperparameter Sweep")
+    print("=" * 80)
+
+    model_name = train.SMALL_MODEL_NAME if args.small_model else train.DEFAULT_MODEL_NAME
+    gpu_count = 0 if args.cpu else torch.cuda.device_count()
+    cpu_count = os.cpu_count() or 1
+    workers = args.workers or (gpu_count if gpu_count else max(1, cpu_count // 4))
+
+    trials = build_trials(args)
+    print(f"\nTrials: {len(trials)} x {args.folds} folds = {len(trials) * args.folds} runs")
+    print(f"Workers: {workers} ({'GPU x ' + str(gpu_count) if gpu_count else 'CPU'}), model: {model_name}")
+
+    print("\n[1/3] Loading and tokenizing data (once)...")
+    corpus, labels, is_incident, cluster_weights = prepare_corpus(args, model_name)
+    folds = stratified_kfold(corpus.label_ids, args.folds)
+
+    # boost 배수별 샘플 가중치는 한 번만 계산해 trial 간 공유
+    weights_by_boost = {}
+    for trial in trials:
+        if trial['boost_factor'] not in weights_by_boost:
+            weights_by_boost[trial['boost_factor']] = train.compute_sample_weights(
+                labels, is_incident, boost_factor=trial['boost_factor'], base_weights=cluster_weights
+            )
+
+    tasks = []
+    for trial in trials:
+        for fold, (train_indices, validation_indices) in enumerate(folds):
+            tasks.append({
+                'trial': trial,
+                'fold': fold,
+                'cache_dir': corpus.cache_dir,
+                'model_name': model_name,
+                'train_indices': train_indices,
+                'validation_indices': validation_indices,
+                'sample_weights': weights_by_boost[trial['boost_factor']],
+                'patience': args.patience,
+                'bf16': args.bf16,
+            })
+
+    print(f"\n[2/3] Running {len(tasks)} training runs...")
+    fold_results = []
+    # CUDA는 fork 후 초기화가 불가하므로 spawn 사용
+    context = multiprocessing.get_context('spawn')
+    threads_per_worker = max(1, cpu_count // workers)
+    # worker별 장치: GPU를 순서대로 배정 (worker 수가 GPU 수보다 많으면 GPU당 여러 worker)
+    devices = context.Queue()
+    for worker in range(workers):
+        devices.put(f"cuda:{worker % gpu_count}" if gpu_count else 'cpu')
+    with instrumentation.phase('trials'):
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_sweep_worker,
+            initargs=(threads_per_worker, devices)
+        ) as executor:
+            futures = {executor.submit(run_fold, task): task for task in tasks}
+            for future in as_completed(futures):
+                task = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"  ✗ trial {task['trial']['trial']} fold {task['fold']} failed: {e}")
+                    continue
+                fold_results.append(result)
+                print(f"  ✓ trial {result['trial']} fold {result['fold']}: macro-F1 {result['macro_f1']:.4f} "
+                      f"({result['epochs_run']} epochs, {result['seconds']:.0f}s, {result['device']})")
+
+    print("\n[3/3] Results")
+    summaries = summarize_trials(trials, fold_results)
+    if not summaries:
+        print("Error: All trials failed.")
+        sys.exit(1)
+
+    print(f"  {'trial':>5} {'batch':>5} {'lr':>9} {'epochs':>6} {'boost':>5} "
+          f"{'macro-F1':>14} {'epochs run':>10} {'time':>8}")
+    for s in summaries:
+        print(f"  {s['trial']:>5} {s['batch_size']:>5} {s['learning_rate']:>9.1e} {s['num_epochs']:>6} "
+              f"{s['boost_factor']:>5} {s['mean_macro_f1']:>8.4f}±{s['std_macro_f1']:.3f} "
+              f"{s['mean_epochs_run']:>10.1f} {s['seconds']:>7.0f}s")
+
+    best = summaries[0]
+    print(f"\nBest configuration (trial {best['trial']}): "
+          f"BATCH_SIZE={best['batch_size']}, LEARNING_RATE={best['learning_rate']}, "
+          f"NUM_EPOCHS={best['num_epochs']} (best epoch ≈ {best['mean_best_epoch']:.1f}), "
+          f"boost_factor={best['boost_factor']}")
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'model_name': model_name,
+            'folds': args.folds,
+            'workers': workers,
+            'best': {k: v for k, v in best.items() if k != 'fold_results'},
+            'trials': summaries,
+        }, f, indent=2, ensure_ascii=False)
+    print(f"  Results saved: {args.output}")
+
+    instrumentation.set('trials', len(trials))
+    instrumentation.set('best_trial', best['trial'])
+    instrumentation.set('best_mean_macro_f1', round(best['mean_macro_f1'], 4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+티켓 메모리 벤치마크 스크립트
+전체 티켓 코퍼스를 기존 dict 티켓과 __slots__ Ticket(intern 문자열 + 압축 댓글)으로 각각 적재하여
+유지 메모리(tracemalloc), 적재 시간, 주요 패스(요약/설명 읽기, 댓글 읽기) 시간을 비교합니다.
+
+사용법:
+    # 최신 컬럼형 스냅샷 기준 (없으면 DynamoDB에서 전체 티켓 조회)
+    python impact-analysis-pytorch-bert-ticket-memory-benchmark.py
+
+    # 스냅샷 경로 지정, 결과 저장
+    python impact-analysis-pytorch-bert-ticket-memory-benchmark.py --snapshot-dir ./models/snapshots/20250101-000000 \\
+        --output ticket_memory.json
+"""
+import gc
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from ticket import Ticket, json_default
+from ticket_snapshot import TicketSnapshot, latest_snapshot
+
+
+def load_source_tickets(snapshot_dir: str = None, limit: int = None) -> List[Dict]:
+    """벤치마크 입력: 스냅샷(있으면) 또는 DynamoDB 전체 티켓 (dict)"""
+    snapshot_dir = snapshot_dir or latest_snapshot(max_age_hours=None)
+    if snapshot_dir:
+        print(f"Loading tickets from snapshot: {snapshot_dir}")
+        tickets = TicketSnapshot(snapshot_dir).tickets()
+    else:
+        from data_loader import JiraDataLoader
+        print("No snapshot found. Loading tickets from DynamoDB...")
+        loader = JiraDataLoader()
+        issue_keys = set(loader.get_incident_issue_keys())
+        issue_keys.update(loader.get_existing_change_types())
+        tickets = loader.get_tickets_from_dynamodb(sorted(issue_keys))
+    return tickets[:limit] if limit else tickets
+
+
+def measure(build: Callable[[], List]) -> Tuple[List, Dict]:
+    """
+    build()가 만든 객체의 유지 메모리와 소요 시간 (중간 객체는 제외)
+
+    Returns:
+        Tuple[List, Dict]: (결과 객체, {'retained_mb', 'peak_mb', 'seconds'})
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    result = build()
+    seconds = time.perf_counter() - started
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, {
+        'retained_mb': (current - before) / (1024 * 1024),
+        'peak_mb': (peak - before) / (1024 * 1024),
+        'seconds': seconds,
+    }
+
+
+def text_pass(tickets: List) -> float:
+    """요약/설명/컴포넌트만 읽는 패스 (학습 전처리, 키워드 점수와 같은 접근)"""
+    started = time.perf_counter()
+    total = 0
+    for ticket in tickets:
+        total += len(ticket.get('summary', '')) + len(ticket.get('description', ''))
+        total += len(ticket.get('components', []))
+    return time.perf_counter() - started
+
+
+def comment_pass(tickets: List) -> float:
+    """댓글 본문을 읽는 패스 (calculate_comment_risk_score와 같은 접근, Ticket은 여기서 디코딩)"""
+    started = time.perf_counter()
+    total = 0
+    for ticket in tickets:
+        comments = ticket.get('comments', [])
+        if comments:
+            total += sum(len(comment.get('body', '')) for comment in comments)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ticket representation memory benchmark (dict vs __slots__ Ticket)")
+    parser.add_argument('--snapshot-dir', default=None, help='컬럼형 스냅샷 경로 (기본값: 최신 스냅샷)')
+    parser.add_argument('--limit', type=int, default=None, help='최대 티켓 수')
+    parser.add_argument('--output', default=None, help='결과 JSON 경로 (선택)')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("Ticket Memory Benchmark")
+    print("=" * 80)
+
+    tickets = load_source_tickets(args.snapshot_dir, args.limit)
+    if not tickets:
+        print("Error: No tickets to benchmark.")
+        sys.exit(1)
+
+    # 두 방식 모두 같은 직렬화 원본에서 새로 적재 (원본 객체 공유로 인한 과소 측정 방지)
+    source = [json.dumps(ticket, ensure_ascii=False, default=json_default) for ticket in tickets]
+    del tickets
+    print(f"{len(source)} tickets, {sum(len(s.encode('utf-8')) for s in source) / (1024 * 1024):.1f} MB as JSON\n")
+
+    results = {}
+    dicts, results['dict'] = measure(lambda: [json.loads(s) for s in source])
+    results['dict']['text_pass_seconds'] = text_pass(dicts)
+    results['dict']['comment_pass_seconds'] = comment_pass(dicts)
+    del dicts
+
+    compact, results['slots'] = measure(lambda: [Ticket.from_item(json.loads(s)) for s in source])
+    results['slots']['text_pass_seconds'] = text_pass(compact)
+    results['slots']['comment_pass_seconds'] = comment_pass(compact)
+    del compact
+
+    print(f"{'representation':<15} {'retained':>10} {'peak':>10} {'load':>8} {'text pass':>10} {'comment pass':>13}")
+    for name, r in results.items():
+        print(f"{name:<15} {r['retained_mb']:>8.1f}MB {r['peak_mb']:>8.1f}MB {r['seconds']:>7.2f}s "
+              f"{r['text_pass_seconds']:>9.3f}s {r['comment_pass_seconds']:>12.3f}s")
+
+    saved = 1.0 - results['slots']['retained_mb'] / results['dict']['retained_mb'] if results['dict']['retained_mb'] else 0.0
+    print(f"\n__slots__ Ticket retains {saved * 100:.1f}% less memory "
+          f"({results['dict']['retained_mb'] / max(len(source), 1) * 1024:.1f} KB -> "
+          f"{results['slots']['retained_mb'] / max(len(source), 1) * 1024:.1f} KB per ticket)")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'tickets': len(source), **results}, f, indent=2)
+        print(f"Results saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,11 +6,36 @@ KLUE BERT를 사용한 한국어 텍스트 분류
 import os
 import sys
 import json
+import zlib
+import hashlib
+import argparse
 import boto3
-from typing import List, Dict
-from data_loader import JiraDataLoader
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional
+# PREPROCESSOR_FIELDS: 전처리기 입력 필드 계약 (projected_loader 참고)
+from projected_loader import ProjectedJiraDataLoader, PREPROCESSOR_FIELDS
 from preprocessor import JiraTextPreprocessor
 from model import ChangeTypeClassifier
+from token_model import (
+    TokenizedChangeTypeClassifier,
+    TokenizedCorpus,
+    pretokenize_corpus,
+    configure_cpu_threads,
+    stratified_split,
+    setup_distributed,
+    broadcast_object,
+    cleanup_distributed,
+    print_telemetry_summary,
+    LENGTH_PERCENTILE
+)
+from model_export import export_for_cpu, DEFAULT_TOLERANCE as EXPORT_TOLERANCE
+from student_model import distill, print_distill_report, DEFAULT_TEMPERATURE as DISTILL_TEMPERATURE
+from embedding_index import build_embedding_index
+from ticket import Ticket, compact_tickets, json_default, plain_value
+from ticket_snapshot import ensure_snapshot, DEFAULT_MAX_AGE_HOURS as SNAPSHOT_MAX_AGE_HOURS
+from instrumentation import instrumentation, estimate_bytes, add_instrumentation_arguments
+from metadata_version import bump_metadata_version
 from config import (
     MODEL_DIR,
     MODEL_PATH,
@@ -25,11 +50,322 @@ from collections import Counter
 import numpy as np
 
 
+# 전처리 로직이 바뀌면 값을 올려 캐시 무효화
+FEATURE_CACHE_VERSION = 1
+FEATURE_CACHE_PATH = f"{MODEL_DIR}/feature_cache.json"
+
+# 사전학습 모델 (--small-model: CPU 학습/스모크 테스트용 경량 모델)
+DEFAULT_MODEL_NAME = 'klue/bert-base'
+SMALL_MODEL_NAME = 'klue/roberta-small'
+
+# 사전 토큰화 캐시 및 토큰 기반 모델 저장 경로 (--pretokenized)
+TOKENIZED_CACHE_DIR = f"{MODEL_DIR}/tokenized"
+TOKEN_MODEL_DIR = f"{MODEL_DIR}/token_model"
+TRAINING_TELEMETRY_PATH = f"{TOKEN_MODEL_DIR}/training_telemetry.jsonl"
+
+# 증류 학생 모델 저장 경로 (--distill, 레이블링 도구 --student와 동일)
+STUDENT_MODEL_DIR = f"{MODEL_DIR}/student_model"
+
+# 티켓 임베딩 인덱스 저장 경로 (--embedding-index, 레이블링 도구 --similar-incidents와 동일)
+EMBEDDING_INDEX_DIR = f"{MODEL_DIR}/embedding_index"
+
+# 이어 학습(--incremental): 모델별 학습 티켓 기록, 부분 코퍼스용 토큰화 캐시, 재학습 샘플 수
+TRAINING_MANIFEST_FILE = 'training_manifest.json'
+INCREMENTAL_TOKENIZED_CACHE_DIR = f"{MODEL_DIR}/tokenized-incremental"
+REPLAY_FACTOR = 4
+MIN_REPLAY_PER_LABEL = 5
+
+# 조기 종료 (--pretokenized): 층화 검증 비율, 무개선 허용 에폭 수
+VALIDATION_RATIO = 0.1
+EARLY_STOPPING_PATIENCE = 2
+
+# 근사 중복 제거 (MinHash/LSH): 서명 길이 = LSH 밴드 수 x 밴드당 행 수
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+SHINGLE_SIZE = 3
+NEAR_DUPLICATE_THRESHOLD = 0.9
+_MINHASH_PRIME = (1 << 61) - 1
+
+# 전처리 worker 프로세스별 전처리기
+_worker_preprocessor = None
+
+
+def ticket_content_hash(ticket: Dict) -> str:
+    """
+    전처리 입력 필드의 내용 해시 (변경되지 않은 티켓은 같은 해시)
+
+    Args:
+        ticket: JIRA 티켓
+
+    Returns:
+        str: sha256 hex digest
+    """
+    # DynamoDB(Decimal)와 스냅샷(JSON 숫자) 티켓이 같은 해시가 되도록 값 정규화
+    content = {field: plain_value(ticket.get(field)) for field in PREPROCESSOR_FIELDS}
+    payload = json.dumps(content, sort_keys=True, ensure_ascii=False, default=json_default)
+    return hashlib.sha256(f"{FEATURE_CACHE_VERSION}:{payload}".encode('utf-8')).hexdigest()
+
+
+def load_feature_cache(cache_path: str) -> Dict[str, str]:
+    """전처리 결과 캐시 로드 ({content_hash: text})"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get('version') == FEATURE_CACHE_VERSION:
+            return cache.get('features', {})
+        print(f"  Feature cache version changed. Rebuilding cache.")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"  Warning: Failed to load feature cache: {e}")
+    return {}
+
+
+def save_feature_cache(cache_path: str, features: Dict[str, str]):
+    """전처리 결과 캐시 저장 (임시 파일에 쓴 후 교체)"""
+    try:
+        os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': FEATURE_CACHE_VERSION, 'features': features}, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        print(f"  Warning: Failed to save feature cache: {e}")
+
+
+def _init_feature_worker():
+    """worker 프로세스 초기화 (전처리기 1회 생성)"""
+    global _worker_preprocessor
+    _worker_preprocessor = JiraTextPreprocessor()
+
+
+def _extract_features_worker(ticket: Dict) -> str:
+    """worker 프로세스에서 텍스트 추출"""
+    return _worker_preprocessor.extract_features(ticket)
+
+
+def extract_features_cached(
+    tickets: List[Dict],
+    preprocessor: JiraTextPreprocessor,
+    cache_path: Optional[str] = FEATURE_CACHE_PATH,
+    workers: int = 1,
+    prune: bool = True
+) -> List[str]:
+    """
+    티켓별 텍스트 추출 (내용 해시 캐시 + 프로세스 풀 병렬 처리)
+
+    Args:
+        tickets: JIRA 티켓 리스트
+        preprocessor: 텍스트 전처리기 (단일 프로세스 처리 시 사용)
+        cache_path: 캐시 파일 경로 (None이면 캐시 사용 안 함)
+        workers: 전처리 프로세스 수
+        prune: True이면 tickets에 없는 캐시 항목 제거 (tickets가 전체 코퍼스일 때만),
+            False이면 기존 캐시에 새 항목만 추가
+
+    Returns:
+        List[str]: 티켓 순서대로 추출된 텍스트
+    """
+    hashes = [ticket_content_hash(ticket) for ticket in tickets]
+    cache = load_feature_cache(cache_path) if cache_path else {}
+
+    missing = [i for i, h in enumerate(hashes) if h not in cache]
+    print(f"  Feature cache: {len(tickets) - len(missing)} hits, {len(missing)} misses")
+
+    if missing:
+        # 전처리기에는 티켓 전체 전달 (Ticket은 일반 dict로, 값은 해시와 같이 정규화)
+        payloads = [plain_value(tickets[i].to_dict() if isinstance(tickets[i], Ticket) else tickets[i]) for i in missing]
+
+        if workers > 1 and len(missing) >= workers * 10:
+            chunksize = max(1, len(payloads) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_feature_worker) as executor:
+                extracted = list(executor.map(_extract_features_worker, payloads, chunksize=chunksize))
+        else:
+            extracted = [preprocessor.extract_features(payload) for payload in payloads]
+
+        for i, text in zip(missing, extracted):
+            cache[hashes[i]] = text or ''
+
+    if cache_path and (prune or missing):
+        # 전체 코퍼스 호출이면 현재 코퍼스에 없는 항목은 제거하여 캐시 크기 유지
+        save_feature_cache(cache_path, {h: cache[h] for h in hashes} if prune else cache)
+
+    return [cache[h] for h in hashes]
+
+
+def labeled_ticket_hashes(tickets: List[Dict], change_types: Dict[str, str]) -> Dict[str, str]:
+    """
+    레이블된 티켓별 내용 + 레이블 해시 (내용이나 레이블이 바뀌면 해시가 바뀜)
+
+    Args:
+        tickets: JIRA 티켓 리스트
+        change_types: {issue_key: changeType} 매핑
+
+    Returns:
+        Dict[str, str]: {issue_key: hash}
+    """
+    hashes = {}
+    for ticket in tickets:
+        issue_key = ticket.get('issue_key')
+        if issue_key in change_types:
+            content_hash = ticket_content_hash(ticket)
+            hashes[issue_key] = hashlib.sha256(f"{content_hash}:{change_types[issue_key]}".encode('utf-8')).hexdigest()
+    return hashes
+
+
+def load_training_manifest(model_dir: str) -> Optional[Dict]:
+    """이전 모델의 학습 manifest 로드 (없거나 읽기 실패 시 None)"""
+    manifest_path = os.path.join(model_dir, TRAINING_MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return None
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Warning: Failed to load training manifest: {e}")
+        return None
+
+
+def plan_incremental_training(
+    tickets: List[Dict],
+    change_types: Dict[str, str],
+    model_dir: str,
+    replay_factor: int = REPLAY_FACTOR,
+    seed: int = 42
+) -> Dict:
+    """
+    이어 학습 대상 선택: 새로 레이블되거나 바뀐 티켓 + 기존 티켓 재학습(replay) 샘플
+
+    이전 모델/manifest가 없거나 레이블 종류가 바뀌면 전체 학습(mode='full')
+
+    Args:
+        tickets: JIRA 티켓 리스트
+        change_types: {issue_key: changeType} 매핑
+        model_dir: 이전 모델 경로
+        replay_factor: 새 티켓 1개당 재학습할 기존 티켓 수
+        seed: replay 샘플링 시드
+
+    Returns:
+        Dict: mode ('full', 'incremental', 'up_to_date'), tickets, new_keys, replay_keys, label_names, previous
+    """
+    hashes = labeled_ticket_hashes(tickets, change_types)
+    manifest = load_training_manifest(model_dir)
+    plan = {'mode': 'full', 'tickets': tickets, 'new_keys': sorted(hashes), 'replay_keys': [],
+            'label_names': None, 'previous': manifest, 'hashes': hashes}
+
+    print(f"\n[Incremental Training]")
+    if manifest is None or not os.path.exists(os.path.join(model_dir, 'label_map.json')):
+        print(f"  No previous model in {model_dir}. Running full training.")
+        return plan
+
+    with open(os.path.join(model_dir, 'label_map.json'), 'r', encoding='utf-8') as f:
+        previous_labels = json.load(f)['label_names']
+    current_labels = sorted(set(change_types[key] for key in hashes))
+    if set(current_labels) != set(previous_labels):
+        print(f"  Label set changed ({previous_labels} → {current_labels}). Running full training.")
+        return plan
+
+    seen = manifest.get('tickets', {})
+    new_keys = sorted(key for key, h in hashes.items() if seen.get(key) != h)
+    old_keys = sorted(key for key in hashes if seen.get(key) == hashes[key])
+
+    print(f"  Previous model: v{manifest.get('version', 0)} ({len(seen)} tickets)")
+    print(f"  New or changed labeled tickets: {len(new_keys)}")
+    if not new_keys:
+        print("  Model is up to date. Skipping training.")
+        plan.update({'mode': 'up_to_date', 'new_keys': [], 'label_names': previous_labels})
+        return plan
+
+    # 레이블별 최소 개수를 보장하며 기존 티켓 무작위 재학습 샘플 구성 (망각 방지)
+    rng = np.random.default_rng(seed)
+    replay_size = min(len(old_keys), replay_factor * len(new_keys))
+    replay = set(rng.choice(old_keys, size=replay_size, replace=False).tolist()) if replay_size else set()
+    old_by_label = {}
+    for key in old_keys:
+        old_by_label.setdefault(change_types[key], []).append(key)
+    for label, keys in old_by_label.items():
+        have = sum(1 for key in replay if change_types[key] == label)
+        missing = [key for key in keys if key not in replay]
+        needed = min(len(missing), MIN_REPLAY_PER_LABEL - have)
+        if needed > 0:
+            replay.update(rng.choice(missing, size=needed, replace=False).tolist())
+
+    selected = set(new_keys) | replay
+    print(f"  Replay sample of previous tickets: {len(replay)}")
+    print(f"  Training tickets: {len(selected)} / {len(hashes)} labeled")
+
+    plan.update({
+        'mode': 'incremental',
+        'tickets': [ticket for ticket in tickets if ticket.get('issue_key') in selected],
+        'new_keys': new_keys,
+        'replay_keys': sorted(replay),
+        'label_names': previous_labels,
+    })
+    return plan
+
+
+def save_training_manifest(model_dir: str, plan: Dict, base_model: str) -> str:
+    """
+    모델 버전별 학습 티켓 기록 저장
+
+    training_manifest.json: 현재 모델이 학습한 전체 티켓 해시 (다음 이어 학습 기준)
+    versions/vNNNN.json: 해당 버전 학습에 사용한 티켓 (새 티켓 / replay)
+
+    Args:
+        model_dir: 모델 저장 경로
+        plan: plan_incremental_training 결과 (mode='full'이면 전체 학습)
+        base_model: 학습 시작 모델 (사전학습 모델 이름 또는 이전 버전)
+
+    Returns:
+        str: 버전 기록 파일 경로
+    """
+    previous = plan.get('previous') or {}
+    version = previous.get('version', 0) + 1
+    hashes = plan['hashes']
+
+    if plan['mode'] == 'incremental':
+        seen = dict(previous.get('tickets', {}))
+        seen.update({key: hashes[key] for key in plan['new_keys']})
+    else:
+        seen = dict(hashes)
+
+    trained_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    versions_dir = os.path.join(model_dir, 'versions')
+    os.makedirs(versions_dir, exist_ok=True)
+    version_path = os.path.join(versions_dir, f"v{version:04d}.json")
+
+    with open(version_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': version,
+            'mode': plan['mode'],
+            'trained_at': trained_at,
+            'base_model': base_model,
+            'new_keys': plan['new_keys'],
+            'replay_keys': plan['replay_keys'],
+        }, f, indent=2, ensure_ascii=False)
+
+    history = list(previous.get('history', []))
+    history.append({
+        'version': version,
+        'mode': plan['mode'],
+        'trained_at': trained_at,
+        'new': len(plan['new_keys']),
+        'replay': len(plan['replay_keys']),
+    })
+    with open(os.path.join(model_dir, TRAINING_MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump({'version': version, 'tickets': seen, 'history': history}, f, indent=2, ensure_ascii=False)
+
+    print(f"  ✓ Model version v{version} ({plan['mode']}): {version_path}")
+    return version_path
+
+
 def prepare_training_data(
     tickets: List[Dict],
     change_types: Dict[str, str],
     preprocessor: JiraTextPreprocessor,
-    incident_history_keys: List[str]
+    incident_history_keys: List[str],
+    workers: int = 1,
+    cache_path: Optional[str] = FEATURE_CACHE_PATH,
+    prune_cache: bool = True
 ) -> tuple[List[str], List[str], List[bool]]:
     """
     학습 데이터 준비
@@ -39,6 +375,9 @@ def prepare_training_data(
         change_types: {issue_key: changeType} 매핑
         preprocessor: 텍스트 전처리기
         incident_history_keys: INCIDENT#HISTORY에서 가져온 incident issue_key 리스트
+        workers: 전처리 프로세스 수
+        cache_path: 전처리 캐시 경로 (None이면 캐시 사용 안 함)
+        prune_cache: 캐시를 이 호출의 티켓으로 정리 (tickets가 코퍼스 일부인 이어 학습에서는 False)
 
     Returns:
         (texts, labels, is_incident): 텍스트, 레이블, incident 여부 리스트
@@ -46,19 +385,19 @@ def prepare_training_data(
     # incident_history_keys를 set으로 변환 (빠른 검색)
     incident_set = set(incident_history_keys)
 
+    # 레이블이 있는 티켓만 사용
+    labeled_tickets = [ticket for ticket in tickets if ticket.get('issue_key') in change_types]
+
+    # 텍스트 추출 및 전처리 (캐시 + 병렬)
+    extracted_texts = extract_features_cached(labeled_tickets, preprocessor, cache_path, workers, prune=prune_cache)
+
     texts = []
     labels = []
     is_incident = []
 
-    for ticket in tickets:
+    for ticket, text in zip(labeled_tickets, extracted_texts):
         issue_key = ticket.get('issue_key')
 
-        # 레이블이 있는 티켓만 사용
-        if issue_key not in change_types:
-            continue
-
-        # 텍스트 추출 및 전처리
-        text = preprocessor.extract_features(ticket)
         if not text:
             continue
 
@@ -72,6 +411,147 @@ def prepare_training_data(
     return texts, labels, is_incident
 
 
+def text_shingles(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """
+    단어 n-gram shingle의 32bit 해시 (단어가 적으면 문자 n-gram 사용)
+
+    Args:
+        text: 전처리된 텍스트
+        size: n-gram 크기
+
+    Returns:
+        np.ndarray: 고유 shingle 해시 (uint64)
+    """
+    words = text.split()
+    if len(words) >= size:
+        grams = {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+    else:
+        grams = {text[i:i + size * 2] for i in range(max(1, len(text) - size * 2 + 1))}
+    return np.fromiter((zlib.crc32(g.encode('utf-8')) for g in grams), dtype=np.uint64, count=len(grams))
+
+
+def minhash_signatures(texts: List[str], num_perm: int = MINHASH_PERMUTATIONS, seed: int = 42) -> np.ndarray:
+    """
+    텍스트별 MinHash 서명 계산
+
+    Args:
+        texts: 텍스트 리스트
+        num_perm: 해시 함수 수
+        seed: 해시 계수 시드
+
+    Returns:
+        np.ndarray: (len(texts), num_perm) 서명
+    """
+    rng = np.random.default_rng(seed)
+    # (a * x + b) mod p, 32bit 해시 x에 대해 uint64 곱셈이 넘치지 않도록 a, b < 2^31
+    a = rng.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, 1 << 31, size=num_perm, dtype=np.uint64)
+
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint64)
+    for i, text in enumerate(texts):
+        shingles = text_shingles(text)
+        hashed = (np.outer(a, shingles) + b[:, None]) % np.uint64(_MINHASH_PRIME)
+        signatures[i] = hashed.min(axis=1)
+    return signatures
+
+
+def near_duplicate_clusters(
+    signatures: np.ndarray,
+    groups: List[str],
+    bands: int = LSH_BANDS,
+    threshold: float = NEAR_DUPLICATE_THRESHOLD
+) -> List[int]:
+    """
+    LSH 밴드 버킷으로 후보 쌍을 찾고 추정 Jaccard 유사도 >= threshold면 같은 클러스터로 묶음
+
+    Args:
+        signatures: MinHash 서명
+        groups: 샘플별 그룹 (같은 그룹끼리만 묶음, 레이블 보존용)
+        bands: LSH 밴드 수
+        threshold: 추정 Jaccard 유사도 임계값
+
+    Returns:
+        List[int]: 샘플별 클러스터 대표 인덱스 (클러스터 내 가장 앞 샘플)
+    """
+    parent = list(range(len(signatures)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    rows = signatures.shape[1] // bands
+    for band in range(bands):
+        buckets = {}
+        band_slice = signatures[:, band * rows:(band + 1) * rows]
+        for i, key in enumerate(map(bytes, band_slice)):
+            buckets.setdefault((groups[i], key), []).append(i)
+
+        for members in buckets.values():
+            first = members[0]
+            for other in members[1:]:
+                root_first, root_other = find(first), find(other)
+                if root_first == root_other:
+                    continue
+                similarity = float(np.mean(signatures[first] == signatures[other]))
+                if similarity >= threshold:
+                    # 앞쪽 인덱스를 대표로 유지
+                    parent[max(root_first, root_other)] = min(root_first, root_other)
+
+    return [find(i) for i in range(len(signatures))]
+
+
+def deduplicate_training_data(
+    texts: List[str],
+    labels: List[str],
+    is_incident: List[bool],
+    threshold: float = NEAR_DUPLICATE_THRESHOLD
+) -> tuple[List[str], List[str], List[bool], np.ndarray]:
+    """
+    레이블별 근사 중복 티켓을 대표 1개로 축소
+
+    대표 샘플의 가중치는 클러스터 크기, incident 여부는 클러스터 내 하나라도 incident면 True
+
+    Args:
+        texts: 텍스트 리스트
+        labels: 레이블 리스트
+        is_incident: incident 여부 리스트
+        threshold: 추정 Jaccard 유사도 임계값
+
+    Returns:
+        (texts, labels, is_incident, weights): 축소된 데이터와 샘플별 가중치
+    """
+    signatures = minhash_signatures(texts)
+    representatives = near_duplicate_clusters(signatures, labels, threshold=threshold)
+
+    cluster_size = Counter(representatives)
+    cluster_incident = {}
+    for i, rep_index in enumerate(representatives):
+        cluster_incident[rep_index] = cluster_incident.get(rep_index, False) or is_incident[i]
+
+    keep = sorted(cluster_size)
+    dedup_texts = [texts[i] for i in keep]
+    dedup_labels = [labels[i] for i in keep]
+    dedup_incident = [cluster_incident[i] for i in keep]
+    weights = np.array([cluster_size[i] for i in keep], dtype=np.float64)
+
+    removed = len(texts) - len(keep)
+    print(f"\n[Near-duplicate Removal] (MinHash {MINHASH_PERMUTATIONS} perms, "
+          f"{LSH_BANDS} bands, Jaccard >= {threshold})")
+    print(f"  Samples: {len(texts)} → {len(keep)} ({removed} removed, "
+          f"{removed / len(texts) * 100 if texts else 0:.1f}% reduction)")
+    print(f"  Clusters with duplicates: {sum(1 for size in cluster_size.values() if size > 1)}, "
+          f"largest: {max(cluster_size.values()) if cluster_size else 0}")
+
+    before_counts = Counter(labels)
+    after_counts = Counter(dedup_labels)
+    for label in sorted(before_counts):
+        print(f"  {label}: {before_counts[label]} → {after_counts[label]}")
+
+    return dedup_texts, dedup_labels, dedup_incident, weights
+
+
 def check_data_quality(texts: List[str], labels: List[str]) -> bool:
     """
     학습 데이터의 품질 검사
@@ -262,6 +742,52 @@ def boost_incident_samples(
     return boosted_texts, boosted_labels, boosted_is_incident
 
 
+def compute_sample_weights(
+    labels: List[str],
+    is_incident: List[bool],
+    boost_factor: int = 3,
+    base_weights: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Incident boost와 클래스 균형을 샘플 추출 가중치로 계산 (복제 샘플을 만들지 않음)
+
+    boost_incident_samples + balance_data와 같은 비율:
+    incident 샘플은 boost_factor배, 불균형 비율이 2 이상이면 클래스별 가중치 합을 최대 클래스에 맞춤
+
+    Args:
+        labels: 레이블 리스트
+        is_incident: incident 여부 리스트
+        boost_factor: incident 샘플 가중치 배수
+        base_weights: 샘플별 기본 가중치 (근사 중복 클러스터 크기, None이면 1.0)
+
+    Returns:
+        np.ndarray: 샘플별 가중치 (복제 없는 샘플 = 1.0)
+    """
+    weights = np.where(np.asarray(is_incident, dtype=bool), float(boost_factor), 1.0)
+    if base_weights is not None:
+        weights = weights * np.asarray(base_weights, dtype=np.float64)
+    labels_array = np.asarray(labels)
+
+    print(f"\n[Sampling Weights]")
+    print(f"  Incident samples: {int(np.sum(is_incident))} (weight {boost_factor}x)")
+
+    class_mass = {label: float(weights[labels_array == label].sum()) for label in set(labels)}
+    max_mass = max(class_mass.values())
+    min_mass = min(class_mass.values())
+    imbalance_ratio = max_mass / min_mass if min_mass > 0 else float('inf')
+    print(f"  Imbalance ratio (after boost): {imbalance_ratio:.2f}:1")
+
+    if imbalance_ratio >= 2.0:
+        for label, mass in class_mass.items():
+            weights[labels_array == label] *= max_mass / mass
+        print(f"  Class weights applied: effective samples per class → {max_mass:.0f}")
+    else:
+        print("  Data is relatively balanced. No class weighting needed.")
+
+    print(f"  Epoch size: {len(labels)} draws (effective weighted size {weights.sum():.0f})")
+    return weights
+
+
 def analyze_incident_risk(
     tickets: List[Dict],
     change_types: Dict[str, str],
@@ -346,12 +872,17 @@ def save_incident_risk_stats(
         # INCIDENT#HISTORY에 issue_key 리스트를 | 구분자로 저장
         incident_history = '|'.join(sorted(all_incident_keys)) if all_incident_keys else ''
 
-        metadata_table.put_item(
-            Item={
-                'dataId': 'INCIDENT#HISTORY',
-                'metadata': incident_history
-            }
-        )
+        with instrumentation.phase('dynamodb_write'):
+            metadata_table.put_item(
+                Item={
+                    'dataId': 'INCIDENT#HISTORY',
+                    'metadata': incident_history
+                }
+            )
+        instrumentation.count('dynamodb', bytes_out=estimate_bytes(incident_history))
+
+        # 레이블링 서비스가 장애 이력/통계를 다시 로드하도록 버전 스탬프 갱신
+        bump_metadata_version(metadata_table)
 
         print(f"\n✓ Incident history saved to DynamoDB")
         print(f"  Table: impactanalysis-metadata")
@@ -374,23 +905,345 @@ def save_incident_risk_stats(
             pass
 
 
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="JIRA Change Type Classifier - Training")
+    add_instrumentation_arguments(parser, MODEL_DIR)
+    parser.add_argument(
+        '--feature-workers',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='텍스트 전처리 프로세스 수'
+    )
+    parser.add_argument(
+        '--no-feature-cache',
+        action='store_true',
+        help=f'전처리 캐시({FEATURE_CACHE_PATH}) 사용 안 함'
+    )
+    parser.add_argument(
+        '--pretokenized',
+        action='store_true',
+        help=f'사전 토큰화 memmap 캐시({TOKENIZED_CACHE_DIR})로 학습 (동일 코퍼스는 토큰화 생략)'
+    )
+    parser.add_argument(
+        '--cpu',
+        action='store_true',
+        help='GPU가 있어도 CPU로 학습 (토큰 모델 경로, 스모크 테스트용)'
+    )
+    parser.add_argument(
+        '--cpu-threads',
+        type=int,
+        default=None,
+        help='CPU 학습 intra-op 스레드 수 (기본값: PyTorch 기본값)'
+    )
+    parser.add_argument(
+        '--interop-threads',
+        type=int,
+        default=None,
+        help='CPU 학습 inter-op 스레드 수 (기본값: PyTorch 기본값)'
+    )
+    parser.add_argument(
+        '--bf16',
+        action='store_true',
+        help='bfloat16 autocast로 학습/추론 (토큰 모델 경로)'
+    )
+    parser.add_argument(
+        '--small-model',
+        action='store_true',
+        help=f'{DEFAULT_MODEL_NAME} 대신 경량 모델({SMALL_MODEL_NAME}) 사용'
+    )
+    parser.add_argument(
+        '--no-export',
+        action='store_true',
+        help='모델 저장 후 int8 양자화/ONNX export 단계 생략 (--pretokenized)'
+    )
+    parser.add_argument(
+        '--export-tolerance',
+        type=float,
+        default=EXPORT_TOLERANCE,
+        help=f'export 모델의 fp32 대비 허용 레이블 불일치 비율 (기본값: {EXPORT_TOLERANCE})'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help=f'이전 모델({TOKEN_MODEL_DIR})에서 새로/바뀐 레이블 티켓 + replay 샘플로 이어 학습 (--pretokenized 필요)'
+    )
+    parser.add_argument(
+        '--replay-factor',
+        type=int,
+        default=REPLAY_FACTOR,
+        help=f'--incremental 시 새 티켓 1개당 재학습할 기존 티켓 수 (기본값: {REPLAY_FACTOR})'
+    )
+    parser.add_argument(
+        '--validation-ratio',
+        type=float,
+        default=VALIDATION_RATIO,
+        help=f'조기 종료용 층화 검증 비율 (0이면 검증 없이 전체 에폭 학습, 기본값: {VALIDATION_RATIO})'
+    )
+    parser.add_argument(
+        '--patience',
+        type=int,
+        default=EARLY_STOPPING_PATIENCE,
+        help=f'검증 macro-F1 무개선 허용 에폭 수 (기본값: {EARLY_STOPPING_PATIENCE})'
+    )
+    parser.add_argument(
+        '--max-epochs',
+        type=int,
+        default=NUM_EPOCHS,
+        help=f'최대 에폭 수 (조기 종료 시 더 적게 실행, 기본값: {NUM_EPOCHS})'
+    )
+    parser.add_argument(
+        '--dedup',
+        action='store_true',
+        help='증강 전 MinHash/LSH 근사 중복 티켓을 레이블별 대표 1개로 축소'
+    )
+    parser.add_argument(
+        '--dedup-threshold',
+        type=float,
+        default=NEAR_DUPLICATE_THRESHOLD,
+        help=f'근사 중복 판정 Jaccard 유사도 (기본값: {NEAR_DUPLICATE_THRESHOLD})'
+    )
+    parser.add_argument(
+        '--max-length',
+        type=int,
+        default=None,
+        help='최대 토큰 길이 (--pretokenized, 기본값: 코퍼스 길이 백분위로 결정)'
+    )
+    parser.add_argument(
+        '--length-percentile',
+        type=float,
+        default=LENGTH_PERCENTILE,
+        help=f'--max-length 미지정 시 사용할 토큰 길이 백분위 (기본값: {LENGTH_PERCENTILE:g})'
+    )
+    parser.add_argument(
+        '--no-length-bucketing',
+        action='store_true',
+        help='길이 버킷 배치/dynamic padding 끄고 max_length 고정 padding으로 학습 (--pretokenized)'
+    )
+    parser.add_argument(
+        '--distill',
+        action='store_true',
+        help=f'학습된 BERT의 soft label로 해시 n-gram 학생 모델 증류 ({STUDENT_MODEL_DIR}, --pretokenized 필요)'
+    )
+    parser.add_argument(
+        '--distill-temperature',
+        type=float,
+        default=DISTILL_TEMPERATURE,
+        help=f'--distill soft label 온도 (기본값: {DISTILL_TEMPERATURE})'
+    )
+    parser.add_argument(
+        '--embedding-index',
+        action='store_true',
+        help=f'레이블된 전체 티켓의 임베딩 인덱스 생성 ({EMBEDDING_INDEX_DIR}, --pretokenized 필요)'
+    )
+    parser.add_argument(
+        '--ivf-lists',
+        type=int,
+        default=None,
+        help='임베딩 인덱스 IVF 분할 수 (0이면 전수 비교만, 기본값: 행 수 기준 자동)'
+    )
+    parser.add_argument(
+        '--snapshot',
+        action='store_true',
+        help='DynamoDB 대신 컬럼형 티켓 스냅샷 사용 (없거나 오래되었으면 새로 생성)'
+    )
+    parser.add_argument(
+        '--snapshot-max-age',
+        type=float,
+        default=SNAPSHOT_MAX_AGE_HOURS,
+        help=f'--snapshot 재사용 허용 경과 시간 (시간, 기본값: {SNAPSHOT_MAX_AGE_HOURS:g})'
+    )
+    parser.add_argument('--refresh-snapshot', action='store_true', help='--snapshot 시 항상 새로 생성')
+    parser.add_argument(
+        '--compact-tickets',
+        action='store_true',
+        help='티켓을 __slots__ 객체 + 압축 댓글로 보관하여 메모리 절감'
+    )
+    args = parser.parse_args()
+    if args.incremental and not args.pretokenized:
+        parser.error('--incremental requires --pretokenized')
+    if args.distill and not args.pretokenized:
+        parser.error('--distill requires --pretokenized')
+    if args.embedding_index and not args.pretokenized:
+        parser.error('--embedding-index requires --pretokenized')
+    return args
+
+
+def select_training_device(args) -> str:
+    """
+    학습 장치 선택 (GPU가 있으면 GPU 기본, 없거나 --cpu면 CPU 스레드 설정)
+
+    CPU 학습과 torchrun 분산 학습은 토큰 기반 모델(--pretokenized) 경로로 수행.
+    분산 실행이면 args.distributed에 rank 정보를 저장 (아니면 None)
+
+    Args:
+        args: parse_args() 결과
+
+    Returns:
+        str: 'cuda', 'cuda:<local_rank>' 또는 'cpu'
+    """
+    import torch
+    use_cuda = torch.cuda.is_available() and not args.cpu
+    args.distributed = setup_distributed(use_cuda)
+
+    if args.distributed:
+        ctx = args.distributed
+        print(f"✓ Distributed training: rank {ctx['rank']}/{ctx['world_size']} "
+              f"(backend {ctx['backend']}, device {ctx['device']})")
+        if not args.pretokenized:
+            if ctx['rank'] == 0:
+                print("  Distributed training uses the pre-tokenized token model path (--pretokenized enabled)")
+            args.pretokenized = True
+        instrumentation.set('distributed', ctx)
+
+    if use_cuda:
+        device_index = args.distributed['local_rank'] if args.distributed else 0
+        gpu_name = torch.cuda.get_device_name(device_index)
+        gpu_count = torch.cuda.device_count()
+        print(f"✓ Using GPU: {gpu_name}")
+        print(f"  Available GPUs: {gpu_count}")
+        print(f"  CUDA Version: {torch.version.cuda}")
+        instrumentation.set('device', f"cuda ({gpu_name})")
+        return args.distributed['device'] if args.distributed else 'cuda'
+
+    threads = configure_cpu_threads(args.cpu_threads, args.interop_threads)
+    print(f"✓ Using CPU ({'forced by --cpu' if args.cpu else 'GPU not available'})")
+    print(f"  Threads: intra-op {threads['intra_op']}, inter-op {threads['inter_op']}")
+    print(f"  bf16 autocast: {'on' if args.bf16 else 'off'}")
+    if not args.pretokenized:
+        print("  CPU training uses the pre-tokenized token model path (--pretokenized enabled)")
+        args.pretokenized = True
+    instrumentation.set('device', 'cpu')
+    instrumentation.set('cpu_threads', threads)
+    return 'cpu'
+
+
+def build_token_classifier(args, model_name: str, device: str) -> TokenizedChangeTypeClassifier:
+    """명령행 옵션으로 토큰 기반 분류기 생성 (분산 학습 시 모든 rank가 같은 설정 사용)"""
+    return TokenizedChangeTypeClassifier(
+        model_name=model_name,
+        batch_size=BATCH_SIZE,
+        learning_rate=LEARNING_RATE,
+        num_epochs=args.max_epochs,
+        use_class_weight=True,
+        device=device,
+        bucket_by_length=not args.no_length_bucketing,
+        bf16=args.bf16
+    )
+
+
+def run_training_worker(args, device: str):
+    """
+    분산 학습 rank 1 이상: rank 0이 데이터 준비/토큰화를 마칠 때까지 대기 후 같은 코퍼스로 학습
+
+    모델 저장, DynamoDB 기록은 rank 0만 수행
+    """
+    rank = args.distributed['rank']
+    print(f"[rank {rank}] Waiting for rank 0 to prepare the tokenized corpus...")
+    payload = broadcast_object()
+    if payload is None:
+        print(f"[rank {rank}] Nothing to train.")
+        return
+
+    corpus = TokenizedCorpus(payload['cache_dir'])
+    model = build_token_classifier(args, payload['model_name'], device)
+    with instrumentation.phase('training'):
+        summary = model.train(corpus, **payload['train_kwargs'])
+    instrumentation.set('samples_per_sec', round(summary['samples_per_sec'], 2))
+    print(f"[rank {rank}] Training finished ({summary['epochs_run']} epochs)")
+
+
+def run_incident_analysis(
+    tickets: List[Dict],
+    change_types: Dict[str, str],
+    existing_incident_keys: List[str],
+    snapshot=None
+) -> str:
+    """
+    변경 유형별 장애 발생 비율 분석 및 저장 (학습 8단계)
+
+    Args:
+        snapshot: TicketSnapshot (지정 시 컬럼 group-by로 집계)
+
+    Returns:
+        str: 통계 파일 경로
+    """
+    print("\n[8/8] Analyzing incident risk by change type...")
+    with instrumentation.phase('incident_analysis'):
+        if snapshot is not None:
+            incident_stats, incident_issue_keys = snapshot.incident_rate_by_change_type(existing_incident_keys)
+        else:
+            incident_stats, incident_issue_keys = analyze_incident_risk(tickets, change_types, existing_incident_keys)
+
+    print("\nIncident Risk by Change Type:")
+    for change_type, data in sorted(incident_stats.items()):
+        print(f"  {change_type}: {data['incidents']}/{data['total']} "
+              f"({data['incident_rate']*100:.1f}% incident rate)")
+
+    print(f"\nTotal incidents found: {len(incident_issue_keys)}")
+    if incident_issue_keys:
+        print(f"Incident issue keys: {', '.join(incident_issue_keys[:5])}")
+        if len(incident_issue_keys) > 5:
+            print(f"  ... and {len(incident_issue_keys) - 5} more")
+
+    # 통계 저장 (DynamoDB + 파일)
+    incident_risk_path = f"{MODEL_DIR}/incident_risk_stats.json"
+    save_incident_risk_stats(incident_stats, incident_issue_keys, existing_incident_keys, incident_risk_path)
+    return incident_risk_path
+
+
 def main():
     """메인 학습 프로세스"""
+    args = parse_args()
+    instrumentation.configure('train', args.report_dir, profile=args.profile)
+
+    # torchrun 분산 실행 시 rank별 리포트
+    rank = int(os.environ.get('RANK', '0'))
+    if int(os.environ.get('WORLD_SIZE', '1')) > 1:
+        instrumentation.configure(f"train-rank{rank}", args.report_dir, profile=args.profile)
 
+    try:
+        run(args)
+    finally:
+        cleanup_distributed()
+        print_telemetry_summary(instrumentation.extra.get('training_telemetry'))
+        instrumentation.print_summary()
+        instrumentation.write_report()
+
+
+def run(args):
+    """학습 단계 실행"""
     print("=" * 80)
     print("JIRA Change Type Classifier - Training")
     print("=" * 80)
 
+    # 학습 장치 확인 (CPU/분산 학습이면 토큰 모델 경로 사용)
+    device = select_training_device(args)
+    if args.distributed and args.distributed['rank'] != 0:
+        run_training_worker(args, device)
+        return
+
     # 1. 데이터 로딩
     print("\n[1/8] Loading data from DynamoDB and S3...")
-    loader = JiraDataLoader()
+    loader = ProjectedJiraDataLoader()
+
+    # 컬럼형 스냅샷 (당일 스냅샷이 있으면 DynamoDB 재스캔 생략)
+    snapshot = None
+    if args.snapshot:
+        with instrumentation.phase('snapshot'):
+            snapshot = ensure_snapshot(loader, max_age_hours=args.snapshot_max_age, refresh=args.refresh_snapshot)
+        instrumentation.set('snapshot', snapshot.manifest['version'])
 
     # 기존 INCIDENT#HISTORY 로드 (학습 참고자료)
+    # 스냅샷 실행에서도 항상 DynamoDB에서 읽음 (8단계에서 병합 후 다시 저장하므로
+    # 스냅샷 시점 목록을 쓰면 그 이후의 수정이 되돌려짐)
     print("\nLoading existing incident history...")
-    existing_incident_keys = loader.get_incident_history()
+    with instrumentation.phase('metadata_load'):
+        existing_incident_keys = loader.get_incident_history()
 
     # 레이블된 데이터 가져오기
-    change_types = loader.get_existing_change_types()
+    with instrumentation.phase('ticket_fetch'):
+        change_types = snapshot.change_types() if snapshot else loader.get_existing_change_types()
     if not change_types:
         print("Error: No labeled data found in DynamoDB.")
         print("Please add 'changeType' field to some incidents first.")
@@ -406,14 +1259,55 @@ def main():
 
     # 해당 issue_key의 티켓 데이터 가져오기 (incident 정보 포함)
     print("\nLoading tickets with incident information...")
-    tickets = loader.get_tickets_from_dynamodb(list(all_issue_keys))
+    with instrumentation.phase('ticket_fetch'):
+        if snapshot:
+            # 전처리 입력 컬럼만 읽음
+            tickets = snapshot.tickets(PREPROCESSOR_FIELDS, issue_keys=all_issue_keys)
+        else:
+            # 전처리 입력 필드만 조회 (스냅샷과 같은 필드)
+            tickets = loader.get_tickets_from_dynamodb(list(all_issue_keys), attributes=PREPROCESSOR_FIELDS)
+    # 코퍼스 순서 고정 (set 순서/batch_get_item 응답 순서와 무관하게 같은 코퍼스는 같은 fingerprint)
+    tickets.sort(key=lambda ticket: ticket.get('issue_key') or '')
+    if args.compact_tickets:
+        # __slots__ 티켓 + 압축 댓글 (전처리/해시 시에만 디코딩)
+        tickets = compact_tickets(tickets)
+    instrumentation.set('tickets', len(tickets))
 
     print(f"Loaded {len(tickets)} tickets")
 
+    # 이어 학습 대상 선택 (새로/바뀐 티켓 + replay 샘플), 이전 모델 없으면 전체 학습
+    plan = None
+    training_tickets = tickets
+    if args.incremental or args.pretokenized:
+        with instrumentation.phase('incremental_selection'):
+            if args.incremental:
+                plan = plan_incremental_training(tickets, change_types, TOKEN_MODEL_DIR, args.replay_factor)
+            else:
+                plan = {'mode': 'full', 'tickets': tickets, 'replay_keys': [], 'label_names': None,
+                        'previous': load_training_manifest(TOKEN_MODEL_DIR),
+                        'hashes': labeled_ticket_hashes(tickets, change_types)}
+                plan['new_keys'] = sorted(plan['hashes'])
+        instrumentation.set('training_mode', plan['mode'])
+
+        if plan['mode'] == 'up_to_date':
+            broadcast_object(None)  # 분산 학습 대기 중인 rank 종료
+            incident_risk_path = run_incident_analysis(tickets, change_types, existing_incident_keys, snapshot)
+            print(f"\nNo new labels since the last model. Incident risk stats saved: {incident_risk_path}")
+            return
+        training_tickets = plan['tickets']
+
     # 2. 전처리
     print("\n[2/8] Preprocessing text...")
     preprocessor = JiraTextPreprocessor()
-    texts, labels, is_incident = prepare_training_data(tickets, change_types, preprocessor, existing_incident_keys)
+    with instrumentation.phase('preprocessing'):
+        texts, labels, is_incident = prepare_training_data(
+            training_tickets, change_types, preprocessor, existing_incident_keys,
+            workers=args.feature_workers,
+            cache_path=None if args.no_feature_cache else FEATURE_CACHE_PATH,
+            # 이어 학습(새 티켓 + replay)이면 나머지 코퍼스의 캐시 항목을 유지
+            prune_cache=training_tickets is tickets
+        )
+    instrumentation.set('training_samples', len(texts))
 
     print(f"Prepared {len(texts)} training samples")
     print(f"  - Incident samples: {sum(is_incident)}")
@@ -424,83 +1318,193 @@ def main():
     if not check_data_quality(texts, labels):
         sys.exit(1)
 
-    # 4. Incident 샘플 증강 (장애 이력 활용)
-    print("\n[4/8] Boosting incident samples...")
-    texts, labels, is_incident = boost_incident_samples(texts, labels, is_incident, boost_factor=3)
+    # 근사 중복 제거 (증강 전에 수행, 대표 샘플은 클러스터 크기만큼 가중치)
+    cluster_weights = None
+    if args.dedup:
+        with instrumentation.phase('deduplication'):
+            texts, labels, is_incident, cluster_weights = deduplicate_training_data(
+                texts, labels, is_incident, threshold=args.dedup_threshold
+            )
+        instrumentation.set('deduplicated_samples', len(texts))
+        if not args.pretokenized:
+            print("  Note: cluster weights are only applied with --pretokenized (weighted sampling)")
 
-    # 5. 불균형 데이터 처리 (간단한 증강만)
-    print("\n[5/8] Balancing imbalanced data...")
-    texts, labels = balance_data(texts, labels, preprocessor, strategy='auto')
+    # 4. Incident 샘플 증강 (장애 이력 활용)
+    sample_weights = None
+    if args.pretokenized:
+        # 4-5. 복제 대신 가중치 추출 + 추출별 변형 (에폭 길이/메모리는 실제 코퍼스 크기)
+        print("\n[4-5/8] Computing incident boost / class balance sampling weights...")
+        with instrumentation.phase('sampling_weights'):
+            sample_weights = compute_sample_weights(
+                labels, is_incident, boost_factor=3, base_weights=cluster_weights
+            )
+    else:
+        print("\n[4/8] Boosting incident samples...")
+        with instrumentation.phase('boosting'):
+            texts, labels, is_incident = boost_incident_samples(texts, labels, is_incident, boost_factor=3)
+
+        # 5. 불균형 데이터 처리 (간단한 증강만)
+        print("\n[5/8] Balancing imbalanced data...")
+        with instrumentation.phase('balancing'):
+            texts, labels = balance_data(texts, labels, preprocessor, strategy='auto')
+    instrumentation.set('balanced_samples', len(texts))
 
     # 6. PyTorch BERT 모델 학습 (클래스 가중치 적용)
     print("\n[6/8] Training PyTorch BERT model with class weights...")
 
-    # GPU 사용 확인
-    import torch
-    if not torch.cuda.is_available():
-        print("❌ Error: GPU not available!")
-        print("   This script requires GPU for training.")
-        print("   Please ensure:")
-        print("   - CUDA is properly installed")
-        print("   - PyTorch is installed with CUDA support")
-        print("   - GPU device is available")
-        sys.exit(1)
-
-    # GPU 정보 출력
-    gpu_name = torch.cuda.get_device_name(0)
-    gpu_count = torch.cuda.device_count()
-    print(f"✓ Using GPU: {gpu_name}")
-    print(f"  Available GPUs: {gpu_count}")
-    print(f"  CUDA Version: {torch.version.cuda}")
-
-    model_name = 'klue/bert-base'
+    model_name = SMALL_MODEL_NAME if args.small_model else DEFAULT_MODEL_NAME
+    print(f"  Device: {device}")
     print(f"  Model: {model_name}")
-
-    model = ChangeTypeClassifier(
-        model_name=model_name,
-        batch_size=BATCH_SIZE,
-        learning_rate=LEARNING_RATE,
-        num_epochs=NUM_EPOCHS,
-        use_class_weight=True
-    )
-    model.train(texts, labels)
+    instrumentation.set('model_name', model_name)
+
+    if args.pretokenized:
+        # 토큰화 결과를 memmap으로 저장/재사용하고 배치 단위로 읽어 학습
+        with instrumentation.phase('tokenization'):
+            incremental = plan['mode'] == 'incremental'
+            corpus = pretokenize_corpus(
+                texts, labels, model_name,
+                INCREMENTAL_TOKENIZED_CACHE_DIR if incremental else TOKENIZED_CACHE_DIR,
+                max_length=args.max_length,
+                length_percentile=args.length_percentile,
+                label_names=plan['label_names']
+            )
+
+        # 레이블 비율을 유지한 검증 분할 (에폭별 macro-F1, 조기 종료)
+        train_indices, validation_indices = stratified_split(corpus.label_ids, args.validation_ratio)
+        print(f"  Train/validation split: {len(train_indices)}/{len(validation_indices)}")
+
+        train_kwargs = {
+            'indices': train_indices,
+            'sample_weights': sample_weights,
+            'init_model_dir': TOKEN_MODEL_DIR if incremental else None,
+            'validation_indices': validation_indices,
+            'patience': args.patience,
+            'telemetry_path': TRAINING_TELEMETRY_PATH,
+        }
+        # 분산 학습: 나머지 rank에 코퍼스 위치와 학습 입력 전달 (다중 노드는 공유 파일시스템 필요)
+        broadcast_object({'cache_dir': corpus.cache_dir, 'model_name': model_name, 'train_kwargs': train_kwargs})
+
+        model = build_token_classifier(args, model_name, device)
+        with instrumentation.phase('training'):
+            training_summary = model.train(corpus, **train_kwargs)
+
+        instrumentation.set('max_length', training_summary['max_length'])
+        instrumentation.set('padding_ratio', round(training_summary['padding_ratio'], 4))
+        instrumentation.set('static_padding_ratio', round(training_summary['static_padding_ratio'], 4))
+        instrumentation.set('samples_per_sec', round(training_summary['samples_per_sec'], 2))
+        instrumentation.set('perturbed_draws', training_summary['perturbed_draws'])
+        instrumentation.set('epochs_run', training_summary['epochs_run'])
+        instrumentation.set('training_telemetry', training_summary['telemetry'])
+        if 'best_epoch' in training_summary:
+            instrumentation.set('best_epoch', training_summary['best_epoch'])
+            instrumentation.set('best_val_macro_f1', round(training_summary['best_val_macro_f1'], 4))
+            instrumentation.set('seconds_saved', round(training_summary['seconds_saved'], 1))
+    else:
+        model = ChangeTypeClassifier(
+            model_name=model_name,
+            batch_size=BATCH_SIZE,
+            learning_rate=LEARNING_RATE,
+            num_epochs=NUM_EPOCHS,
+            use_class_weight=True
+        )
+        with instrumentation.phase('training'):
+            model.train(texts, labels)
 
     # 7. 모델 저장
     print("\n[7/8] Saving model...")
     os.makedirs(MODEL_DIR, exist_ok=True)
 
-    # MODEL_PATH에서 확장자 제거하고 vectorizer와 classifier 파일명 생성
-    base_path = MODEL_PATH.rsplit('.', 1)[0]
-    vectorizer_save_path = VECTORIZER_PATH if VECTORIZER_PATH else f"{base_path}_vectorizer.pkl"
-    classifier_save_path = f"{base_path}_classifier.pkl"
-
-    model.save(vectorizer_save_path, classifier_save_path)
+    if args.pretokenized:
+        with instrumentation.phase('model_save'):
+            model.save(TOKEN_MODEL_DIR)
+            previous_version = (plan.get('previous') or {}).get('version')
+            base_model = f"v{previous_version}" if incremental and previous_version else model_name
+            save_training_manifest(TOKEN_MODEL_DIR, plan, base_model)
+
+        if not args.no_export:
+            # CPU 예측용 int8 양자화 모델 + ONNX 그래프, 검증 분할로 fp32 대비 일치율/지연 비교
+            print("\n[7b/8] Exporting int8 / ONNX models for CPU inference...")
+            export_texts = [texts[i] for i in validation_indices] or texts
+            try:
+                with instrumentation.phase('export'):
+                    export_report = export_for_cpu(
+                        model, TOKEN_MODEL_DIR, export_texts,
+                        tolerance=args.export_tolerance,
+                        threads=args.cpu_threads
+                    )
+                instrumentation.set('export', {
+                    name: {k: v for k, v in result.items() if k != 'path'}
+                    for name, result in export_report.items() if isinstance(result, dict)
+                })
+            except Exception as e:
+                # fp32 모델은 이미 저장됨: export 실패로 이후 단계(증류, 인덱스, 장애 통계)를 건너뛰지 않음
+                print(f"  Warning: CPU export failed, continuing with the fp32 model: {e}")
+                instrumentation.set('export', {'error': str(e)})
+
+        if args.distill:
+            # 레이블링 도구의 1차 분류기: 신뢰도가 낮은 티켓만 BERT로 위임
+            print("\n[7c/8] Distilling hashed n-gram student from BERT soft labels...")
+            with instrumentation.phase('distillation'):
+                _, distill_report = distill(
+                    model, texts, corpus.label_ids, train_indices, validation_indices,
+                    temperature=args.distill_temperature,
+                    model_dir=STUDENT_MODEL_DIR
+                )
+            print_distill_report(distill_report)
+            print(f"  Student model saved: {STUDENT_MODEL_DIR}")
+            instrumentation.set('distillation', {
+                k: v for k, v in distill_report.items() if k != 'epoch_losses'
+            })
+
+        if args.embedding_index:
+            # 이어 학습이어도 가중치가 바뀌므로 레이블된 전체 티켓을 다시 인코딩 (전처리는 캐시 적중)
+            print("\n[7d/8] Building ticket embedding index...")
+            incident_set = set(existing_incident_keys)
+            labeled_tickets = [ticket for ticket in tickets if ticket.get('issue_key') in change_types]
+            with instrumentation.phase('embedding_index'):
+                index_texts = extract_features_cached(
+                    labeled_tickets, preprocessor,
+                    cache_path=None if args.no_feature_cache else FEATURE_CACHE_PATH,
+                    workers=args.feature_workers
+                )
+                indexed = [(ticket, text) for ticket, text in zip(labeled_tickets, index_texts) if text]
+                index, index_summary = build_embedding_index(
+                    model,
+                    [text for _, text in indexed],
+                    [
+                        {
+                            'issue_key': ticket['issue_key'],
+                            'change_type': change_types[ticket['issue_key']],
+                            'is_incident': ticket['issue_key'] in incident_set,
+                        }
+                        for ticket, _ in indexed
+                    ],
+                    ivf_lists=args.ivf_lists
+                )
+                index.save(EMBEDDING_INDEX_DIR)
+            print(f"  {index_summary['rows']} tickets ({index_summary['encoded']} unique texts encoded, "
+                  f"dim {index_summary['dim']}, IVF lists: {index_summary['ivf_lists'] or 'none'}) "
+                  f"-> {EMBEDDING_INDEX_DIR}")
+            instrumentation.set('embedding_index', index_summary)
+    else:
+        # MODEL_PATH에서 확장자 제거하고 vectorizer와 classifier 파일명 생성
+        base_path = MODEL_PATH.rsplit('.', 1)[0]
+        vectorizer_save_path = VECTORIZER_PATH if VECTORIZER_PATH else f"{base_path}_vectorizer.pkl"
+        classifier_save_path = f"{base_path}_classifier.pkl"
+
+        with instrumentation.phase('model_save'):
+            model.save(vectorizer_save_path, classifier_save_path)
 
     # 8. 변경 유형별 장애 발생 비율 분석 및 저장
-    print("\n[8/8] Analyzing incident risk by change type...")
-    incident_stats, incident_issue_keys = analyze_incident_risk(tickets, change_types, existing_incident_keys)
-
-    print("\nIncident Risk by Change Type:")
-    for change_type, data in sorted(incident_stats.items()):
-        print(f"  {change_type}: {data['incidents']}/{data['total']} "
-              f"({data['incident_rate']*100:.1f}% incident rate)")
-
-    print(f"\nTotal incidents found: {len(incident_issue_keys)}")
-    if incident_issue_keys:
-        print(f"Incident issue keys: {', '.join(incident_issue_keys[:5])}")
-        if len(incident_issue_keys) > 5:
-            print(f"  ... and {len(incident_issue_keys) - 5} more")
-
-    # 통계 저장 (DynamoDB + 파일)
-    incident_risk_path = f"{MODEL_DIR}/incident_risk_stats.json"
-    save_incident_risk_stats(incident_stats, incident_issue_keys, existing_incident_keys, incident_risk_path)
+    incident_risk_path = run_incident_analysis(tickets, change_types, existing_incident_keys, snapshot)
 
     print("\n" + "=" * 80)
     print("Training completed successfully!")
     print("=" * 80)
     print("\nNext steps:")
     print("  1. Review the model performance above")
-    print("  2. Run predict.py to classify unlabeled tickets")
+    print("  2. Run predict.py to classify unlabeled tickets"
+          + (" (CPU: use the int8/ONNX export in token_model/)" if args.pretokenized and not args.no_export else ""))
     print("  3. Update predictions in DynamoDB")
     print(f"  4. Incident risk stats saved: {incident_risk_path}")
 
@@ -0,0 +1,181 @@
+"""
+실행 계측 유틸리티
+label/train/sync 스크립트 공용: 단계별 타이머, 외부 서비스 호출/바이트 카운터,
+--profile 옵션 시 cProfile 출력, JSON 실행 리포트
+"""
+import os
+import sys
+import json
+import time
+import cProfile
+import pstats
+import platform
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional
+
+
+def estimate_bytes(obj) -> int:
+    """DynamoDB 아이템 등 응답/요청 객체의 대략적인 크기 (JSON 직렬화 기준)"""
+    if obj is None:
+        return 0
+    if isinstance(obj, (bytes, bytearray)):
+        return len(obj)
+    if isinstance(obj, str):
+        return len(obj.encode('utf-8'))
+    try:
+        return len(json.dumps(obj, ensure_ascii=False, default=str).encode('utf-8'))
+    except (TypeError, ValueError):
+        return 0
+
+
+class RunInstrumentation:
+    """스크립트 1회 실행에 대한 계측 정보 수집기"""
+
+    def __init__(self):
+        self.run_name = os.path.splitext(os.path.basename(sys.argv[0] or 'run'))[0]
+        self.output_dir = '.'
+        self.started_at = datetime.now()
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.services = {}
+        self.extra = {}
+        self.profiler = None
+        self._phase_stack = []
+
+    def configure(self, run_name: str, output_dir: str, profile: bool = False):
+        """
+        실행 이름과 리포트 저장 위치 설정
+
+        Args:
+            run_name: 리포트 파일명 접두어 (예: 'label-data')
+            output_dir: 리포트 저장 디렉토리 (산출물과 같은 위치)
+            profile: True이면 cProfile 시작
+        """
+        self.run_name = run_name
+        self.output_dir = output_dir
+        if profile and self.profiler is None:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        단계별 소요 시간 측정 (중첩 시 'parent/child' 이름으로 기록)
+
+        Args:
+            name: 단계 이름 (metadata_load, ticket_fetch, preprocessing, scoring, dynamodb_write, ...)
+        """
+        full_name = '/'.join(self._phase_stack + [name])
+        self._phase_stack.append(name)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._phase_stack.pop()
+            stats = self.phases.setdefault(full_name, {'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0})
+            stats['calls'] += 1
+            stats['seconds'] += elapsed
+            stats['max_seconds'] = max(stats['max_seconds'], elapsed)
+
+    def count(self, service: str, calls: int = 1, bytes_in: int = 0, bytes_out: int = 0):
+        """
+        외부 서비스 호출 횟수와 송수신 바이트 누적
+
+        Args:
+            service: 'dynamodb', 'jira', 's3' 등
+            calls: 호출 횟수
+            bytes_in: 수신 바이트 (응답)
+            bytes_out: 송신 바이트 (요청)
+        """
+        stats = self.services.setdefault(service, {'calls': 0, 'bytes_in': 0, 'bytes_out': 0})
+        stats['calls'] += calls
+        stats['bytes_in'] += bytes_in
+        stats['bytes_out'] += bytes_out
+
+    def set(self, key: str, value):
+        """리포트에 추가 정보 기록 (티켓 수, 샘플 수 등)"""
+        self.extra[key] = value
+
+    def report(self) -> Dict:
+        """JSON 실행 리포트 생성"""
+        total = time.perf_counter() - self.started
+        return {
+            'run': self.run_name,
+            'started_at': self.started_at.strftime('%Y-%m-%d %H:%M:%S'),
+            'total_seconds': round(total, 3),
+            'python': platform.python_version(),
+            'argv': sys.argv[1:],
+            'phases': {
+                name: {
+                    'calls': stats['calls'],
+                    'seconds': round(stats['seconds'], 3),
+                    'max_seconds': round(stats['max_seconds'], 3),
+                    'share': round(stats['seconds'] / total, 4) if total > 0 else 0.0
+                }
+                for name, stats in sorted(self.phases.items(), key=lambda x: -x[1]['seconds'])
+            },
+            'services': self.services,
+            'extra': self.extra,
+        }
+
+    def write_report(self) -> Optional[str]:
+        """
+        JSON 실행 리포트 저장 (--profile 시 cProfile 결과도 저장)
+
+        Returns:
+            str: 리포트 경로 (저장 실패 시 None)
+        """
+        timestamp = self.started_at.strftime('%Y%m%d-%H%M%S')
+        base_path = os.path.join(self.output_dir, f"{self.run_name}-{timestamp}")
+
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+
+            if self.profiler is not None:
+                self.profiler.disable()
+                # .prof는 snakeviz/flameprof 등으로 flamegraph 변환 가능
+                self.profiler.dump_stats(f"{base_path}.prof")
+                with open(f"{base_path}.profile.txt", 'w', encoding='utf-8') as f:
+                    stats = pstats.Stats(self.profiler, stream=f)
+                    stats.sort_stats('cumulative').print_stats(50)
+                print(f"  Profile: {base_path}.prof")
+
+            report_path = f"{base_path}.run_report.json"
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(self.report(), f, indent=2, ensure_ascii=False)
+            print(f"  Run report: {report_path}")
+            return report_path
+
+        except Exception as e:
+            print(f"Warning: Failed to write run report: {e}")
+            return None
+
+    def print_summary(self, top_n: int = 10):
+        """단계별 소요 시간 요약 출력"""
+        report = self.report()
+        print(f"\n[Run Timing] total {report['total_seconds']:.1f}s")
+        for name, stats in list(report['phases'].items())[:top_n]:
+            print(f"  {name:<40} {stats['seconds']:>9.2f}s  ({stats['share'] * 100:5.1f}%, {stats['calls']} calls)")
+        for service, stats in sorted(report['services'].items()):
+            print(f"  {service:<40} {stats['calls']:>9} calls  "
+                  f"in {stats['bytes_in'] / 1024:,.1f} KB / out {stats['bytes_out'] / 1024:,.1f} KB")
+
+
+def add_instrumentation_arguments(parser, default_report_dir: str):
+    """--profile / --report-dir 공통 옵션 추가"""
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='cProfile 결과(.prof, .profile.txt)를 실행 리포트와 함께 저장'
+    )
+    parser.add_argument(
+        '--report-dir',
+        default=default_report_dir,
+        help=f'JSON 실행 리포트 저장 디렉토리 (기본값: {default_report_dir})'
+    )
+
+
+# 스크립트 전역에서 공유하는 계측 인스턴스
+instrumentation = RunInstrumentation()
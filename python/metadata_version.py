@@ -0,0 +1,36 @@
+"""
+메타데이터 버전 스탬프 (레이블링 서비스 재로드 기준)
+레이블링 서비스는 impactanalysis-metadata의 METADATA#VERSION 값이 바뀌면 메타데이터와 장애 통계를
+다시 로드합니다. 서비스가 읽는 메타데이터(LABEL_KEYWORDS#*, 위험 점수 항목, INCIDENT#HISTORY)를
+수정한 쪽이 갱신해야 합니다.
+
+갱신하는 곳:
+    - 학습 스크립트: INCIDENT#HISTORY 저장 후
+    - 레이블링 스크립트 --recompute: 메타데이터 변경 반영 후
+    - 레이블링 스크립트 --bump-metadata-version: 콘솔 등에서 직접 수정한 경우
+"""
+from datetime import datetime
+
+import pytz
+
+from instrumentation import instrumentation
+
+METADATA_VERSION_ID = 'METADATA#VERSION'
+
+
+def bump_metadata_version(metadata_table) -> str:
+    """
+    메타데이터 버전 스탬프를 현재 시각(KST)으로 갱신
+
+    Args:
+        metadata_table: impactanalysis-metadata DynamoDB Table
+
+    Returns:
+        str: 새 버전 (%Y%m%d%H%M%S%f)
+    """
+    version = datetime.now(pytz.timezone('Asia/Seoul')).strftime('%Y%m%d%H%M%S%f')
+    with instrumentation.phase('dynamodb_write'):
+        metadata_table.put_item(Item={'dataId': METADATA_VERSION_ID, 'metadata': version})
+    instrumentation.count('dynamodb', bytes_out=len(version))
+    print(f"{METADATA_VERSION_ID} updated: {version}")
+    return version
@@ -0,0 +1,207 @@
+"""
+모델 추론 요청 마이크로 배치 처리
+동시에 들어온 단건 요청을 큐에 모아 최대 배치 크기 또는 최대 대기 시간(deadline) 중 먼저 도달하는
+조건으로 한 번에 forward pass를 수행합니다. 지연 시간 p50/p99와 배치 크기 분포를 집계합니다.
+"""
+import time
+import queue
+import threading
+from collections import Counter, deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+# 지연 시간 통계에 유지하는 최근 요청 수
+LATENCY_WINDOW = 10000
+
+# 배치 크기 분포 구간 상한 (1, 2, 4, ... 배치 크기 이하)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+_STOP = object()
+
+
+class _Request:
+    """큐에 들어가는 단건 요청"""
+
+    __slots__ = ('item', 'future', 'enqueued_at')
+
+    def __init__(self, item: Any):
+        self.item = item
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+def percentile(values: List[float], q: float) -> float:
+    """정렬된 값의 q 백분위 (nearest-rank)"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(q / 100.0 * len(values))) - 1))
+    return values[index]
+
+
+class MicroBatcher:
+    """
+    단건 요청을 동적 마이크로 배치로 묶어 batch_fn 호출
+
+    각 worker 스레드는 큐에서 첫 요청을 꺼낸 뒤 그 요청의 도착 시각 + max_wait_ms까지
+    추가 요청을 max_batch_size개가 될 때까지 모아 batch_fn(items)를 한 번 호출합니다.
+    동시성이 낮으면 대기 없이 작은 배치로, 높으면 큰 배치로 처리됩니다.
+
+    Args:
+        batch_fn: 입력 리스트를 받아 같은 순서의 결과 리스트를 반환하는 함수
+        max_batch_size: 최대 배치 크기
+        max_wait_ms: 첫 요청 도착 후 배치를 채우기 위해 기다리는 최대 시간 (ms)
+        workers: 배치를 동시에 처리하는 worker 스레드 수
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        workers: int = 1
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.queue = queue.Queue()
+        self.closed = False
+        self.closed_lock = threading.Lock()
+
+        self.stats_lock = threading.Lock()
+        self.latencies_ms = deque(maxlen=LATENCY_WINDOW)
+        self.queue_wait_ms = deque(maxlen=LATENCY_WINDOW)
+        self.batch_sizes = Counter()
+        self.requests = 0
+        self.batches = 0
+        self.errors = 0
+
+        self.workers = [
+            threading.Thread(target=self._worker, name=f'micro-batcher-{i}', daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for worker in self.workers:
+            worker.start()
+
+    def submit(self, item: Any) -> Future:
+        """요청 등록 (결과는 Future로 반환, close() 이후 요청은 바로 실패)"""
+        request = _Request(item)
+        with self.closed_lock:
+            if self.closed:
+                request.future.set_exception(RuntimeError('MicroBatcher is closed'))
+            else:
+                self.queue.put(request)
+        return request.future
+
+    def infer(self, items: List[Any], timeout: Optional[float] = None) -> List[Any]:
+        """여러 건을 개별 요청으로 등록하고 결과 대기 (다른 요청과 함께 배치될 수 있음)"""
+        futures = [self.submit(item) for item in items]
+        return [future.result(timeout=timeout) for future in futures]
+
+    def _collect(self, first: _Request) -> List[_Request]:
+        """첫 요청 기준 deadline까지 배치 수집"""
+        batch = [first]
+        deadline = first.enqueued_at + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                request = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is _STOP:
+                # 다른 worker도 종료하도록 다시 넣음
+                self.queue.put(_STOP)
+                break
+            batch.append(request)
+        return batch
+
+    def _worker(self):
+        while True:
+            first = self.queue.get()
+            if first is _STOP:
+                self.queue.put(_STOP)
+                return
+
+            batch = self._collect(first)
+            started = time.perf_counter()
+            try:
+                results = self.batch_fn([request.item for request in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"batch_fn returned {len(results)} results for {len(batch)} inputs")
+            except Exception as e:
+                for request in batch:
+                    request.future.set_exception(e)
+                with self.stats_lock:
+                    self.errors += len(batch)
+                continue
+
+            finished = time.perf_counter()
+            for request, result in zip(batch, results):
+                request.future.set_result(result)
+
+            with self.stats_lock:
+                self.requests += len(batch)
+                self.batches += 1
+                self.batch_sizes[len(batch)] += 1
+                for request in batch:
+                    self.latencies_ms.append((finished - request.enqueued_at) * 1000)
+                    self.queue_wait_ms.append((started - request.enqueued_at) * 1000)
+
+    def stats(self) -> Dict:
+        """
+        지연 시간/배치 크기 통계
+
+        Returns:
+            Dict: 요청/배치 수, 평균 배치 크기, 지연 p50/p99 (ms, 최근 LATENCY_WINDOW건),
+                  큐 대기 p50/p99, 배치 크기 구간별 건수
+        """
+        with self.stats_lock:
+            latencies = sorted(self.latencies_ms)
+            waits = sorted(self.queue_wait_ms)
+            sizes = dict(self.batch_sizes)
+            requests, batches, errors = self.requests, self.batches, self.errors
+
+        histogram = {}
+        lower = 0
+        for upper in BATCH_SIZE_BUCKETS:
+            histogram[f'<={upper}'] = sum(count for size, count in sizes.items() if lower < size <= upper)
+            lower = upper
+        histogram[f'>{lower}'] = sum(count for size, count in sizes.items() if size > lower)
+
+        return {
+            'requests': requests,
+            'batches': batches,
+            'errors': errors,
+            'queue_depth': self.queue.qsize(),
+            'mean_batch_size': requests / batches if batches else 0.0,
+            'latency_ms_p50': percentile(latencies, 50),
+            'latency_ms_p99': percentile(latencies, 99),
+            'queue_wait_ms_p50': percentile(waits, 50),
+            'queue_wait_ms_p99': percentile(waits, 99),
+            'batch_size_histogram': histogram,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'workers': len(self.workers),
+        }
+
+    def close(self, timeout: Optional[float] = None):
+        """
+        대기 중인 요청을 처리한 뒤 worker 종료
+
+        timeout 안에 처리되지 못하고 큐에 남은 요청은 실패 처리 (결과를 기다리는 호출이 멈추지 않도록)
+        """
+        with self.closed_lock:
+            self.closed = True
+            self.queue.put(_STOP)
+        for worker in self.workers:
+            worker.join(timeout)
+
+        while True:
+            try:
+                request = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is _STOP:
+                continue
+            request.future.set_exception(RuntimeError('MicroBatcher closed before the request was processed'))
+            with self.stats_lock:
+                self.errors += 1
@@ -0,0 +1,295 @@
+"""
+학습된 변경 유형 분류기의 CPU 추론용 export
+동적 int8 양자화 모델과 ONNX 그래프를 만들고, fp32 모델과 예측 일치율/지연 시간을 비교합니다.
+"""
+import os
+import copy
+import json
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import torch
+from transformers import AutoConfig, AutoModelForSequenceClassification
+
+from token_model import TokenizedChangeTypeClassifier
+
+QUANTIZED_WEIGHTS_FILE = 'model_int8.pt'
+ONNX_FILE = 'model.onnx'
+EXPORT_REPORT_FILE = 'export_report.json'
+ONNX_OPSET = 14
+
+# 검증 기본값: 레이블 불일치 허용 비율, 검증/지연 측정 샘플 수
+DEFAULT_TOLERANCE = 0.01
+MAX_VALIDATION_TEXTS = 512
+
+
+def _cpu_fp32_copy(classifier: TokenizedChangeTypeClassifier) -> torch.nn.Module:
+    """학습 장치와 무관하게 CPU fp32 모델 복사본"""
+    return copy.deepcopy(classifier.model).to('cpu').float().eval()
+
+
+def _cpu_reference(classifier: TokenizedChangeTypeClassifier) -> TokenizedChangeTypeClassifier:
+    """비교 기준: 같은 가중치의 CPU fp32 분류기"""
+    reference = copy.copy(classifier)
+    reference.device = torch.device('cpu')
+    reference.bf16 = False
+    reference.model = _cpu_fp32_copy(classifier)
+    return reference
+
+
+def quantize_int8(classifier: TokenizedChangeTypeClassifier) -> TokenizedChangeTypeClassifier:
+    """
+    Linear 레이어 동적 int8 양자화 (가중치 int8, 활성값은 추론 시 양자화)
+
+    Args:
+        classifier: 학습된 fp32 분류기
+
+    Returns:
+        TokenizedChangeTypeClassifier: CPU int8 분류기 (토크나이저/레이블 공유)
+    """
+    quantized = copy.copy(classifier)
+    quantized.device = torch.device('cpu')
+    quantized.bf16 = False
+    quantized.model = torch.ao.quantization.quantize_dynamic(
+        _cpu_fp32_copy(classifier), {torch.nn.Linear}, dtype=torch.qint8
+    )
+    return quantized
+
+
+def save_quantized(quantized: TokenizedChangeTypeClassifier, model_dir: str) -> str:
+    """int8 가중치 저장 (config/토크나이저/label_map은 fp32 산출물과 공유)"""
+    path = os.path.join(model_dir, QUANTIZED_WEIGHTS_FILE)
+    torch.save(quantized.model.state_dict(), path)
+    return path
+
+
+def load_export_report(model_dir: str) -> Optional[Dict]:
+    """export_report.json 로드 (없으면 None)"""
+    path = os.path.join(model_dir, EXPORT_REPORT_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_quantized(model_dir: str) -> TokenizedChangeTypeClassifier:
+    """
+    save_quantized()로 저장한 int8 모델 로드
+
+    export_report.json에서 int8 검증을 통과한 경우에만 로드
+    (리포트가 없으면 export가 완료되지 않았거나 이전 학습의 int8 가중치일 수 있음)
+
+    Args:
+        model_dir: fp32 산출물 디렉토리 (config.json, 토크나이저, label_map.json, model_int8.pt)
+
+    Returns:
+        TokenizedChangeTypeClassifier: CPU int8 분류기
+
+    Raises:
+        ValueError: export 리포트가 없거나 int8 모델이 허용 불일치 비율을 넘은 경우
+    """
+    report = load_export_report(model_dir)
+    if report is None:
+        raise ValueError(f"No {EXPORT_REPORT_FILE} in {model_dir}; int8 model is unvalidated (re-run export)")
+    if not report.get('int8', {}).get('passed', False):
+        agreement = report.get('int8', {}).get('label_agreement')
+        raise ValueError(
+            f"int8 model in {model_dir} failed validation "
+            f"(label agreement {agreement}, tolerance {report.get('tolerance')}); use the fp32 model"
+        )
+
+    classifier = TokenizedChangeTypeClassifier.load(model_dir, device='cpu')
+    model = AutoModelForSequenceClassification.from_config(AutoConfig.from_pretrained(model_dir)).eval()
+    model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    model.load_state_dict(torch.load(os.path.join(model_dir, QUANTIZED_WEIGHTS_FILE), map_location='cpu'))
+    classifier.model = model.eval()
+    return classifier
+
+
+def export_onnx(classifier: TokenizedChangeTypeClassifier, path: str) -> str:
+    """
+    ONNX 그래프 export (batch/sequence 축 동적)
+
+    입력: input_ids, attention_mask (int64) / 출력: logits
+    """
+    model = _cpu_fp32_copy(classifier)
+    dummy = classifier.tokenizer(['변경 유형 분류 export'], return_tensors='pt')
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (dummy['input_ids'], dummy['attention_mask']),
+            path,
+            input_names=['input_ids', 'attention_mask'],
+            output_names=['logits'],
+            dynamic_axes={
+                'input_ids': {0: 'batch', 1: 'sequence'},
+                'attention_mask': {0: 'batch', 1: 'sequence'},
+                'logits': {0: 'batch'},
+            },
+            opset_version=ONNX_OPSET
+        )
+    return path
+
+
+class _OnnxEvalStub:
+    """predict_proba의 model.eval() 호출 대응"""
+
+    def eval(self):
+        return self
+
+
+class OnnxChangeTypeClassifier(TokenizedChangeTypeClassifier):
+    """onnxruntime으로 추론하는 분류기 (토크나이저/배치 구성은 기존 분류기와 동일)"""
+
+    def __init__(self, classifier: TokenizedChangeTypeClassifier, onnx_path: str, threads: Optional[int] = None):
+        import onnxruntime
+
+        super().__init__(model_name=classifier.model_name, batch_size=classifier.batch_size, device='cpu')
+        self.tokenizer = classifier.tokenizer
+        self.label_names = classifier.label_names
+        self.max_length = classifier.max_length
+
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(onnx_path, options, providers=['CPUExecutionProvider'])
+        self.model = _OnnxEvalStub()
+
+    def _forward_logits(self, encoded) -> torch.Tensor:
+        logits = self.session.run(['logits'], {
+            'input_ids': encoded['input_ids'].numpy(),
+            'attention_mask': encoded['attention_mask'].numpy(),
+        })[0]
+        return torch.from_numpy(logits)
+
+
+def compare_predictions(reference: np.ndarray, candidate: np.ndarray) -> Dict:
+    """fp32 대비 예측 레이블 일치율과 확률 최대 차이"""
+    agreement = float(np.mean(reference.argmax(axis=1) == candidate.argmax(axis=1))) if len(reference) else 1.0
+    return {
+        'label_agreement': agreement,
+        'max_abs_prob_diff': float(np.abs(reference - candidate).max()) if len(reference) else 0.0,
+    }
+
+
+def measure_latency(
+    predict_proba: Callable[[List[str]], np.ndarray],
+    texts: List[str],
+    batch_size: int,
+    single_samples: int = 50
+) -> Dict:
+    """
+    CPU 추론 지연/처리량 측정
+
+    Returns:
+        Dict: 단건 지연 p50/p95 (ms), 배치 처리량 (texts/s)
+    """
+    predict_proba(texts[:1])  # warm-up
+
+    latencies = []
+    for text in texts[:single_samples]:
+        started = time.perf_counter()
+        predict_proba([text])
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    predict_proba(texts)
+    seconds = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'latency_ms_p50': latencies[len(latencies) // 2],
+        'latency_ms_p95': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        'throughput_per_sec': len(texts) / seconds if seconds > 0 else 0.0,
+        'batch_size': batch_size,
+    }
+
+
+def export_for_cpu(
+    classifier: TokenizedChangeTypeClassifier,
+    model_dir: str,
+    validation_texts: List[str],
+    tolerance: float = DEFAULT_TOLERANCE,
+    threads: Optional[int] = None
+) -> Dict:
+    """
+    int8 양자화 + ONNX export 후 fp32 대비 검증 및 CPU 성능 비교
+
+    Args:
+        classifier: 학습된 fp32 분류기 (save() 완료 상태)
+        model_dir: 산출물 디렉토리 (model_int8.pt, model.onnx, export_report.json 추가)
+        validation_texts: 일치율/지연 측정용 텍스트
+        tolerance: 허용 레이블 불일치 비율 (초과 시 해당 export는 passed=False)
+        threads: CPU 추론 스레드 수 (None이면 기본값)
+
+    Returns:
+        Dict: 방식별 검증 결과와 지연/처리량 (export_report.json과 동일)
+    """
+    texts = validation_texts[:MAX_VALIDATION_TEXTS]
+    batch_size = classifier.batch_size
+    # 이전 리포트 제거 (이번 export가 중간에 실패하면 int8 모델은 검증되지 않은 상태로 남음)
+    report_path = os.path.join(model_dir, EXPORT_REPORT_FILE)
+    if os.path.exists(report_path):
+        os.remove(report_path)
+    if threads:
+        torch.set_num_threads(threads)
+
+    reference = _cpu_reference(classifier)
+    reference_probs = reference.predict_proba(texts, batch_size)
+    report = {
+        'validation_texts': len(texts),
+        'tolerance': tolerance,
+        'fp32': {'path': model_dir, **measure_latency(lambda t: reference.predict_proba(t, batch_size), texts, batch_size)},
+    }
+
+    print("  Quantizing to int8 (dynamic, Linear layers)...")
+    quantized = quantize_int8(classifier)
+    report['int8'] = {
+        'path': save_quantized(quantized, model_dir),
+        **compare_predictions(reference_probs, quantized.predict_proba(texts, batch_size)),
+        **measure_latency(lambda t: quantized.predict_proba(t, batch_size), texts, batch_size),
+    }
+
+    print("  Exporting ONNX graph...")
+    try:
+        onnx_path = export_onnx(classifier, os.path.join(model_dir, ONNX_FILE))
+    except ImportError as e:
+        # torch 버전에 따라 exporter가 onnx/onnxscript 패키지를 요구
+        print(f"  ONNX exporter dependency missing ({e}); skipping ONNX export")
+        report['onnx'] = {'skipped': str(e)}
+    else:
+        report['onnx'] = {'path': onnx_path}
+        try:
+            onnx_model = OnnxChangeTypeClassifier(classifier, onnx_path, threads)
+            report['onnx'].update({
+                **compare_predictions(reference_probs, onnx_model.predict_proba(texts, batch_size)),
+                **measure_latency(lambda t: onnx_model.predict_proba(t, batch_size), texts, batch_size),
+            })
+        except ImportError:
+            print("  onnxruntime not installed; ONNX graph exported without validation")
+
+    for name in ('int8', 'onnx'):
+        if 'label_agreement' in report[name]:
+            report[name]['passed'] = report[name]['label_agreement'] >= 1.0 - tolerance
+
+    with open(os.path.join(model_dir, EXPORT_REPORT_FILE), 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print_export_report(report)
+    return report
+
+
+def print_export_report(report: Dict):
+    """export 검증/성능 요약 출력"""
+    fp32 = report['fp32']
+    print(f"\n  {'model':<6} {'agreement':>10} {'max Δprob':>10} {'p50 ms':>8} {'p95 ms':>8} {'texts/s':>9} {'speedup':>8}")
+    for name in ('fp32', 'int8', 'onnx'):
+        result = report[name]
+        if 'latency_ms_p50' not in result:
+            continue
+        agreement = f"{result['label_agreement'] * 100:.2f}%" if 'label_agreement' in result else '-'
+        diff = f"{result['max_abs_prob_diff']:.4f}" if 'max_abs_prob_diff' in result else '-'
+        speedup = result['throughput_per_sec'] / fp32['throughput_per_sec'] if fp32['throughput_per_sec'] else 0.0
+        status = '' if 'passed' not in result else (' ✓' if result['passed'] else ' ✗ exceeds tolerance')
+        print(f"  {name:<6} {agreement:>10} {diff:>10} {result['latency_ms_p50']:>8.1f} {result['latency_ms_p95']:>8.1f} "
+              f"{result['throughput_per_sec']:>9.1f} {speedup:>7.2f}x{status}")
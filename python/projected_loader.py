@@ -0,0 +1,167 @@
+"""
+속성 프로젝션 JIRA 데이터 로더
+JiraDataLoader 호출이 항상 전체 항목(긴 설명, 댓글 배열 포함)을 읽지 않도록
+단계별로 필요한 속성만 DynamoDB ProjectionExpression으로 요청합니다.
+목록 조회(issue_key, changeType)는 키/레이블 속성만 스캔하고,
+티켓 조회는 attributes를 지정하면 해당 필드만 batch_get_item으로 읽습니다.
+
+수신 바이트 계측은 응답(scan 페이지, batch_get_item 응답, get_item) 단위로 여기서 집계하므로
+호출하는 쪽에서 조립된 티켓 리스트를 다시 직렬화해 세지 않습니다.
+
+프로젝션은 응답 크기(네트워크 전송, 역직렬화, 메모리)를 줄이며,
+읽기 용량 단위는 DynamoDB가 항목 전체 크기 기준으로 계산하므로 그대로입니다.
+"""
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import boto3
+from data_loader import JiraDataLoader
+from preprocessor import JiraTextPreprocessor
+from instrumentation import instrumentation, estimate_bytes
+from config import AWS_REGION, DYNAMODB_TABLE_NAME
+
+# 티켓 dict의 issue_key는 테이블 파티션 키 dataId
+KEY_ATTRIBUTE = 'dataId'
+
+# JiraTextPreprocessor.extract_features 입력 필드 계약
+# 전처리기가 INPUT_FIELDS를 선언하면 그 값을, 없으면 기본값을 사용
+# 이 필드로 내용 해시(전처리 캐시, 이어 학습 변경 판단, 임베딩 인덱스 조회)를 만들고 스냅샷/DynamoDB 조회 필드를 정하므로
+# 전처리기가 다른 필드를 읽게 되면 INPUT_FIELDS(또는 기본값)에 추가하고 학습 스크립트 FEATURE_CACHE_VERSION을 올릴 것
+DEFAULT_PREPROCESSOR_FIELDS = ('summary', 'description', 'components', 'comments')
+PREPROCESSOR_FIELDS = tuple(dict.fromkeys(
+    ('issue_key', *getattr(JiraTextPreprocessor, 'INPUT_FIELDS', DEFAULT_PREPROCESSOR_FIELDS))
+))
+
+# 단계별 티켓 필드 (issue_key는 항상 포함)
+# TEXT_FIELDS: 전처리 + 위험 점수 입력, RISK_FIELDS: + 저장된 점수 (증분 재계산)
+LABEL_FIELDS = ('changeType',)
+TEXT_FIELDS = tuple(dict.fromkeys(('summary', 'description', 'components', 'comments', *PREPROCESSOR_FIELDS[1:])))
+RISK_FIELDS = TEXT_FIELDS + ('riskpoint', 'riskFactors')
+
+# batch_get_item 요청당 최대 키 수, 미처리 키 재시도 횟수
+BATCH_GET_SIZE = 100
+BATCH_GET_RETRIES = 8
+
+
+def projection(fields: Sequence[str]) -> Tuple[str, Dict[str, str]]:
+    """
+    티켓 필드 목록 → (ProjectionExpression, ExpressionAttributeNames)
+
+    예약어(status, comments 등) 충돌을 피하기 위해 모든 속성을 #a0, #a1 ... 이름으로 참조
+    """
+    attributes = [KEY_ATTRIBUTE]
+    for field in fields:
+        attribute = KEY_ATTRIBUTE if field == 'issue_key' else field
+        if attribute not in attributes:
+            attributes.append(attribute)
+    names = {f'#a{i}': attribute for i, attribute in enumerate(attributes)}
+    return ', '.join(names), names
+
+
+def _ticket(item: Dict) -> Dict:
+    """DynamoDB 항목 → 티켓 dict (dataId → issue_key)"""
+    ticket = {'issue_key': item[KEY_ATTRIBUTE]}
+    ticket.update((key, value) for key, value in item.items() if key != KEY_ATTRIBUTE)
+    return ticket
+
+
+class ProjectedJiraDataLoader(JiraDataLoader):
+    """
+    JiraDataLoader + 속성 프로젝션
+
+    attributes를 지정하지 않은 티켓 조회는 기존 JiraDataLoader 동작(전체 항목) 그대로 사용
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        session = boto3.Session(profile_name='AUTO')
+        self.dynamodb = session.resource('dynamodb', region_name=AWS_REGION)
+        self.table = self.dynamodb.Table(DYNAMODB_TABLE_NAME)
+
+    def scan_fields(self, fields: Sequence[str] = (), require: Optional[str] = None) -> List[Dict]:
+        """
+        테이블 전체를 지정 필드만 스캔 (페이지 단위)
+
+        Args:
+            fields: 티켓 필드 목록 (issue_key는 항상 포함)
+            require: 이 속성이 있는 항목만 반환
+
+        Returns:
+            List[Dict]: 티켓 dict 리스트
+        """
+        expression, names = projection(list(fields) + ([require] if require else []))
+        kwargs = {'ProjectionExpression': expression, 'ExpressionAttributeNames': names}
+        if require:
+            require_name = next(name for name, attribute in names.items() if attribute == require)
+            kwargs['FilterExpression'] = f'attribute_exists({require_name})'
+
+        items = []
+        while True:
+            response = self.table.scan(**kwargs)
+            page = response.get('Items', [])
+            instrumentation.count('dynamodb', bytes_in=estimate_bytes(page))
+            items.extend(page)
+            if 'LastEvaluatedKey' not in response:
+                break
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        return [_ticket(item) for item in items]
+
+    def get_incident_issue_keys(self) -> List[str]:
+        """전체 issue_key (키 속성만 스캔)"""
+        return [ticket['issue_key'] for ticket in self.scan_fields()]
+
+    def get_existing_change_types(self) -> Dict[str, str]:
+        """레이블된 티켓의 {issue_key: changeType} (키/changeType 속성만 스캔)"""
+        return {
+            ticket['issue_key']: ticket['changeType']
+            for ticket in self.scan_fields(LABEL_FIELDS, require='changeType')
+        }
+
+    def get_tickets_from_dynamodb(self, issue_keys: List[str], attributes: Optional[Sequence[str]] = None) -> List[Dict]:
+        """
+        티켓 조회
+
+        Args:
+            issue_keys: 조회할 issue_key 목록
+            attributes: 읽을 티켓 필드 (None이면 기존 전체 항목 조회)
+
+        Returns:
+            List[Dict]: 티켓 dict 리스트 (attributes 지정 시 issue_key + 해당 필드, 없는 티켓은 제외)
+        """
+        if attributes is None:
+            return super().get_tickets_from_dynamodb(issue_keys)
+
+        expression, names = projection(attributes)
+        tickets = []
+        for start in range(0, len(issue_keys), BATCH_GET_SIZE):
+            keys = [{KEY_ATTRIBUTE: key} for key in issue_keys[start:start + BATCH_GET_SIZE]]
+            for attempt in range(BATCH_GET_RETRIES + 1):
+                response = self.dynamodb.batch_get_item(RequestItems={DYNAMODB_TABLE_NAME: {
+                    'Keys': keys, 'ProjectionExpression': expression, 'ExpressionAttributeNames': names
+                }})
+                items = response.get('Responses', {}).get(DYNAMODB_TABLE_NAME, [])
+                instrumentation.count('dynamodb', bytes_in=estimate_bytes(items))
+                tickets.extend(_ticket(item) for item in items)
+                keys = response.get('UnprocessedKeys', {}).get(DYNAMODB_TABLE_NAME, {}).get('Keys', [])
+                if not keys:
+                    break
+                # 처리량 제한으로 남은 키는 지수 백오프 후 재요청
+                time.sleep(min(0.05 * (2 ** attempt), 2.0))
+            if keys:
+                raise RuntimeError(f"batch_get_item left {len(keys)} unprocessed keys after {BATCH_GET_RETRIES} retries")
+        return tickets
+
+    def get_jira_ticket_from_dynamodb(self, issue_key: str, attributes: Optional[Sequence[str]] = None) -> Optional[Dict]:
+        """티켓 단건 조회 (attributes 지정 시 해당 필드만)"""
+        if attributes is None:
+            ticket = super().get_jira_ticket_from_dynamodb(issue_key)
+            instrumentation.count('dynamodb', bytes_in=estimate_bytes(ticket))
+            return ticket
+
+        expression, names = projection(attributes)
+        response = self.table.get_item(
+            Key={KEY_ATTRIBUTE: issue_key}, ProjectionExpression=expression, ExpressionAttributeNames=names
+        )
+        item = response.get('Item')
+        instrumentation.count('dynamodb', bytes_in=estimate_bytes(item))
+        return _ticket(item) if item else None
@@ -0,0 +1,338 @@
+"""
+BERT 분류기 지식 증류용 경량 학생 모델
+단어/문자 n-gram을 해시 버킷으로 매핑한 희소 특징과 선형 softmax 분류기로 구성되며,
+teacher(BERT)의 soft label로 학습합니다. numpy만 사용하므로 레이블링 도구에서 torch 없이
+티켓당 1ms 미만으로 예측하고, 신뢰도가 낮은 티켓만 BERT로 넘깁니다.
+"""
+import os
+import re
+import json
+import time
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+STUDENT_WEIGHTS_FILE = 'student.npz'
+STUDENT_META_FILE = 'student.json'
+DISTILL_REPORT_FILE = 'distill_report.json'
+
+# 해시 버킷 수 (2^18 x 레이블 수 float32 가중치)
+HASH_DIM = 1 << 18
+WORD_NGRAMS = (1, 2)
+CHAR_NGRAMS = (2, 3, 4)
+
+# 증류 기본값: soft label 온도, 실제 레이블 비중, BERT 위임 임계값 추천 기준 (teacher 일치율)
+DEFAULT_TEMPERATURE = 2.0
+DEFAULT_HARD_LABEL_WEIGHT = 0.3
+TARGET_TEACHER_AGREEMENT = 0.98
+
+_TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+def _bucket(feature: str, dim: int) -> int:
+    """프로세스와 무관하게 같은 버킷 (내장 hash()는 실행마다 달라짐)"""
+    return zlib.crc32(feature.encode('utf-8')) % dim
+
+
+def text_features(text: str, dim: int = HASH_DIM) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    텍스트 1건의 해시 n-gram 특징
+
+    단어 1~2-gram과 단어 내부 문자 2~4-gram (한글 조사/어미 변화 대응),
+    빈도는 log(1 + tf) 후 L2 정규화
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (버킷 인덱스 int32, 값 float32)
+    """
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    buckets = []
+    for n in WORD_NGRAMS:
+        for i in range(len(tokens) - n + 1):
+            buckets.append(_bucket('w:' + ' '.join(tokens[i:i + n]), dim))
+    for token in tokens:
+        marked = f'<{token}>'
+        for n in CHAR_NGRAMS:
+            for i in range(len(marked) - n + 1):
+                buckets.append(_bucket('c:' + marked[i:i + n], dim))
+
+    if not buckets:
+        return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+
+    indices, counts = np.unique(np.asarray(buckets, dtype=np.int32), return_counts=True)
+    values = np.log1p(counts).astype(np.float32)
+    values /= np.linalg.norm(values)
+    return indices, values
+
+
+def vectorize(texts: Sequence[str], dim: int = HASH_DIM) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """텍스트 목록을 CSR 형태 (indptr, indices, values)로 변환"""
+    features = [text_features(text, dim) for text in texts]
+    indptr = np.zeros(len(features) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(indices) for indices, _ in features])
+    indices = np.concatenate([f[0] for f in features]) if features else np.zeros(0, dtype=np.int32)
+    values = np.concatenate([f[1] for f in features]) if features else np.zeros(0, dtype=np.float32)
+    return indptr, indices, values
+
+
+def soften(probabilities: np.ndarray, temperature: float) -> np.ndarray:
+    """softmax(logits / T)와 같은 분포 (확률만 있을 때 p^(1/T) 정규화)"""
+    if temperature == 1.0:
+        return probabilities
+    logits = np.log(np.clip(probabilities, 1e-12, 1.0)) / temperature
+    logits -= logits.max(axis=1, keepdims=True)
+    softened = np.exp(logits)
+    return softened / softened.sum(axis=1, keepdims=True)
+
+
+class HashedNgramStudent:
+    """
+    해시 n-gram 선형 softmax 분류기 (teacher soft label 학습)
+
+    Args:
+        label_names: 레이블 이름 (teacher와 같은 순서)
+        dim: 해시 버킷 수
+    """
+
+    def __init__(self, label_names: List[str], dim: int = HASH_DIM):
+        self.label_names = list(label_names)
+        self.dim = dim
+        self.weights = np.zeros((dim, len(self.label_names)), dtype=np.float32)
+        self.bias = np.zeros(len(self.label_names), dtype=np.float32)
+        # 이 신뢰도 미만은 BERT로 위임 (distill()이 검증 분할로 추천값 설정)
+        self.defer_threshold = 0.5
+
+    def _logits(self, indptr: np.ndarray, indices: np.ndarray, values: np.ndarray) -> np.ndarray:
+        rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        logits = np.tile(self.bias, (len(indptr) - 1, 1))
+        np.add.at(logits, rows, self.weights[indices] * values[:, None])
+        return logits
+
+    @staticmethod
+    def _softmax(logits: np.ndarray) -> np.ndarray:
+        logits = logits - logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def fit(
+        self,
+        texts: Sequence[str],
+        targets: np.ndarray,
+        epochs: int = 8,
+        learning_rate: float = 0.5,
+        batch_size: int = 256,
+        seed: int = 42
+    ) -> Dict:
+        """
+        soft target 교차 엔트로피 최소화 (희소 특징이므로 AdaGrad로 등장한 버킷만 갱신)
+
+        Args:
+            texts: 학습 텍스트
+            targets: (len(texts), num_labels) 목표 분포
+            epochs: 에폭 수
+            learning_rate: AdaGrad 학습률
+            batch_size: 미니배치 크기
+            seed: 셔플 시드
+
+        Returns:
+            Dict: 에폭별 평균 loss, 학습 시간
+        """
+        started = time.perf_counter()
+        indptr, indices, values = vectorize(texts, self.dim)
+        targets = np.asarray(targets, dtype=np.float32)
+        accum = np.full_like(self.weights, 1e-8)
+        bias_accum = np.full_like(self.bias, 1e-8)
+        rng = np.random.default_rng(seed)
+        losses = []
+
+        for _ in range(epochs):
+            order = rng.permutation(len(texts))
+            epoch_loss = 0.0
+            for start in range(0, len(order), batch_size):
+                batch = order[start:start + batch_size]
+                spans = [np.arange(indptr[i], indptr[i + 1]) for i in batch]
+                positions = np.concatenate(spans) if spans else np.zeros(0, dtype=np.int64)
+                batch_indptr = np.zeros(len(batch) + 1, dtype=np.int64)
+                batch_indptr[1:] = np.cumsum([len(span) for span in spans])
+                batch_indices, batch_values = indices[positions], values[positions]
+
+                probs = self._softmax(self._logits(batch_indptr, batch_indices, batch_values))
+                epoch_loss -= float(np.sum(targets[batch] * np.log(np.clip(probs, 1e-12, 1.0))))
+                delta = (probs - targets[batch]) / len(batch)
+
+                rows = np.repeat(np.arange(len(batch)), np.diff(batch_indptr))
+                unique, inverse = np.unique(batch_indices, return_inverse=True)
+                grad = np.zeros((len(unique), len(self.label_names)), dtype=np.float32)
+                np.add.at(grad, inverse, delta[rows] * batch_values[:, None])
+
+                accum[unique] += grad ** 2
+                self.weights[unique] -= learning_rate * grad / np.sqrt(accum[unique])
+                bias_grad = delta.sum(axis=0)
+                bias_accum += bias_grad ** 2
+                self.bias -= learning_rate * bias_grad / np.sqrt(bias_accum)
+            losses.append(epoch_loss / max(1, len(texts)))
+
+        return {'epoch_losses': losses, 'seconds': time.perf_counter() - started}
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        """텍스트별 클래스 확률 (len(texts), num_labels)"""
+        return self._softmax(self._logits(*vectorize(texts, self.dim)))
+
+    def predict(self, texts: Sequence[str]) -> List[Tuple[str, float]]:
+        """(레이블, 신뢰도) 리스트"""
+        probabilities = self.predict_proba(texts)
+        return [(self.label_names[int(row.argmax())], float(row.max())) for row in probabilities]
+
+    def save(self, model_dir: str):
+        """가중치(npz)와 메타데이터(json) 저장"""
+        os.makedirs(model_dir, exist_ok=True)
+        np.savez_compressed(os.path.join(model_dir, STUDENT_WEIGHTS_FILE), weights=self.weights, bias=self.bias)
+        with open(os.path.join(model_dir, STUDENT_META_FILE), 'w', encoding='utf-8') as f:
+            json.dump({
+                'label_names': self.label_names,
+                'dim': self.dim,
+                'word_ngrams': list(WORD_NGRAMS),
+                'char_ngrams': list(CHAR_NGRAMS),
+                'defer_threshold': self.defer_threshold,
+            }, f, indent=2, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, model_dir: str) -> 'HashedNgramStudent':
+        """save()로 저장한 학생 모델 로드"""
+        with open(os.path.join(model_dir, STUDENT_META_FILE), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        student = cls(meta['label_names'], dim=meta['dim'])
+        with np.load(os.path.join(model_dir, STUDENT_WEIGHTS_FILE)) as data:
+            student.weights = data['weights']
+            student.bias = data['bias']
+        student.defer_threshold = meta.get('defer_threshold', student.defer_threshold)
+        return student
+
+
+def recommend_threshold(confidences: np.ndarray, agrees: np.ndarray, target: float = TARGET_TEACHER_AGREEMENT) -> float:
+    """
+    학생이 직접 처리하는 티켓의 teacher 일치율이 target 이상이 되는 가장 낮은 신뢰도 임계값
+
+    Args:
+        confidences: 검증 티켓별 학생 신뢰도
+        agrees: 검증 티켓별 학생/teacher 레이블 일치 여부
+    """
+    order = np.argsort(-confidences)
+    cumulative = np.cumsum(agrees[order]) / np.arange(1, len(order) + 1)
+    passing = np.nonzero(cumulative >= target)[0]
+    if len(passing) == 0:
+        return 1.0
+    return float(confidences[order][passing[-1]])
+
+
+def _per_text_ms(predict, texts: Sequence[str], samples: int = 100) -> float:
+    """단건 예측 평균 지연 (ms)"""
+    texts = list(texts[:samples])
+    if not texts:
+        return 0.0
+    predict(texts[:1])  # warm-up
+    started = time.perf_counter()
+    for text in texts:
+        predict([text])
+    return (time.perf_counter() - started) * 1000 / len(texts)
+
+
+def distill(
+    teacher,
+    texts: List[str],
+    label_ids: np.ndarray,
+    train_indices: np.ndarray,
+    validation_indices: np.ndarray,
+    temperature: float = DEFAULT_TEMPERATURE,
+    hard_label_weight: float = DEFAULT_HARD_LABEL_WEIGHT,
+    model_dir: Optional[str] = None
+) -> Tuple[HashedNgramStudent, Dict]:
+    """
+    teacher soft label로 학생 모델 학습 후 검증 분할에서 정확도 유지율/속도 향상 측정
+
+    Args:
+        teacher: predict_proba(texts)와 label_names를 제공하는 학습된 분류기
+        texts: 전체 텍스트 (label_ids와 같은 순서)
+        label_ids: 실제 레이블 인덱스
+        train_indices: 학습 인덱스
+        validation_indices: 검증 인덱스 (비어 있으면 학습 인덱스로 평가)
+        temperature: soft label 온도
+        hard_label_weight: 목표 분포에서 실제 레이블 one-hot 비중
+        model_dir: 지정 시 학생 모델과 distill_report.json 저장
+
+    Returns:
+        Tuple[HashedNgramStudent, Dict]: 학생 모델, 리포트
+    """
+    from token_model import macro_f1
+
+    label_ids = np.asarray(label_ids)
+    train_indices = np.asarray(train_indices)
+    validation_indices = np.asarray(validation_indices) if len(validation_indices) else train_indices
+    num_labels = len(teacher.label_names)
+
+    teacher_probs = teacher.predict_proba([texts[i] for i in train_indices])
+    targets = (1.0 - hard_label_weight) * soften(teacher_probs, temperature)
+    targets[np.arange(len(train_indices)), label_ids[train_indices]] += hard_label_weight
+
+    student = HashedNgramStudent(teacher.label_names)
+    fit_summary = student.fit([texts[i] for i in train_indices], targets)
+
+    validation_texts = [texts[i] for i in validation_indices]
+    truth = label_ids[validation_indices]
+    teacher_pred = teacher.predict_proba(validation_texts).argmax(axis=1)
+    student_probs = student.predict_proba(validation_texts)
+    student_pred = student_probs.argmax(axis=1)
+    confidences = student_probs.max(axis=1)
+    agrees = student_pred == teacher_pred
+
+    student.defer_threshold = recommend_threshold(confidences, agrees)
+    covered = confidences >= student.defer_threshold
+    # 학생 처리 + 나머지 BERT 위임 시 정확도
+    cascade_pred = np.where(covered, student_pred, teacher_pred)
+
+    teacher_accuracy = float(np.mean(teacher_pred == truth))
+    student_accuracy = float(np.mean(student_pred == truth))
+    teacher_ms = _per_text_ms(teacher.predict_proba, validation_texts)
+    student_ms = _per_text_ms(student.predict_proba, validation_texts)
+
+    report = {
+        'train_samples': len(train_indices),
+        'validation_samples': len(validation_indices),
+        'temperature': temperature,
+        'hard_label_weight': hard_label_weight,
+        'fit_seconds': fit_summary['seconds'],
+        'epoch_losses': fit_summary['epoch_losses'],
+        'teacher_accuracy': teacher_accuracy,
+        'teacher_macro_f1': macro_f1(truth, teacher_pred, num_labels),
+        'student_accuracy': student_accuracy,
+        'student_macro_f1': macro_f1(truth, student_pred, num_labels),
+        'accuracy_retained': student_accuracy / teacher_accuracy if teacher_accuracy else 0.0,
+        'teacher_agreement': float(np.mean(agrees)) if len(agrees) else 0.0,
+        'defer_threshold': student.defer_threshold,
+        'student_coverage': float(np.mean(covered)) if len(covered) else 0.0,
+        'cascade_accuracy': float(np.mean(cascade_pred == truth)) if len(truth) else 0.0,
+        'teacher_ms_per_text': teacher_ms,
+        'student_ms_per_text': student_ms,
+        'speedup': teacher_ms / student_ms if student_ms else 0.0,
+    }
+
+    if model_dir:
+        student.save(model_dir)
+        with open(os.path.join(model_dir, DISTILL_REPORT_FILE), 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    return student, report
+
+
+def print_distill_report(report: Dict):
+    """증류 결과 요약 출력"""
+    print(f"  {'model':<8} {'accuracy':>9} {'macro-F1':>9} {'ms/text':>9}")
+    print(f"  {'teacher':<8} {report['teacher_accuracy'] * 100:>8.2f}% {report['teacher_macro_f1']:>9.4f} "
+          f"{report['teacher_ms_per_text']:>9.3f}")
+    print(f"  {'student':<8} {report['student_accuracy'] * 100:>8.2f}% {report['student_macro_f1']:>9.4f} "
+          f"{report['student_ms_per_text']:>9.3f}")
+    print(f"  Accuracy retained: {report['accuracy_retained'] * 100:.1f}%, speedup: {report['speedup']:.0f}x, "
+          f"teacher agreement: {report['teacher_agreement'] * 100:.1f}%")
+    print(f"  Defer threshold: {report['defer_threshold']:.2f} "
+          f"(student handles {report['student_coverage'] * 100:.1f}%, "
+          f"cascade accuracy {report['cascade_accuracy'] * 100:.2f}%)")
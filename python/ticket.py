@@ -0,0 +1,186 @@
+"""
+메모리 절약형 JIRA 티켓 표현
+__slots__ 객체에 자주 쓰는 필드만 속성으로 두고, 상태/컴포넌트/changeType 문자열은 intern하여
+티켓 간 공유합니다. 댓글은 압축된 JSON으로 보관하고 실제로 읽을 때만 디코딩합니다.
+기존 dict 티켓과 같은 get()/[] 인터페이스를 제공합니다.
+"""
+import sys
+import json
+import zlib
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# 속성으로 보관하는 티켓 필드 (나머지는 extra dict)
+CORE_FIELDS = ('issue_key', 'summary', 'description', 'status', 'components', 'comments', 'changeType', 'riskpoint')
+
+
+def plain_value(value):
+    """
+    DynamoDB Decimal/set 값을 JSON 호환 값으로 변환 (지연 댓글은 디코딩)
+
+    DynamoDB 조회 티켓과 스냅샷 티켓이 같은 값이 되도록 내용 해시, 스냅샷 저장, 댓글 압축에 공통 사용
+    """
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, LazyComments):
+        return value.decode()
+    if isinstance(value, set):
+        return sorted(plain_value(v) for v in value)
+    if isinstance(value, dict):
+        return {k: plain_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [plain_value(v) for v in value]
+    return value
+
+
+def _intern(value) -> Optional[str]:
+    return sys.intern(str(value)) if value is not None else None
+
+
+class LazyComments:
+    """
+    압축된 댓글 JSON (길이는 디코딩 없이 제공, 항목 접근 시에만 디코딩)
+
+    디코딩 결과는 캐시하지 않음 (티켓이 메모리에 오래 남아도 댓글 본문은 압축 상태 유지)
+    """
+
+    __slots__ = ('_raw', '_count')
+
+    def __init__(self, raw: bytes, count: int):
+        self._raw = raw
+        self._count = count
+
+    @classmethod
+    def from_list(cls, comments: List[Dict]) -> 'LazyComments':
+        # Decimal 등은 plain_value로 변환 (스냅샷 댓글 컬럼과 같은 값)
+        payload = json.dumps(plain_value(comments), ensure_ascii=False, separators=(',', ':'), default=str)
+        return cls(zlib.compress(payload.encode('utf-8')), len(comments))
+
+    @classmethod
+    def from_json(cls, payload: str, count: Optional[int] = None) -> 'LazyComments':
+        """이미 JSON 문자열인 댓글 (스냅샷 컬럼) - count가 없으면 한 번 디코딩해 길이 확인"""
+        if count is None:
+            count = len(json.loads(payload))
+        return cls(zlib.compress(payload.encode('utf-8')), count)
+
+    def decode(self) -> List[Dict]:
+        """댓글 리스트 디코딩"""
+        return json.loads(zlib.decompress(self._raw).decode('utf-8'))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.decode())
+
+    def __getitem__(self, index):
+        return self.decode()[index]
+
+    def __repr__(self) -> str:
+        return f"LazyComments({self._count} comments, {len(self._raw)} bytes)"
+
+
+class Ticket:
+    """
+    __slots__ 기반 티켓 (dict 티켓 대체)
+
+    Attributes:
+        issue_key, summary, description: 원본 문자열
+        status, change_type: intern된 문자열
+        components: intern된 문자열 tuple
+        comments: LazyComments
+        riskpoint: int
+        extra: 그 외 필드 dict (없으면 None)
+        none_fields: 원본 dict에 값 None으로 있던 CORE_FIELDS (없으면 None)
+
+    원본 dict에 없던 필드와 값이 None인 필드는 둘 다 속성 None으로 보관하고 none_fields로 구분
+    (get/in/keys/to_dict가 원본 dict와 같도록, 빈 리스트와 필드 없음도 구분)
+    """
+
+    __slots__ = ('issue_key', 'summary', 'description', 'status', 'components', 'comments',
+                 'change_type', 'riskpoint', 'extra', 'none_fields')
+
+    def __init__(self, issue_key: str, summary: Optional[str] = None, description: Optional[str] = None,
+                 status: Optional[str] = None, components: Optional[Iterable[str]] = None,
+                 comments: Optional[LazyComments] = None, change_type: Optional[str] = None,
+                 riskpoint: Optional[int] = None, extra: Optional[Dict[str, Any]] = None,
+                 none_fields: Iterable[str] = ()):
+        self.issue_key = issue_key
+        self.summary = summary
+        self.description = description
+        self.status = _intern(status)
+        self.components = tuple(sys.intern(str(c)) for c in components) if components is not None else None
+        self.comments = comments
+        self.change_type = _intern(change_type)
+        self.riskpoint = int(riskpoint) if riskpoint is not None and riskpoint != '' else None
+        self.extra = extra or None
+        self.none_fields = tuple(none_fields) or None
+
+    @classmethod
+    def from_item(cls, item: Dict) -> 'Ticket':
+        """로더가 반환한 dict 티켓에서 생성"""
+        comments = item.get('comments')
+        extra = {k: v for k, v in item.items() if k not in CORE_FIELDS}
+        return cls(
+            issue_key=item.get('issue_key'),
+            summary=item.get('summary'),
+            description=item.get('description'),
+            status=item.get('status'),
+            components=item.get('components'),
+            comments=LazyComments.from_list(comments) if comments is not None else None,
+            change_type=item.get('changeType'),
+            riskpoint=item.get('riskpoint'),
+            extra=extra,
+            none_fields=[field for field in CORE_FIELDS if field in item and item[field] is None]
+        )
+
+    # dict 티켓 호환 인터페이스 (changeType 키는 change_type 속성)
+    def _value(self, key: str):
+        if key == 'changeType':
+            return self.change_type
+        if key in CORE_FIELDS:
+            return getattr(self, key)
+        return self.extra.get(key) if self.extra else None
+
+    def __contains__(self, key: str) -> bool:
+        if key not in CORE_FIELDS:
+            return key in (self.extra or {})
+        return self._value(key) is not None or key in (self.none_fields or ())
+
+    def get(self, key: str, default=None):
+        value = self._value(key)
+        if value is None and key not in self:
+            return default
+        return value
+
+    def __getitem__(self, key: str):
+        if key not in self:
+            raise KeyError(key)
+        return self._value(key)
+
+    def keys(self) -> List[str]:
+        return [key for key in (*CORE_FIELDS, *(self.extra or {})) if key in self]
+
+    def to_dict(self) -> Dict:
+        """dict 티켓으로 변환 (댓글 디코딩)"""
+        ticket = {key: self._value(key) for key in self.keys()}
+        if ticket.get('components') is not None:
+            ticket['components'] = list(self.components)
+        if ticket.get('comments') is not None:
+            ticket['comments'] = self.comments.decode()
+        return ticket
+
+    def __repr__(self) -> str:
+        return f"Ticket({self.issue_key!r}, changeType={self.change_type!r}, comments={len(self.comments or ())})"
+
+
+def json_default(value):
+    """json.dumps default: 지연 댓글은 디코딩, 나머지(Decimal 등)는 문자열"""
+    if isinstance(value, LazyComments):
+        return value.decode()
+    return str(value)
+
+
+def compact_tickets(items: Iterable[Dict]) -> List[Ticket]:
+    """dict 티켓 리스트를 Ticket 리스트로 변환"""
+    return [Ticket.from_item(item) for item in items]
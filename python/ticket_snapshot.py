@@ -0,0 +1,356 @@
+"""
+티켓 컬럼형 스냅샷 (학습/레이블링/분석 공용)
+DynamoDB 티켓, changeType, 장애 여부를 버전별 Parquet 파일 하나로 저장하고, 각 단계는 필요한 컬럼만
+읽습니다. 같은 날 반복 실행 시 DynamoDB를 다시 스캔하지 않고 최신 스냅샷을 재사용합니다.
+
+pyarrow가 없으면 컬럼별 JSON 파일로 저장합니다 (컬럼 단위 읽기는 동일).
+"""
+import os
+import json
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+from config import MODEL_DIR
+from ticket import Ticket, LazyComments, plain_value
+
+SNAPSHOT_ROOT = f"{MODEL_DIR}/snapshots"
+SNAPSHOT_VERSION = 3
+MANIFEST_FILE = 'manifest.json'
+PARQUET_FILE = 'tickets.parquet'
+LATEST_FILE = 'LATEST'
+
+# 이 시간 이내 스냅샷은 재사용 (DynamoDB 재스캔 생략)
+DEFAULT_MAX_AGE_HOURS = 24.0
+
+# 컬럼: (이름, 티켓 필드, 타입) - json 타입은 구조가 티켓마다 달라 JSON 문자열로 저장
+TICKET_COLUMNS = (
+    ('issue_key', 'issue_key', 'string'),
+    ('summary', 'summary', 'string'),
+    ('description', 'description', 'string'),
+    ('status', 'status', 'string'),
+    ('created', 'created', 'string'),
+    ('sprint', 'sprint', 'json'),
+    ('components', 'components', 'list'),
+    ('comments', 'comments', 'json'),
+    ('comment_count', 'comments', 'count'),
+    ('riskpoint', 'riskpoint', 'int'),
+    ('risk_factors', 'riskFactors', 'json'),
+)
+LABEL_COLUMNS = (
+    ('change_type', 'string'),
+    ('is_incident', 'bool'),
+)
+COLUMN_TYPES = {name: kind for name, _, kind in TICKET_COLUMNS}
+COLUMN_TYPES.update(dict(LABEL_COLUMNS))
+FIELD_BY_COLUMN = {name: field for name, field, kind in TICKET_COLUMNS if kind != 'count'}
+FIELD_BY_COLUMN['change_type'] = 'changeType'
+
+
+def _encode(value, kind: str):
+    if kind == 'json':
+        return None if value is None else json.dumps(plain_value(value), ensure_ascii=False)
+    if kind == 'list':
+        # 필드 없음은 null로 저장 (빈 리스트와 구분, 읽을 때 필드 자체가 빠짐)
+        return None if value is None else [str(v) for v in value]
+    if kind == 'count':
+        return len(value) if value else 0
+    if kind == 'int':
+        return None if value is None or value == '' else int(value)
+    if kind == 'bool':
+        return bool(value)
+    return None if value is None else str(value)
+
+
+def _decode(value, kind: str):
+    if kind == 'json':
+        return None if value is None else json.loads(value)
+    return value
+
+
+def _arrow_type(kind: str):
+    return {
+        'string': pa.string(),
+        'json': pa.string(),
+        'list': pa.list_(pa.string()),
+        'int': pa.int64(),
+        'count': pa.int32(),
+        'bool': pa.bool_(),
+    }[kind]
+
+
+def build_columns(
+    tickets: Iterable[Dict],
+    change_types: Dict[str, str],
+    incident_keys: Iterable[str]
+) -> Dict[str, list]:
+    """
+    티켓 리스트를 컬럼별 리스트로 변환
+
+    Args:
+        tickets: JIRA 티켓 리스트
+        change_types: {issue_key: changeType}
+        incident_keys: INCIDENT#HISTORY issue_key 리스트
+
+    Returns:
+        Dict[str, list]: {컬럼명: 값 리스트}
+    """
+    incident_set = set(incident_keys)
+    columns = {name: [] for name in COLUMN_TYPES}
+    for ticket in tickets:
+        issue_key = ticket.get('issue_key')
+        for name, field, kind in TICKET_COLUMNS:
+            columns[name].append(_encode(ticket.get(field), kind))
+        columns['change_type'].append(change_types.get(issue_key))
+        columns['is_incident'].append(issue_key in incident_set)
+    return columns
+
+
+def write_snapshot(
+    tickets: Iterable[Dict],
+    change_types: Dict[str, str],
+    incident_keys: Sequence[str],
+    root: str = SNAPSHOT_ROOT
+) -> str:
+    """
+    새 버전 스냅샷 저장 후 LATEST 갱신
+
+    Args:
+        tickets: JIRA 티켓 리스트
+        change_types: {issue_key: changeType}
+        incident_keys: INCIDENT#HISTORY issue_key 리스트
+        root: 스냅샷 루트 디렉토리 (버전별 하위 디렉토리)
+
+    Returns:
+        str: 스냅샷 디렉토리
+    """
+    version = datetime.now().strftime('%Y%m%d-%H%M%S')
+    snapshot_dir = os.path.join(root, version)
+    os.makedirs(snapshot_dir, exist_ok=True)
+
+    columns = build_columns(tickets, change_types, incident_keys)
+    if pa is not None:
+        table = pa.table({name: pa.array(values, type=_arrow_type(COLUMN_TYPES[name]))
+                          for name, values in columns.items()})
+        pq.write_table(table, os.path.join(snapshot_dir, PARQUET_FILE), compression='zstd')
+        storage = 'parquet'
+    else:
+        for name, values in columns.items():
+            with open(os.path.join(snapshot_dir, f'{name}.json'), 'w', encoding='utf-8') as f:
+                json.dump(values, f, ensure_ascii=False)
+        storage = 'json-columns'
+
+    manifest = {
+        'version': version,
+        'snapshot_version': SNAPSHOT_VERSION,
+        'created_at': time.time(),
+        'storage': storage,
+        'rows': len(columns['issue_key']),
+        'labeled': sum(1 for value in columns['change_type'] if value),
+        'incidents': len(set(incident_keys)),
+        'incident_keys': sorted(set(incident_keys)),
+        'columns': list(columns),
+    }
+    with open(os.path.join(snapshot_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    # 스냅샷이 완성된 뒤에만 LATEST 교체 (읽는 쪽은 항상 완전한 스냅샷을 봄)
+    latest_tmp = os.path.join(root, LATEST_FILE + '.tmp')
+    with open(latest_tmp, 'w', encoding='utf-8') as f:
+        f.write(version)
+    os.replace(latest_tmp, os.path.join(root, LATEST_FILE))
+    return snapshot_dir
+
+
+def latest_snapshot(root: str = SNAPSHOT_ROOT, max_age_hours: Optional[float] = DEFAULT_MAX_AGE_HOURS) -> Optional[str]:
+    """
+    최신 스냅샷 디렉토리 (없거나 max_age_hours보다 오래되면 None)
+
+    Args:
+        root: 스냅샷 루트 디렉토리
+        max_age_hours: 허용 경과 시간 (None이면 제한 없음)
+    """
+    try:
+        with open(os.path.join(root, LATEST_FILE), 'r', encoding='utf-8') as f:
+            snapshot_dir = os.path.join(root, f.read().strip())
+        with open(os.path.join(snapshot_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    if manifest.get('snapshot_version') != SNAPSHOT_VERSION:
+        return None
+    if max_age_hours is not None and time.time() - manifest['created_at'] > max_age_hours * 3600:
+        return None
+    return snapshot_dir
+
+
+class TicketSnapshot:
+    """스냅샷 읽기 (컬럼 단위)"""
+
+    def __init__(self, snapshot_dir: str):
+        with open(os.path.join(snapshot_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        self.snapshot_dir = snapshot_dir
+
+    def __len__(self) -> int:
+        return self.manifest['rows']
+
+    @property
+    def age_hours(self) -> float:
+        return (time.time() - self.manifest['created_at']) / 3600
+
+    def columns(self, names: Sequence[str]) -> Dict[str, list]:
+        """
+        지정 컬럼만 읽기 (Parquet은 해당 컬럼 chunk만 디스크에서 읽음)
+
+        Returns:
+            Dict[str, list]: {컬럼명: 값 리스트} (json 컬럼은 디코딩 전 문자열)
+        """
+        unknown = [name for name in names if name not in COLUMN_TYPES]
+        if unknown:
+            raise ValueError(f"Unknown snapshot columns: {', '.join(unknown)}")
+
+        if self.manifest['storage'] == 'parquet':
+            if pq is None:
+                raise ImportError("pyarrow is required to read a parquet snapshot")
+            table = pq.read_table(os.path.join(self.snapshot_dir, PARQUET_FILE), columns=list(names))
+            return table.to_pydict()
+
+        columns = {}
+        for name in names:
+            with open(os.path.join(self.snapshot_dir, f'{name}.json'), 'r', encoding='utf-8') as f:
+                columns[name] = json.load(f)
+        return columns
+
+    def tickets(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        issue_keys: Optional[Iterable[str]] = None,
+        compact: bool = False
+    ) -> List:
+        """
+        로더와 같은 필드명의 티켓 리스트 (필요한 컬럼만 포함)
+
+        Args:
+            columns: 읽을 컬럼 (None이면 전체, issue_key는 항상 포함)
+            issue_keys: 지정 시 해당 티켓만
+            compact: True이면 Ticket 객체 (댓글 JSON은 디코딩하지 않고 압축 보관)
+
+        Returns:
+            List: dict 또는 Ticket 리스트
+        """
+        names = [name for name in dict.fromkeys(['issue_key', *(columns or COLUMN_TYPES)]) if name != 'comment_count']
+        lazy_comments = compact and 'comments' in names
+        if lazy_comments:
+            names.remove('comments')
+        data = self.columns(names + (['comments', 'comment_count'] if lazy_comments else []))
+        wanted = set(issue_keys) if issue_keys is not None else None
+
+        tickets = []
+        for row, issue_key in enumerate(data['issue_key']):
+            if wanted is not None and issue_key not in wanted:
+                continue
+            ticket = {}
+            for name in names:
+                value = _decode(data[name][row], COLUMN_TYPES[name])
+                if value is not None:
+                    ticket[FIELD_BY_COLUMN.get(name, name)] = value
+            if compact:
+                ticket = Ticket.from_item(ticket)
+                if lazy_comments and data['comments'][row] is not None:
+                    ticket.comments = LazyComments.from_json(data['comments'][row], data['comment_count'][row])
+            tickets.append(ticket)
+        return tickets
+
+    def change_types(self) -> Dict[str, str]:
+        """{issue_key: changeType} (레이블된 티켓만)"""
+        data = self.columns(['issue_key', 'change_type'])
+        return {key: change_type for key, change_type in zip(data['issue_key'], data['change_type']) if change_type}
+
+    def incident_keys(self) -> List[str]:
+        """스냅샷 시점의 INCIDENT#HISTORY (이후 수정은 반영되지 않으므로 INCIDENT#HISTORY 저장에는 사용하지 않음)"""
+        return list(self.manifest.get('incident_keys', []))
+
+    def incident_rate_by_change_type(self, incident_keys: Optional[Iterable[str]] = None) -> Tuple[Dict, List[str]]:
+        """
+        변경 유형별 장애 발생 비율 (analyze_incident_risk와 같은 형태, 벡터화 group-by)
+
+        Args:
+            incident_keys: 장애 issue_key (None이면 스냅샷 시점의 is_incident 컬럼)
+
+        Returns:
+            tuple[Dict, List[str]]: (변경 유형별 통계, 레이블된 incident issue_key 리스트)
+        """
+        if incident_keys is None:
+            data = self.columns(['issue_key', 'change_type', 'is_incident'])
+            is_incident = np.array(data['is_incident'], dtype=bool)
+        else:
+            data = self.columns(['issue_key', 'change_type'])
+            incident_set = set(incident_keys)
+            is_incident = np.array([key in incident_set for key in data['issue_key']], dtype=bool)
+        change_type = np.array([value or '' for value in data['change_type']], dtype=object)
+        labeled = change_type != ''
+
+        names, inverse = np.unique(change_type[labeled], return_inverse=True)
+        totals = np.bincount(inverse, minlength=len(names))
+        incidents = np.bincount(inverse, weights=is_incident[labeled], minlength=len(names)).astype(int)
+
+        stats = {
+            str(name): {
+                'total': int(total),
+                'incidents': int(count),
+                'incident_rate': float(count / total) if total else 0.0,
+            }
+            for name, total, count in zip(names, totals, incidents)
+        }
+        issue_keys = np.array(data['issue_key'], dtype=object)
+        return stats, issue_keys[labeled & is_incident].tolist()
+
+
+def ensure_snapshot(
+    loader,
+    root: str = SNAPSHOT_ROOT,
+    max_age_hours: Optional[float] = DEFAULT_MAX_AGE_HOURS,
+    refresh: bool = False
+) -> TicketSnapshot:
+    """
+    최신 스냅샷 재사용, 없거나 오래되었으면 DynamoDB에서 전체 티켓을 읽어 새로 저장
+
+    Args:
+        loader: JiraDataLoader
+        root: 스냅샷 루트 디렉토리
+        max_age_hours: 재사용 허용 경과 시간
+        refresh: True이면 항상 새로 저장
+
+    Returns:
+        TicketSnapshot
+    """
+    snapshot_dir = None if refresh else latest_snapshot(root, max_age_hours)
+    if snapshot_dir:
+        snapshot = TicketSnapshot(snapshot_dir)
+        print(f"  Using ticket snapshot {snapshot.manifest['version']} "
+              f"({len(snapshot)} tickets, {snapshot.age_hours:.1f}h old)")
+        return snapshot
+
+    print("  Exporting ticket snapshot from DynamoDB...")
+    incident_keys = loader.get_incident_history()
+    change_types = loader.get_existing_change_types()
+    issue_keys = set(loader.get_incident_issue_keys())
+    issue_keys.update(change_types)
+    issue_keys.update(incident_keys)
+    tickets = loader.get_tickets_from_dynamodb(sorted(issue_keys))
+
+    snapshot = TicketSnapshot(write_snapshot(tickets, change_types, incident_keys, root))
+    print(f"  Snapshot {snapshot.manifest['version']} saved ({len(snapshot)} tickets, "
+          f"{snapshot.manifest['storage']}): {snapshot.snapshot_dir}")
+    return snapshot
@@ -0,0 +1,1115 @@
+"""
+사전 토큰화(memmap) 기반 변경 유형 분류기
+토큰화 결과를 NumPy memmap으로 저장하고, 학습 시 복사 없이 배치 단위로 읽습니다.
+"""
+import os
+import json
+import time
+import hashlib
+import resource
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import torch
+import torch.distributed as dist
+from torch.nn.parallel import DistributedDataParallel
+from torch.utils.data import DataLoader, Dataset, Sampler
+from transformers import AutoModelForSequenceClassification, AutoTokenizer, get_linear_schedule_with_warmup
+
+# 사전 토큰화 캐시 포맷 버전 (포맷 변경 시 올려서 재토큰화)
+TOKENIZED_CACHE_VERSION = 2
+MAX_SEQ_LENGTH = 512
+MANIFEST_FILE = 'manifest.json'
+
+# 모델 산출물: safetensors 가중치 + 토크나이저 + 레이블 맵 (pickle 미사용)
+LABEL_MAP_FILE = 'label_map.json'
+WEIGHTS_FILE = 'model.safetensors'
+ARTIFACT_FORMAT = 'safetensors-v1'
+
+# 코퍼스 길이 분포 기반 truncation 길이 (백분위, 하한, 배수)
+LENGTH_PERCENTILE = 95.0
+MIN_SEQ_LENGTH = 32
+SEQ_LENGTH_MULTIPLE = 8
+
+# 분산 학습 시 rank 0의 데이터 준비/토큰화를 기다리는 최대 시간
+DISTRIBUTED_TIMEOUT = timedelta(hours=2)
+
+
+def configure_cpu_threads(num_threads: Optional[int] = None, interop_threads: Optional[int] = None) -> Dict[str, int]:
+    """
+    CPU 학습/추론 스레드 설정
+
+    Args:
+        num_threads: intra-op 스레드 수 (None이면 물리 코어 수 기준 기본값 유지)
+        interop_threads: inter-op 스레드 수 (None이면 기본값 유지, 병렬 작업 시작 전에만 변경 가능)
+
+    Returns:
+        Dict[str, int]: 적용된 스레드 수
+    """
+    if num_threads:
+        torch.set_num_threads(num_threads)
+    if interop_threads:
+        try:
+            torch.set_interop_threads(interop_threads)
+        except RuntimeError as e:
+            print(f"Warning: Failed to set inter-op threads: {e}")
+    return {'intra_op': torch.get_num_threads(), 'inter_op': torch.get_num_interop_threads()}
+
+
+def setup_distributed(use_cuda: bool) -> Optional[Dict]:
+    """
+    torchrun 환경변수(RANK, WORLD_SIZE, LOCAL_RANK)로 프로세스 그룹 초기화
+
+    GPU 사용 시 NCCL, CPU면 gloo 백엔드 (단일 서버에서 여러 프로세스로 테스트 가능)
+
+    Args:
+        use_cuda: GPU 사용 여부
+
+    Returns:
+        Dict: rank, world_size, local_rank, backend, device (torchrun 실행이 아니면 None)
+    """
+    world_size = int(os.environ.get('WORLD_SIZE', '1'))
+    if world_size <= 1:
+        return None
+
+    rank = int(os.environ['RANK'])
+    local_rank = int(os.environ.get('LOCAL_RANK', '0'))
+    backend = 'nccl' if use_cuda else 'gloo'
+    if use_cuda:
+        torch.cuda.set_device(local_rank)
+    if not dist.is_initialized():
+        dist.init_process_group(backend=backend, timeout=DISTRIBUTED_TIMEOUT)
+
+    return {
+        'rank': rank,
+        'world_size': world_size,
+        'local_rank': local_rank,
+        'backend': backend,
+        'device': f"cuda:{local_rank}" if use_cuda else 'cpu',
+    }
+
+
+def cleanup_distributed():
+    """프로세스 그룹 정리 (초기화되지 않았으면 무시)"""
+    if dist.is_initialized():
+        dist.destroy_process_group()
+
+
+def broadcast_object(obj=None, src: int = 0):
+    """src rank의 객체를 전체 rank에 전달 (분산 실행이 아니면 그대로 반환)"""
+    if not dist.is_initialized():
+        return obj
+    payload = [obj]
+    dist.broadcast_object_list(payload, src=src)
+    return payload[0]
+
+
+def corpus_fingerprint(texts: List[str], labels: List[str], tokenizer_name: str, max_length_setting: str) -> str:
+    """
+    코퍼스 + 토크나이저 설정 해시 (같으면 재토큰화 생략)
+
+    Args:
+        texts: 텍스트 리스트
+        labels: 레이블 리스트
+        tokenizer_name: 토크나이저 이름
+        max_length_setting: 최대 토큰 길이 설정 (고정값 또는 'p95' 등 백분위)
+
+    Returns:
+        str: sha256 hex digest
+    """
+    digest = hashlib.sha256(f"{TOKENIZED_CACHE_VERSION}|{tokenizer_name}|{max_length_setting}".encode('utf-8'))
+    for text, label in zip(texts, labels):
+        digest.update(label.encode('utf-8'))
+        digest.update(b'\x00')
+        digest.update(text.encode('utf-8'))
+        digest.update(b'\x01')
+    return digest.hexdigest()
+
+
+class TokenizedCorpus:
+    """사전 토큰화 캐시 (manifest.json + memmap 배열)"""
+
+    def __init__(self, cache_dir: str):
+        """
+        Args:
+            cache_dir: pretokenize_corpus가 생성한 디렉토리
+        """
+        with open(os.path.join(cache_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+
+        self.cache_dir = cache_dir
+        self.label_names = self.manifest['label_names']
+        self.max_length = self.manifest['max_length']
+        self.tokenizer_name = self.manifest['tokenizer_name']
+
+        # mmap_mode='r': 필요한 페이지만 읽으며 전체 배열을 메모리에 올리지 않음
+        self.input_ids = np.load(os.path.join(cache_dir, 'input_ids.npy'), mmap_mode='r')
+        self.attention_mask = np.load(os.path.join(cache_dir, 'attention_mask.npy'), mmap_mode='r')
+        self.label_ids = np.load(os.path.join(cache_dir, 'label_ids.npy'), mmap_mode='r')
+        self.lengths = np.load(os.path.join(cache_dir, 'lengths.npy'), mmap_mode='r')
+
+    def __len__(self) -> int:
+        return len(self.label_ids)
+
+    @property
+    def labels(self) -> List[str]:
+        """레이블 문자열 리스트"""
+        return [self.label_names[i] for i in self.label_ids]
+
+    def static_padding_ratio(self, indices: Optional[np.ndarray] = None) -> float:
+        """max_length 고정 padding 시 pad 토큰 비율"""
+        lengths = np.asarray(self.lengths) if indices is None else np.asarray(self.lengths)[indices]
+        total = len(lengths) * self.max_length
+        return 1.0 - float(lengths.sum()) / total if total else 0.0
+
+
+def choose_max_length(lengths: np.ndarray, percentile: float = LENGTH_PERCENTILE) -> int:
+    """
+    코퍼스 토큰 길이 백분위로 truncation 길이 결정
+
+    Args:
+        lengths: 샘플별 토큰 길이 (special token 포함, MAX_SEQ_LENGTH 이하)
+        percentile: 백분위 (95이면 95% 샘플이 잘리지 않음)
+
+    Returns:
+        int: SEQ_LENGTH_MULTIPLE 배수로 올림한 길이 (MIN_SEQ_LENGTH ~ MAX_SEQ_LENGTH)
+    """
+    if len(lengths) == 0:
+        return MAX_SEQ_LENGTH
+    length = int(np.ceil(np.percentile(lengths, percentile)))
+    length = int(np.ceil(length / SEQ_LENGTH_MULTIPLE) * SEQ_LENGTH_MULTIPLE)
+    return max(MIN_SEQ_LENGTH, min(MAX_SEQ_LENGTH, length))
+
+
+def pretokenize_corpus(
+    texts: List[str],
+    labels: List[str],
+    tokenizer_name: str,
+    cache_dir: str,
+    max_length: Optional[int] = None,
+    length_percentile: float = LENGTH_PERCENTILE,
+    chunk_size: int = 1024,
+    label_names: Optional[List[str]] = None
+) -> TokenizedCorpus:
+    """
+    텍스트를 토큰화하여 memmap 배열로 저장 (동일 코퍼스면 재사용)
+
+    생성 파일:
+        input_ids.npy (int32), attention_mask.npy (int8), label_ids.npy (int16),
+        lengths.npy (int16), manifest.json
+
+    Args:
+        texts: 텍스트 리스트
+        labels: 레이블 리스트
+        tokenizer_name: 토크나이저 이름 (예: klue/bert-base)
+        cache_dir: 저장 디렉토리
+        max_length: 최대 토큰 길이 (None이면 코퍼스 길이 백분위로 결정)
+        length_percentile: max_length 자동 결정 시 백분위
+        chunk_size: 토큰화 단위 (메모리 사용량 제한)
+        label_names: 레이블 id 순서 (이전 모델 이어 학습 시 동일 순서 유지, None이면 정렬 순서)
+
+    Returns:
+        TokenizedCorpus
+    """
+    label_names = list(label_names) if label_names else sorted(set(labels))
+    max_length_setting = str(max_length) if max_length else f"p{length_percentile:g}"
+    max_length_setting = f"{max_length_setting}|{','.join(label_names)}"
+    fingerprint = corpus_fingerprint(texts, labels, tokenizer_name, max_length_setting)
+    manifest_path = os.path.join(cache_dir, MANIFEST_FILE)
+
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('fingerprint') == fingerprint:
+            print(f"  Tokenized cache hit: {cache_dir} ({manifest['num_samples']} samples)")
+            return TokenizedCorpus(cache_dir)
+
+    started = time.perf_counter()
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # 이전 manifest 제거 (중간 실패 시 불완전한 캐시 재사용 방지)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    tokenizer = AutoTokenizer.from_pretrained(tokenizer_name)
+    label_to_id = {label: i for i, label in enumerate(label_names)}
+
+    num_samples = len(texts)
+
+    if not max_length:
+        # 1차: 전체 길이 분포 측정 (MAX_SEQ_LENGTH까지)
+        full_lengths = np.zeros(num_samples, dtype=np.int32)
+        for start in range(0, num_samples, chunk_size):
+            encoded = tokenizer(texts[start:start + chunk_size], max_length=MAX_SEQ_LENGTH, truncation=True)
+            full_lengths[start:start + chunk_size] = [len(ids) for ids in encoded['input_ids']]
+
+        max_length = choose_max_length(full_lengths, length_percentile)
+        truncated = int((full_lengths > max_length).sum())
+        print(f"  Token length p50/p{length_percentile:g}/max: "
+              f"{int(np.percentile(full_lengths, 50))}/{int(np.percentile(full_lengths, length_percentile))}/"
+              f"{int(full_lengths.max()) if num_samples else 0} → max_length={max_length} "
+              f"({truncated} samples truncated)")
+
+    print(f"  Tokenizing {num_samples} samples with {tokenizer_name} (max_length={max_length})...")
+    input_ids = np.lib.format.open_memmap(
+        os.path.join(cache_dir, 'input_ids.npy'), mode='w+', dtype=np.int32, shape=(num_samples, max_length)
+    )
+    attention_mask = np.lib.format.open_memmap(
+        os.path.join(cache_dir, 'attention_mask.npy'), mode='w+', dtype=np.int8, shape=(num_samples, max_length)
+    )
+    label_ids = np.lib.format.open_memmap(
+        os.path.join(cache_dir, 'label_ids.npy'), mode='w+', dtype=np.int16, shape=(num_samples,)
+    )
+    lengths = np.lib.format.open_memmap(
+        os.path.join(cache_dir, 'lengths.npy'), mode='w+', dtype=np.int16, shape=(num_samples,)
+    )
+
+    for start in range(0, num_samples, chunk_size):
+        end = min(start + chunk_size, num_samples)
+        encoded = tokenizer(
+            texts[start:end],
+            max_length=max_length,
+            truncation=True,
+            padding='max_length',
+            return_tensors='np'
+        )
+        input_ids[start:end] = encoded['input_ids']
+        attention_mask[start:end] = encoded['attention_mask']
+        label_ids[start:end] = [label_to_id[label] for label in labels[start:end]]
+        lengths[start:end] = encoded['attention_mask'].sum(axis=1)
+
+    input_ids.flush()
+    attention_mask.flush()
+    label_ids.flush()
+    lengths.flush()
+    del input_ids, attention_mask, label_ids, lengths
+
+    tokenizer.save_pretrained(os.path.join(cache_dir, 'tokenizer'))
+
+    manifest = {
+        'version': TOKENIZED_CACHE_VERSION,
+        'fingerprint': fingerprint,
+        'tokenizer_name': tokenizer_name,
+        'max_length': max_length,
+        'max_length_setting': max_length_setting,
+        'num_samples': num_samples,
+        'label_names': label_names,
+    }
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    print(f"  ✓ Tokenized in {time.perf_counter() - started:.1f}s → {cache_dir}")
+    return TokenizedCorpus(cache_dir)
+
+
+class MemmapTokenDataset(Dataset):
+    """TokenizedCorpus의 부분 집합 (인덱스만 보관)"""
+
+    def __init__(self, corpus: TokenizedCorpus, indices: Optional[np.ndarray] = None):
+        self.corpus = corpus
+        self.indices = np.arange(len(corpus)) if indices is None else np.asarray(indices)
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, idx: int) -> int:
+        # 실제 배열 읽기는 collate에서 배치 단위로 수행
+        return int(self.indices[idx])
+
+
+class LengthBucketBatchSampler(Sampler):
+    """
+    길이가 비슷한 샘플끼리 배치를 구성하는 sampler
+
+    에폭마다 인덱스를 섞은 뒤 batch_size * bucket_multiplier 단위 버킷 안에서 길이순 정렬,
+    배치로 자른 후 배치 순서를 다시 섞는다.
+    """
+
+    def __init__(
+        self,
+        lengths: np.ndarray,
+        indices: np.ndarray,
+        batch_size: int,
+        bucket_multiplier: int = 50,
+        shuffle: bool = True,
+        seed: int = 42,
+        num_replicas: int = 1,
+        rank: int = 0
+    ):
+        self.lengths = np.asarray(lengths)
+        self.indices = np.asarray(indices)
+        self.batch_size = batch_size
+        self.bucket_size = batch_size * bucket_multiplier
+        self.shuffle = shuffle
+        self.seed = seed
+        self.num_replicas = num_replicas
+        self.rank = rank
+        self.epoch = 0
+
+    def set_epoch(self, epoch: int):
+        """에폭별 셔플 시드 변경"""
+        self.epoch = epoch
+
+    def _epoch_indices(self, rng: np.random.Generator) -> np.ndarray:
+        """에폭에 사용할 인덱스 순서"""
+        return rng.permutation(self.indices) if self.shuffle else self.indices
+
+    def __iter__(self):
+        rng = np.random.default_rng(self.seed + self.epoch)
+        indices = self._epoch_indices(rng)
+
+        batches = []
+        for start in range(0, len(indices), self.bucket_size):
+            bucket = indices[start:start + self.bucket_size]
+            bucket = bucket[np.argsort(self.lengths[bucket], kind='stable')]
+            batches.extend(
+                bucket[i:i + self.batch_size].tolist() for i in range(0, len(bucket), self.batch_size)
+            )
+
+        if self.shuffle:
+            rng.shuffle(batches)
+
+        if self.num_replicas > 1:
+            # 모든 rank가 같은 시드로 같은 배치 목록을 만들고 순번으로 나눠 가짐.
+            # step 수가 같아야 gradient all-reduce가 맞으므로 앞쪽 배치를 반복해 채움
+            padded = len(self) * self.num_replicas
+            batches = (batches * (padded // max(1, len(batches)) + 1))[:padded]
+            batches = batches[self.rank::self.num_replicas]
+        return iter(batches)
+
+    def __len__(self) -> int:
+        num_batches = (len(self.indices) + self.batch_size - 1) // self.batch_size
+        return (num_batches + self.num_replicas - 1) // self.num_replicas
+
+
+class WeightedBucketBatchSampler(LengthBucketBatchSampler):
+    """
+    샘플 가중치로 복원 추출하는 sampler (incident boost/클래스 균형 대체)
+
+    에폭 길이는 실제 샘플 수와 같고, 추출된 인덱스는 LengthBucketBatchSampler와
+    같은 방식으로 배치를 구성한다 (bucket_multiplier=1이면 길이 정렬 효과 없음).
+    """
+
+    def __init__(
+        self,
+        lengths: np.ndarray,
+        indices: np.ndarray,
+        weights: np.ndarray,
+        batch_size: int,
+        bucket_multiplier: int = 50,
+        seed: int = 42,
+        num_replicas: int = 1,
+        rank: int = 0
+    ):
+        super().__init__(
+            lengths, indices, batch_size,
+            bucket_multiplier=bucket_multiplier, shuffle=True, seed=seed,
+            num_replicas=num_replicas, rank=rank
+        )
+        weights = np.asarray(weights, dtype=np.float64)[self.indices]
+        self.probabilities = weights / weights.sum()
+
+    def _epoch_indices(self, rng: np.random.Generator) -> np.ndarray:
+        return rng.choice(self.indices, size=len(self.indices), replace=True, p=self.probabilities)
+
+
+def stratified_split(
+    label_ids: np.ndarray,
+    validation_ratio: float,
+    seed: int = 42
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    레이블 비율을 유지한 학습/검증 인덱스 분할
+
+    샘플이 2개 이상인 클래스는 검증에 최소 1개 배정 (1개뿐인 클래스는 학습에만 사용)
+
+    Args:
+        label_ids: 샘플별 레이블 id
+        validation_ratio: 검증 비율 (0이면 검증 없음)
+        seed: 분할 시드
+
+    Returns:
+        (train_indices, validation_indices)
+    """
+    label_ids = np.asarray(label_ids)
+    rng = np.random.default_rng(seed)
+    train_parts, validation_parts = [], []
+
+    for label in np.unique(label_ids):
+        members = rng.permutation(np.flatnonzero(label_ids == label))
+        count = int(round(len(members) * validation_ratio)) if validation_ratio > 0 else 0
+        if validation_ratio > 0 and len(members) >= 2:
+            count = min(max(count, 1), len(members) - 1)
+        validation_parts.append(members[:count])
+        train_parts.append(members[count:])
+
+    return np.sort(np.concatenate(train_parts)), np.sort(np.concatenate(validation_parts))
+
+
+def stratified_kfold(label_ids: np.ndarray, folds: int, seed: int = 42) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    레이블 비율을 유지한 k-fold 분할
+
+    Args:
+        label_ids: 샘플별 레이블 id
+        folds: fold 수
+        seed: 분할 시드
+
+    Returns:
+        List[(train_indices, validation_indices)]: fold별 분할
+    """
+    label_ids = np.asarray(label_ids)
+    rng = np.random.default_rng(seed)
+    assignment = np.empty(len(label_ids), dtype=np.int64)
+
+    # 클래스별로 섞은 뒤 순번대로 fold 배정 (fold마다 클래스 비율 유사)
+    for label in np.unique(label_ids):
+        members = rng.permutation(np.flatnonzero(label_ids == label))
+        assignment[members] = np.arange(len(members)) % folds
+
+    return [
+        (np.flatnonzero(assignment != fold), np.flatnonzero(assignment == fold))
+        for fold in range(folds)
+    ]
+
+
+def macro_f1(y_true: np.ndarray, y_pred: np.ndarray, num_labels: int) -> float:
+    """검증 데이터에 존재하는 클래스 기준 macro-F1"""
+    scores = []
+    for label in range(num_labels):
+        support = np.sum(y_true == label)
+        if support == 0:
+            continue
+        true_positive = np.sum((y_true == label) & (y_pred == label))
+        predicted = np.sum(y_pred == label)
+        precision = true_positive / predicted if predicted else 0.0
+        recall = true_positive / support
+        scores.append(2 * precision * recall / (precision + recall) if precision + recall else 0.0)
+    return float(np.mean(scores)) if scores else 0.0
+
+
+def perturb_probabilities(weights: np.ndarray) -> np.ndarray:
+    """
+    샘플별 변형 확률 (가중치 w인 샘플은 추출 중 1/w만 원본, 나머지는 변형)
+
+    기존 방식에서 원본 1개 + 변형 복제 (w-1)개를 만들던 것과 같은 비율
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    return np.where(weights > 1.0, 1.0 - 1.0 / np.maximum(weights, 1.0), 0.0)
+
+
+class TokenBatchCollator:
+    """배치 인덱스로 memmap에서 텐서를 만드는 collate 함수 (배치 최대 길이로 dynamic padding)"""
+
+    def __init__(
+        self,
+        corpus: TokenizedCorpus,
+        dynamic_padding: bool = True,
+        perturb_probs: Optional[np.ndarray] = None,
+        seed: int = 42
+    ):
+        """
+        Args:
+            corpus: TokenizedCorpus
+            dynamic_padding: 배치 최대 길이로 자를지 여부
+            perturb_probs: 샘플별 변형 확률 (None이면 변형 없음)
+            seed: 변형 난수 시드
+        """
+        self.corpus = corpus
+        self.dynamic_padding = dynamic_padding
+        self.perturb_probs = perturb_probs
+        self.rng = np.random.default_rng(seed)
+        self.real_tokens = 0
+        self.padded_tokens = 0
+        self.perturbed = 0
+
+    @property
+    def padding_ratio(self) -> float:
+        """지금까지 만든 배치의 pad 토큰 비율"""
+        return 1.0 - self.real_tokens / self.padded_tokens if self.padded_tokens else 0.0
+
+    def __call__(self, batch_indices: List[int]) -> Dict[str, torch.Tensor]:
+        # 정렬된 인덱스로 읽어 memmap 페이지 접근을 순차화
+        rows = np.sort(np.asarray(batch_indices))
+        lengths = np.asarray(self.corpus.lengths[rows])
+        width = int(lengths.max()) if self.dynamic_padding and len(rows) else self.corpus.max_length
+
+        self.real_tokens += int(lengths.sum())
+        self.padded_tokens += width * len(rows)
+
+        input_ids = self.corpus.input_ids[rows, :width].astype(np.int64)
+        if self.perturb_probs is not None:
+            self._perturb(input_ids, rows, lengths)
+
+        return {
+            'input_ids': torch.from_numpy(input_ids),
+            'attention_mask': torch.from_numpy(self.corpus.attention_mask[rows, :width].astype(np.int64)),
+            'labels': torch.from_numpy(self.corpus.label_ids[rows].astype(np.int64)),
+        }
+
+    def _perturb(self, input_ids: np.ndarray, rows: np.ndarray, lengths: np.ndarray):
+        """
+        추출마다 확률적으로 인접 토큰 1쌍 스왑 (augment_single_text의 토큰 버전)
+
+        [CLS]/[SEP]는 건드리지 않으며, 본문 토큰이 3개 이하면 변형하지 않음
+        """
+        draws = self.rng.random(len(rows))
+        for i, (row, length) in enumerate(zip(rows, lengths)):
+            body = int(length) - 2
+            if body <= 3 or draws[i] >= self.perturb_probs[row]:
+                continue
+            pos = 1 + int(self.rng.integers(0, body - 1))
+            input_ids[i, pos], input_ids[i, pos + 1] = input_ids[i, pos + 1], input_ids[i, pos]
+            self.perturbed += 1
+
+
+def peak_memory() -> Dict[str, float]:
+    """프로세스 최대 RSS와 CUDA 최대 할당 메모리 (MB)"""
+    # Linux ru_maxrss 단위는 KB
+    memory = {'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}
+    if torch.cuda.is_available():
+        memory['peak_cuda_mb'] = torch.cuda.max_memory_allocated() / (1024 * 1024)
+    return memory
+
+
+class TrainingTelemetry:
+    """
+    학습 step/epoch 단위 계측 (JSONL 기록)
+
+    step 레코드: data_wait, forward, backward, optimizer 시간(초), 샘플/토큰 수
+    epoch 레코드: 구간별 합계, samples/sec, tokens/sec, 최대 RSS/CUDA 메모리
+    GPU 사용 시 구간 경계마다 동기화해 비동기 실행 시간을 정확히 나눔
+    """
+
+    STAGES = ('data_wait', 'forward', 'backward', 'optimizer')
+
+    def __init__(self, path: str, device: torch.device, step_interval: int = 10):
+        """
+        Args:
+            path: JSONL 파일 경로 (모델 산출물과 같은 위치)
+            device: 학습 장치
+            step_interval: step 레코드 기록 간격 (합계는 모든 step 반영)
+        """
+        self.path = path
+        self.device = device
+        self.step_interval = step_interval
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.file = open(path, 'w', encoding='utf-8')
+        self.epochs = []
+        self._reset_epoch()
+
+    def _reset_epoch(self):
+        self.totals = {stage: 0.0 for stage in self.STAGES}
+        self.samples = 0
+        self.tokens = 0
+        self.padded_tokens = 0
+        self.steps = 0
+
+    def _write(self, record: Dict):
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def sync(self):
+        """GPU 작업 완료 대기 (CPU면 무시)"""
+        if self.device.type == 'cuda':
+            torch.cuda.synchronize(self.device)
+
+    def step(self, epoch: int, timings: Dict[str, float], samples: int, tokens: int, padded_tokens: int):
+        """step 1회 계측 누적"""
+        self.steps += 1
+        self.samples += samples
+        self.tokens += tokens
+        self.padded_tokens += padded_tokens
+        for stage in self.STAGES:
+            self.totals[stage] += timings[stage]
+
+        if self.steps % self.step_interval == 0:
+            self._write({
+                'type': 'step', 'epoch': epoch, 'step': self.steps,
+                **{stage: round(timings[stage], 6) for stage in self.STAGES},
+                'samples': samples, 'tokens': tokens, 'padded_tokens': padded_tokens,
+            })
+
+    def end_epoch(self, epoch: int, seconds: float, **extra) -> Dict:
+        """epoch 레코드 기록 후 누적값 초기화"""
+        record = {
+            'type': 'epoch',
+            'epoch': epoch,
+            'steps': self.steps,
+            'seconds': round(seconds, 3),
+            **{f"{stage}_seconds": round(self.totals[stage], 3) for stage in self.STAGES},
+            'samples': self.samples,
+            'tokens': self.tokens,
+            'samples_per_sec': round(self.samples / seconds, 2) if seconds > 0 else 0.0,
+            'tokens_per_sec': round(self.tokens / seconds, 1) if seconds > 0 else 0.0,
+            'padded_tokens_per_sec': round(self.padded_tokens / seconds, 1) if seconds > 0 else 0.0,
+            **{k: round(v, 1) for k, v in peak_memory().items()},
+            **extra,
+        }
+        self._write(record)
+        self.file.flush()
+        self.epochs.append(record)
+        self._reset_epoch()
+        return record
+
+    def summary(self) -> Dict:
+        """전체 epoch 합계 (main() 종료 시 출력용)"""
+        if not self.epochs:
+            return {}
+        seconds = sum(e['seconds'] for e in self.epochs)
+        samples = sum(e['samples'] for e in self.epochs)
+        tokens = sum(e['tokens'] for e in self.epochs)
+        summary = {
+            'path': self.path,
+            'epochs': len(self.epochs),
+            'seconds': round(seconds, 3),
+            **{f"{stage}_seconds": round(sum(e[f"{stage}_seconds"] for e in self.epochs), 3)
+               for stage in self.STAGES},
+            'samples_per_sec': round(samples / seconds, 2) if seconds > 0 else 0.0,
+            'tokens_per_sec': round(tokens / seconds, 1) if seconds > 0 else 0.0,
+        }
+        summary.update({k: max(e.get(k, 0.0) for e in self.epochs) for k in ('peak_rss_mb', 'peak_cuda_mb')
+                        if k in self.epochs[-1]})
+        return summary
+
+    def close(self):
+        self.file.close()
+
+
+def print_telemetry_summary(summary: Dict):
+    """학습 telemetry 요약 출력 (구간별 시간 비중, 처리량, 최대 메모리)"""
+    if not summary:
+        return
+    print(f"\n[Training Telemetry] {summary['epochs']} epochs, {summary['seconds']:.1f}s ({summary['path']})")
+    for stage in TrainingTelemetry.STAGES:
+        seconds = summary[f"{stage}_seconds"]
+        share = seconds / summary['seconds'] * 100 if summary['seconds'] > 0 else 0.0
+        print(f"  {stage:<12} {seconds:>9.2f}s  ({share:5.1f}%)")
+    print(f"  throughput   {summary['samples_per_sec']:,.1f} samples/s, {summary['tokens_per_sec']:,.0f} tokens/s")
+    memory = f"  peak memory  RSS {summary.get('peak_rss_mb', 0.0):,.0f} MB"
+    if 'peak_cuda_mb' in summary:
+        memory += f", CUDA {summary['peak_cuda_mb']:,.0f} MB"
+    print(memory)
+
+
+class TokenizedChangeTypeClassifier:
+    """사전 토큰화 코퍼스로 학습하는 BERT 변경 유형 분류기"""
+
+    def __init__(
+        self,
+        model_name: str = 'klue/bert-base',
+        batch_size: int = 16,
+        learning_rate: float = 2e-5,
+        num_epochs: int = 3,
+        use_class_weight: bool = True,
+        device: Optional[str] = None,
+        bucket_by_length: bool = True,
+        seed: int = 42,
+        bf16: bool = False
+    ):
+        """
+        Args:
+            model_name: 사전학습 모델 이름
+            batch_size: 배치 크기
+            learning_rate: 학습률
+            num_epochs: 에폭 수
+            use_class_weight: 클래스 빈도 역수 가중치 사용 여부
+            device: 'cuda' 또는 'cpu' (None이면 자동 선택)
+            bucket_by_length: 길이 버킷 배치 + dynamic padding 사용 여부
+            seed: 셔플 시드
+            bf16: bfloat16 autocast 사용 여부 (CPU는 AVX512-BF16/AMX 지원 시 효과)
+        """
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.learning_rate = learning_rate
+        self.num_epochs = num_epochs
+        self.use_class_weight = use_class_weight
+        self.bucket_by_length = bucket_by_length
+        self.seed = seed
+        self.bf16 = bf16
+        self.device = torch.device(device or ('cuda' if torch.cuda.is_available() else 'cpu'))
+        self.model = None
+        self.tokenizer = None
+        self.label_names = []
+        self.max_length = MAX_SEQ_LENGTH
+        self.rank = dist.get_rank() if dist.is_initialized() else 0
+        self.world_size = dist.get_world_size() if dist.is_initialized() else 1
+
+    def _log(self, message: str):
+        """분산 학습 시 rank 0만 출력"""
+        if self.rank == 0:
+            print(message)
+
+    def _autocast(self):
+        """bf16 옵션에 따른 autocast 컨텍스트"""
+        return torch.autocast(device_type=self.device.type, dtype=torch.bfloat16, enabled=self.bf16)
+
+    def _class_weights(self, corpus: TokenizedCorpus, indices: np.ndarray) -> torch.Tensor:
+        """클래스 빈도 역수 가중치 (평균 1로 정규화)"""
+        counts = np.bincount(np.asarray(corpus.label_ids)[indices], minlength=len(corpus.label_names))
+        weights = np.where(counts > 0, len(indices) / (len(counts) * np.maximum(counts, 1)), 0.0)
+        return torch.tensor(weights, dtype=torch.float32, device=self.device)
+
+    @torch.no_grad()
+    def _evaluate(self, corpus: TokenizedCorpus, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """memmap 코퍼스 샘플 예측 (길이순 배치), (정답, 예측) 레이블 id 반환"""
+        self.model.eval()
+        collator = TokenBatchCollator(corpus, dynamic_padding=True)
+        ordered = indices[np.argsort(np.asarray(corpus.lengths)[indices], kind='stable')]
+        y_true, y_pred = [], []
+
+        for start in range(0, len(ordered), self.batch_size):
+            batch = collator(ordered[start:start + self.batch_size].tolist())
+            with self._autocast():
+                logits = self.model(
+                    input_ids=batch['input_ids'].to(self.device),
+                    attention_mask=batch['attention_mask'].to(self.device)
+                ).logits
+            y_true.append(batch['labels'].numpy())
+            y_pred.append(logits.float().argmax(dim=-1).cpu().numpy())
+
+        return np.concatenate(y_true), np.concatenate(y_pred)
+
+    def train(
+        self,
+        corpus: TokenizedCorpus,
+        indices: Optional[np.ndarray] = None,
+        sample_weights: Optional[np.ndarray] = None,
+        init_model_dir: Optional[str] = None,
+        validation_indices: Optional[np.ndarray] = None,
+        patience: int = 2,
+        telemetry_path: Optional[str] = None
+    ) -> Dict:
+        """
+        사전 토큰화 코퍼스로 학습
+
+        Args:
+            corpus: TokenizedCorpus
+            indices: 학습에 사용할 샘플 인덱스 (None이면 전체)
+            sample_weights: 코퍼스 행별 추출 가중치 (None이면 균등 셔플).
+                지정하면 가중치 복원 추출 + 추출별 토큰 변형을 하고 loss 클래스 가중치는 사용하지 않음
+            init_model_dir: save()로 저장한 이전 모델 경로 (지정 시 사전학습 모델 대신 이어서 학습)
+            validation_indices: 검증 샘플 인덱스. 지정하면 에폭마다 macro-F1을 계산하고
+                patience 에폭 동안 개선이 없으면 중단, 최고 성능 에폭의 가중치로 복원
+            patience: 조기 종료 전 허용하는 무개선 에폭 수
+            telemetry_path: step/epoch 계측 JSONL 경로 (None이면 기록 안 함, 분산 학습은 rank 0만 기록)
+
+        Returns:
+            Dict: 학습 결과 요약 (epoch별 loss/검증 macro-F1, 소요 시간, 조기 종료 정보)
+        """
+        indices = np.arange(len(corpus)) if indices is None else np.asarray(indices)
+        if validation_indices is not None:
+            overlap = np.intersect1d(indices, validation_indices)
+            if len(overlap):
+                raise ValueError(f"{len(overlap)} rows are in both train and validation indices (e.g. {overlap[:5].tolist()})")
+        self.label_names = list(corpus.label_names)
+        self.max_length = corpus.max_length
+        self.tokenizer = AutoTokenizer.from_pretrained(os.path.join(corpus.cache_dir, 'tokenizer'))
+
+        if init_model_dir:
+            with open(os.path.join(init_model_dir, LABEL_MAP_FILE), 'r', encoding='utf-8') as f:
+                previous_labels = json.load(f)['label_names']
+            if previous_labels != self.label_names:
+                raise ValueError(
+                    f"Label set changed since {init_model_dir}: {previous_labels} → {self.label_names}"
+                )
+            self._log(f"  Warm start from {init_model_dir}")
+            self.model = AutoModelForSequenceClassification.from_pretrained(init_model_dir).to(self.device)
+        else:
+            self.model = AutoModelForSequenceClassification.from_pretrained(
+                self.model_name, num_labels=len(self.label_names)
+            ).to(self.device)
+
+        # 분산 학습: rank별로 배치를 나눠 받고 DDP가 backward 중 gradient all-reduce
+        distributed = self.world_size > 1
+        if distributed:
+            device_ids = [self.device.index] if self.device.type == 'cuda' else None
+            train_model = DistributedDataParallel(self.model, device_ids=device_ids)
+        else:
+            train_model = self.model
+        shard = {'num_replicas': self.world_size, 'rank': self.rank}
+
+        if sample_weights is not None:
+            sample_weights = np.asarray(sample_weights, dtype=np.float64)
+            collator = TokenBatchCollator(
+                corpus,
+                dynamic_padding=self.bucket_by_length,
+                perturb_probs=perturb_probabilities(sample_weights),
+                seed=self.seed + self.rank
+            )
+            sampler = WeightedBucketBatchSampler(
+                corpus.lengths, indices, sample_weights, self.batch_size,
+                bucket_multiplier=50 if self.bucket_by_length else 1,
+                seed=self.seed, **shard
+            )
+            loader = DataLoader(MemmapTokenDataset(corpus), batch_sampler=sampler, collate_fn=collator)
+        elif self.bucket_by_length or distributed:
+            collator = TokenBatchCollator(corpus, dynamic_padding=self.bucket_by_length)
+            sampler = LengthBucketBatchSampler(
+                corpus.lengths, indices, self.batch_size,
+                bucket_multiplier=50 if self.bucket_by_length else 1,
+                seed=self.seed, **shard
+            )
+            # 샘플러가 코퍼스 행 번호를 반환하므로 데이터셋은 전체 코퍼스 (행 번호 그대로)
+            loader = DataLoader(MemmapTokenDataset(corpus), batch_sampler=sampler, collate_fn=collator)
+        else:
+            collator = TokenBatchCollator(corpus, dynamic_padding=False)
+            sampler = None
+            loader = DataLoader(
+                MemmapTokenDataset(corpus, indices),
+                batch_size=self.batch_size,
+                shuffle=True,
+                collate_fn=collator
+            )
+
+        optimizer = torch.optim.AdamW(self.model.parameters(), lr=self.learning_rate)
+        total_steps = len(loader) * self.num_epochs
+        scheduler = get_linear_schedule_with_warmup(
+            optimizer, num_warmup_steps=int(total_steps * 0.1), num_training_steps=total_steps
+        )
+        # 가중치 추출이 클래스 균형을 맞추므로 loss 가중치는 중복 적용하지 않음
+        use_class_weight = self.use_class_weight and sample_weights is None
+        weight = self._class_weights(corpus, indices) if use_class_weight else None
+        loss_fn = torch.nn.CrossEntropyLoss(weight=weight)
+
+        history = []
+        started = time.perf_counter()
+        validate = validation_indices is not None and len(validation_indices) > 0
+        best_f1, best_epoch, best_state, stale_epochs = -1.0, 0, None, 0
+        telemetry = TrainingTelemetry(telemetry_path, self.device) if telemetry_path and self.rank == 0 else None
+
+        for epoch in range(1, self.num_epochs + 1):
+            train_model.train()
+            if sampler is not None:
+                sampler.set_epoch(epoch)
+            epoch_started = time.perf_counter()
+            total_loss = 0.0
+
+            step_started = time.perf_counter()
+            for batch in loader:
+                data_ready = time.perf_counter()
+                if telemetry:
+                    samples = len(batch['labels'])
+                    tokens = int(batch['attention_mask'].sum())
+                    padded_tokens = batch['attention_mask'].numel()
+
+                batch = {k: v.to(self.device, non_blocking=True) for k, v in batch.items()}
+                optimizer.zero_grad()
+                with self._autocast():
+                    logits = train_model(
+                        input_ids=batch['input_ids'], attention_mask=batch['attention_mask']
+                    ).logits
+                loss = loss_fn(logits.float(), batch['labels'])
+                if telemetry:
+                    telemetry.sync()
+                forward_done = time.perf_counter()
+
+                loss.backward()
+                if telemetry:
+                    telemetry.sync()
+                backward_done = time.perf_counter()
+
+                torch.nn.utils.clip_grad_norm_(self.model.parameters(), 1.0)
+                optimizer.step()
+                scheduler.step()
+                total_loss += loss.item()
+                step_done = time.perf_counter()
+
+                if telemetry:
+                    telemetry.step(epoch, {
+                        'data_wait': data_ready - step_started,
+                        'forward': forward_done - data_ready,
+                        'backward': backward_done - forward_done,
+                        'optimizer': step_done - backward_done,
+                    }, samples, tokens, padded_tokens)
+                step_started = time.perf_counter()
+
+            avg_loss = total_loss / max(1, len(loader))
+            if distributed:
+                loss_tensor = torch.tensor([avg_loss], dtype=torch.float64, device=self.device)
+                dist.all_reduce(loss_tensor)
+                avg_loss = loss_tensor.item() / self.world_size
+            epoch_seconds = time.perf_counter() - epoch_started
+            history.append({'epoch': epoch, 'loss': avg_loss, 'seconds': epoch_seconds})
+            if telemetry:
+                record = telemetry.end_epoch(epoch, epoch_seconds, loss=round(avg_loss, 6))
+                history[-1]['tokens_per_sec'] = record['tokens_per_sec']
+            self._log(f"  Epoch {epoch}/{self.num_epochs} - loss: {avg_loss:.4f} ({epoch_seconds:.1f}s, "
+                  f"{len(indices) / epoch_seconds:.1f} samples/s)")
+
+            if not validate:
+                continue
+
+            # 모든 rank가 같은 검증 세트를 평가하므로 조기 종료 판단이 일치
+            y_true, y_pred = self._evaluate(corpus, np.asarray(validation_indices))
+            score = macro_f1(y_true, y_pred, len(self.label_names))
+            history[-1]['val_macro_f1'] = score
+
+            if score > best_f1:
+                best_f1, best_epoch, stale_epochs = score, epoch, 0
+                # 최고 성능 가중치만 유지 (이전 best는 덮어씀)
+                best_state = {k: v.detach().to('cpu', copy=True) for k, v in self.model.state_dict().items()}
+                self._log(f"    val macro-F1: {score:.4f} (best)")
+            else:
+                stale_epochs += 1
+                self._log(f"    val macro-F1: {score:.4f} (best {best_f1:.4f} @ epoch {best_epoch}, "
+                      f"{stale_epochs}/{patience} without improvement)")
+                if stale_epochs >= patience:
+                    self._log(f"  Early stopping at epoch {epoch}")
+                    break
+
+        if telemetry:
+            telemetry.close()
+
+        if best_state is not None:
+            self.model.load_state_dict(best_state)
+            self._log(f"  Restored best checkpoint: epoch {best_epoch} (val macro-F1 {best_f1:.4f})")
+
+        seconds = time.perf_counter() - started
+        summary = {
+            'epochs': history,
+            'seconds': seconds,
+            'samples_per_sec': len(indices) * len(history) / seconds if seconds > 0 else 0.0,
+            'max_length': corpus.max_length,
+            'padding_ratio': collator.padding_ratio,
+            'static_padding_ratio': corpus.static_padding_ratio(indices),
+            'perturbed_draws': collator.perturbed,
+            'epochs_run': len(history),
+            'world_size': self.world_size,
+            'telemetry': telemetry.summary() if telemetry else {},
+        }
+        if validate:
+            # 남은 에폭 예상 시간 = 실행한 에폭 평균 x 남은 에폭 수
+            average_epoch = sum(h['seconds'] for h in history) / len(history)
+            summary.update({
+                'best_epoch': best_epoch,
+                'best_val_macro_f1': best_f1,
+                'stopped_early': len(history) < self.num_epochs,
+                'seconds_saved': average_epoch * (self.num_epochs - len(history)),
+            })
+            self._log(f"  Epochs: {len(history)}/{self.num_epochs} "
+                  f"(~{summary['seconds_saved']:.0f}s saved vs full epoch budget)")
+        self._log(f"  Padding ratio: {summary['padding_ratio'] * 100:.1f}% "
+              f"(fixed max_length={corpus.max_length}: {summary['static_padding_ratio'] * 100:.1f}%)")
+        self._log(f"  Throughput: {summary['samples_per_sec']:.1f} samples/s"
+                  + (f" ({self.world_size} processes)" if distributed else ""))
+        return summary
+
+    @torch.no_grad()
+    def predict_proba(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+        """
+        텍스트별 클래스 확률
+
+        Args:
+            texts: 텍스트 리스트
+            batch_size: 추론 배치 크기 (None이면 학습 배치 크기)
+
+        Returns:
+            np.ndarray: (len(texts), num_labels)
+        """
+        self.model.eval()
+        batch_size = batch_size or self.batch_size
+        probabilities = np.zeros((len(texts), len(self.label_names)), dtype=np.float32)
+
+        # 길이순 정렬 후 배치 구성 (배치 내 padding 최소화), 결과는 원래 순서로 복원
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+
+        for start in range(0, len(order), batch_size):
+            batch_order = order[start:start + batch_size]
+            encoded = self.tokenizer(
+                [texts[i] for i in batch_order],
+                max_length=self.max_length,
+                truncation=True,
+                padding=True,
+                return_tensors='pt'
+            ).to(self.device)
+            logits = self._forward_logits(encoded)
+            probabilities[batch_order] = torch.softmax(logits.float(), dim=-1).cpu().numpy()
+
+        return probabilities
+
+    def _forward_logits(self, encoded) -> torch.Tensor:
+        """토큰화된 배치의 logits (export된 모델은 이 메서드를 대체)"""
+        with self._autocast():
+            return self.model(**encoded).logits
+
+    @torch.no_grad()
+    def embed(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+        """
+        텍스트별 문장 임베딩 (마지막 hidden state의 attention mask 평균, L2 정규화)
+
+        Args:
+            texts: 텍스트 리스트
+            batch_size: 추론 배치 크기 (None이면 학습 배치 크기)
+
+        Returns:
+            np.ndarray: (len(texts), hidden_size) float32
+        """
+        self.model.eval()
+        batch_size = batch_size or self.batch_size
+        embeddings = np.zeros((len(texts), self.model.config.hidden_size), dtype=np.float32)
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+
+        for start in range(0, len(order), batch_size):
+            batch_order = order[start:start + batch_size]
+            encoded = self.tokenizer(
+                [texts[i] for i in batch_order],
+                max_length=self.max_length,
+                truncation=True,
+                padding=True,
+                return_tensors='pt'
+            ).to(self.device)
+            with self._autocast():
+                hidden = self.model(**encoded, output_hidden_states=True).hidden_states[-1].float()
+            mask = encoded['attention_mask'].unsqueeze(-1).float()
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1.0)
+            embeddings[batch_order] = torch.nn.functional.normalize(pooled, dim=-1).cpu().numpy()
+
+        return embeddings
+
+    def predict(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """텍스트별 (레이블, 신뢰도)"""
+        probabilities = self.predict_proba(texts)
+        return [(self.label_names[int(row.argmax())], float(row.max())) for row in probabilities]
+
+    def save(self, output_dir: str):
+        """
+        모델 산출물 저장
+
+        생성 파일: model.safetensors + config.json (가중치), 토크나이저 파일, label_map.json
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        self.model.save_pretrained(output_dir, safe_serialization=True)
+        self.tokenizer.save_pretrained(output_dir)
+        with open(os.path.join(output_dir, LABEL_MAP_FILE), 'w', encoding='utf-8') as f:
+            json.dump({
+                'artifact_format': ARTIFACT_FORMAT,
+                'label_names': self.label_names,
+                'max_length': self.max_length,
+                'model_name': self.model_name,
+            }, f, indent=2, ensure_ascii=False)
+        print(f"  ✓ Model saved: {output_dir}")
+
+    @classmethod
+    def load(cls, model_dir: str, device: Optional[str] = None) -> 'TokenizedChangeTypeClassifier':
+        """
+        save()로 저장한 모델 로드
+
+        safetensors 가중치를 memory map으로 열어 필요한 텐서만 읽고, 모델을 초기화한 뒤
+        가중치를 다시 복사하지 않음 (low_cpu_mem_usage). 여러 예측 프로세스가 같은 파일을
+        열면 page cache를 공유
+        """
+        with open(os.path.join(model_dir, LABEL_MAP_FILE), 'r', encoding='utf-8') as f:
+            label_map = json.load(f)
+
+        classifier = cls(model_name=label_map.get('model_name', 'klue/bert-base'), device=device)
+        classifier.label_names = label_map['label_names']
+        classifier.max_length = label_map.get('max_length', MAX_SEQ_LENGTH)
+        classifier.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        classifier.model = AutoModelForSequenceClassification.from_pretrained(
+            model_dir,
+            low_cpu_mem_usage=True,
+            use_safetensors=os.path.exists(os.path.join(model_dir, WEIGHTS_FILE))
+        ).to(classifier.device)
+        classifier.model.eval()
+        return classifier